@@ -0,0 +1,75 @@
+import time
+
+from benchmarks.synthetic import make_dataset, BENCH_CONFIG
+from libraries.features import addSignals
+from libraries.backtest import count_signals, implement_strategy
+
+# Row-by-row implementation kept as the reference the vectorized engine must match
+def implement_strategy_loop(data, config):
+    balance = config['initial_balance']
+    btc_held = 0
+    balances, btc_values, total_values, buy_signals, sell_signals = [], [], [], [], []
+    trade_amount = config['trade_amount']
+    stop_loss_percentage = config['stop_loss_percentage'] / 100
+    take_profit_percentage = config['take_profit_percentage'] / 100
+    last_buy_price = None
+
+    for i, row in data.iterrows():
+        buy_signal_count = count_signals(row, 'buy')
+        sell_signal_count = count_signals(row, 'sell')
+        buy_threshold = config['buy_threshold']
+        sell_threshold = config['sell_threshold']
+        buy_signal_strength = buy_signal_count / buy_threshold if buy_threshold > 0 else 0
+        sell_signal_strength = sell_signal_count / sell_threshold if sell_threshold > 0 else 0
+
+        sell = buy = False
+        if config['stop_loss_enabled'] and last_buy_price is not None:
+            sell = row['close'] <= last_buy_price * (1 - stop_loss_percentage)
+        elif config['take_profit_enabled'] and last_buy_price is not None:
+            sell = row['close'] >= last_buy_price * (1 + take_profit_percentage)
+        elif buy_signal_strength > sell_signal_strength and buy_signal_count >= buy_threshold and balance > 0:
+            buy = True
+        elif sell_signal_count > buy_signal_count and sell_signal_count >= sell_threshold and btc_held > 0:
+            sell = True
+
+        if buy:
+            btc_held += min(trade_amount, balance) / row['close']
+            balance -= min(trade_amount, balance)
+            buy_signals.append(row.name)
+            last_buy_price = row['close']
+        elif sell:
+            btc_to_sell = min(trade_amount / row['close'], btc_held)
+            balance += btc_to_sell * row['close']
+            btc_held -= btc_to_sell
+            sell_signals.append(row.name)
+            if btc_held == 0:
+                last_buy_price = None
+
+        btc_value = btc_held * row['close']
+        balances.append(balance)
+        btc_values.append(btc_value)
+        total_values.append(balance + btc_value)
+
+    return balances, btc_values, total_values, buy_signals, sell_signals
+
+def timed(func, *args, repeat=1):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    for n_rows, run_loop in [(2500, True), (100_000, True), (1_000_000, False)]:
+        data = addSignals(make_dataset(n_rows), BENCH_CONFIG)
+        vec_time, vec_result = timed(implement_strategy, data, BENCH_CONFIG, repeat=3)
+        line = f"{n_rows:>9,} rows  vectorized {vec_time * 1000:9.1f} ms"
+        if run_loop:
+            loop_time, loop_result = timed(implement_strategy_loop, data, BENCH_CONFIG)
+            assert vec_result == loop_result, "vectorized backtest diverged from the row loop"
+            line += f"  iterrows {loop_time * 1000:9.1f} ms  speedup {loop_time / vec_time:6.1f}x  (identical)"
+        print(line)
+
+if __name__ == '__main__':
+    main()
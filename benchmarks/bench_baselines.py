@@ -0,0 +1,27 @@
+import time
+
+from benchmarks.synthetic import make_dataset
+from tests.test_baselines import INITIAL_BALANCE, loop_reference, planned_amounts, run_baseline
+
+# Cumulative-sum baselines against the row-by-row loop; tests/test_baselines.py checks they
+# are identical
+
+def main():
+    for n_rows, freq in [(2500, 'D'), (1_000_000, 'min')]:
+        data = make_dataset(n_rows, freq=freq)
+        close = data['close'].to_numpy(dtype=float)
+        for cadence, amount in [('Daily', None), ('Weekly', 50), ('Monthly', None)]:
+            for name in ['buy_and_hold', 'dca', 'fear_greed_dca']:
+                start = time.perf_counter()
+                run_baseline(data, name, cadence, amount)
+                vector_time = time.perf_counter() - start
+
+                amounts = planned_amounts(data, name, cadence, amount)
+                start = time.perf_counter()
+                loop_reference(close, amounts, INITIAL_BALANCE)
+                loop_time = time.perf_counter() - start
+                print(f"{n_rows:>9,} rows  {cadence:8} {name:15} cumsum {vector_time * 1000:7.1f} ms"
+                      f"  loop {loop_time * 1000:8.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_dataset, BENCH_CONFIG
+from libraries.features import addFeatures, addSignals, compactData, sliceDates
+
+def multi_coin_minutes(n_coins, n_minutes):
+    # Long-format frame, sorted by timestamp, with one row per coin per minute
+    frames = []
+    for i in range(n_coins):
+        coin = make_dataset(n_minutes, seed=i, freq='min')
+        coin['ticker'] = f'COIN{i}-USD'
+        frames.append(coin)
+    return pd.concat(frames).sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+def timed(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def report(name, data):
+    data = addSignals(addFeatures(data), BENCH_CONFIG)
+    compact = compactData(data)
+    start, end = data['timestamp'].iloc[len(data) // 4], data['timestamp'].iloc[3 * len(data) // 4]
+
+    print(f"{name} ({len(data):,} rows)")
+    for label, frame in [('default', data), ('compact', compact)]:
+        memory = frame.memory_usage(deep=True).sum() / 2**20
+        # st.cache_data hands every rerun a fresh unpickled copy
+        cache_copy = timed(lambda: pickle.loads(pickle.dumps(frame)), repeat=3)
+        mask_slice = timed(lambda: frame[(frame['timestamp'] >= start) & (frame['timestamp'] <= end)])
+        view_slice = timed(lambda: sliceDates(frame, start, end))
+        print(f"  {label:8} memory {memory:9.1f} MiB  cache copy {cache_copy * 1000:8.1f} ms  "
+              f"mask filter {mask_slice * 1000:7.2f} ms  sliceDates {view_slice * 1000:6.3f} ms")
+
+    assert sliceDates(data, start, end).equals(data[(data['timestamp'] >= start) & (data['timestamp'] <= end)])
+
+def main():
+    report("full history", make_dataset(2500))
+    report("20 coins x 100k minutes", multi_coin_minutes(20, 100_000))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_dataset
+from libraries.correlation import DEFAULT_LAGS, DEFAULT_WINDOWS, lagged_series, rolling_corr, correlation_matrix
+
+def pandas_matrix(data, lags, windows):
+    # The page's approach, repeated for every combination
+    result = np.full((len(lags), len(windows)), np.nan)
+    for i, lag in enumerate(lags):
+        x = data['fear_greed'].rolling(window=lag).mean()
+        y = (data['close'].shift(-lag) / data['close'] - 1) * 100
+        for j, window in enumerate(windows):
+            result[i, j] = x.rolling(window=window).corr(y).mean()
+    return result
+
+def main():
+    data = make_dataset(2500)
+
+    x, y = lagged_series(data, [7])
+    fast = rolling_corr(x, y, [30])[0, 0]
+    slow = pd.Series(x[0]).rolling(window=30).corr(pd.Series(y[0])).to_numpy()
+    np.testing.assert_allclose(fast, slow, rtol=1e-7, atol=1e-9, equal_nan=True)
+
+    n_combinations = len(DEFAULT_LAGS) * len(DEFAULT_WINDOWS)
+    start = time.perf_counter()
+    matrix = correlation_matrix(data)
+    kernel = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = pandas_matrix(data, DEFAULT_LAGS, DEFAULT_WINDOWS)
+    loop = time.perf_counter() - start
+    np.testing.assert_allclose(matrix.to_numpy(), reference, rtol=1e-6, atol=1e-9, equal_nan=True)
+
+    print(f"{len(data):,} rows, {n_combinations} lag x window combinations")
+    print(f"cumsum kernel  {kernel * 1000:8.1f} ms")
+    print(f"pandas loop    {loop * 1000:8.1f} ms  ({loop / kernel:.0f}x slower)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,34 @@
+import time
+from unittest import mock
+
+from benchmarks.synthetic import make_dataset, BENCH_CONFIG
+from libraries import plots
+from libraries.features import addSignals
+
+def figure_payload(plot, *args, **kwargs):
+    # Build the figure and serialize it the way st.plotly_chart does; returns (seconds, JSON bytes)
+    payloads = []
+    capture = lambda fig, **_: payloads.append(fig.to_json())
+    with mock.patch.object(plots.st, 'plotly_chart', capture), mock.patch.object(plots.st, 'subheader'):
+        start = time.perf_counter()
+        plot(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+    return elapsed, len(payloads[0])
+
+def main():
+    for n_rows in [2500, 1_000_000]:
+        data = addSignals(make_dataset(n_rows), BENCH_CONFIG)
+        balances, btc_values, total_values, buys, sells = plots.implement_strategy(data, BENCH_CONFIG)
+        signals = plots.strategy_signals(data)
+        print(f"{n_rows:,} rows")
+        for name, plot, args in [
+            ('plot_signals', plots.plot_signals, (data, buys, sells, signals)),
+            ('plot_strategy_signals', plots.plot_strategy_signals, (data, signals)),
+        ]:
+            full_time, full_size = figure_payload(plot, *args, point_budget=n_rows + 1)
+            down_time, down_size = figure_payload(plot, *args)
+            print(f"  {name:22} full {full_size / 2**20:8.2f} MiB {full_time * 1000:8.1f} ms  "
+                  f"downsampled {down_size / 2**20:6.2f} MiB {down_time * 1000:7.1f} ms")
+
+if __name__ == '__main__':
+    main()
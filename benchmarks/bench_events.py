@@ -0,0 +1,66 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_dataset
+from libraries.events import HORIZONS, EventStudy
+
+SIZES = [3_000, 100_000]
+
+def reference_table(data, horizons):
+    # The page's approach: shift the close for each horizon (the synthetic days have no gaps)
+    # and let pandas summarise each classification
+    frames = []
+    for horizon in horizons:
+        change = (data['close'].shift(-horizon) / data['close'] - 1) * 100
+        grouped = change.groupby(data['value_classification'])
+        frames.append(pd.DataFrame({
+            'horizon': horizon,
+            'count': grouped.count(),
+            'mean': grouped.mean(),
+            'hit_rate': grouped.apply(lambda values: (values > 0).sum() / values.count()),
+            'median': grouped.median(),
+            'p25': grouped.quantile(0.25),
+            'p75': grouped.quantile(0.75),
+        }))
+    return pd.concat(frames).rename_axis('group').reset_index()
+
+def best_of(func, repeats=5):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+def main():
+    for n_rows in SIZES:
+        data = make_dataset(n_rows)
+        reference, slow = best_of(lambda: reference_table(data, HORIZONS), 1)
+        table, build = best_of(lambda: EventStudy().refresh(data).table())
+        merged = table.merge(reference, on=['group', 'horizon'], suffixes=('', '_reference'))
+        assert len(merged) == len(reference)
+        for col in ['count', 'mean', 'hit_rate', 'median', 'p25', 'p75']:
+            np.testing.assert_allclose(merged[col], merged[f'{col}_reference'], rtol=1e-9)
+
+        # A new day on top of a kept study, against building it again
+        study = EventStudy().refresh(data.iloc[:-1])
+        start = time.perf_counter()
+        study.refresh(data)
+        incremental = time.perf_counter() - start
+        recomputed = study.recomputed
+        pd.testing.assert_frame_equal(study.table(), table)
+        _, lookup = best_of(lambda: study.table(), 20)
+        study.refresh(data)
+        _, unchanged = best_of(lambda: study.refresh(data), 20)
+
+        print(f"{n_rows:,} days x {len(HORIZONS)} horizons")
+        print(f"  pandas groupby per horizon   {slow * 1000:9.1f} ms")
+        print(f"  event study build + table    {build * 1000:9.1f} ms")
+        print(f"  refresh with one new day     {incremental * 1000:9.1f} ms  ({recomputed:,} rows recomputed)")
+        print(f"  refresh, nothing new         {unchanged * 1000:9.3f} ms")
+        print(f"  kept table                   {lookup * 1e6:9.1f} us")
+
+if __name__ == '__main__':
+    main()
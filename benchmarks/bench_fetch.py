@@ -0,0 +1,56 @@
+import os
+import tempfile
+import time
+from unittest import mock
+
+from benchmarks.synthetic import make_dataset, fake_fng_get, fake_yf_download
+from libraries import data as data_module
+from libraries.store import DataStore
+
+FNG_LATENCY = 0.4
+PRICE_LATENCY = 0.8
+
+def patched(path, dataset, fng_latency, price_latency):
+    return [
+        mock.patch.object(data_module.http_session(), 'get', fake_fng_get(dataset, fng_latency)),
+        mock.patch('yfinance.download', fake_yf_download(dataset, price_latency)),
+        mock.patch.object(data_module, 'DataStore', lambda: DataStore(path)),
+    ]
+
+def timed_load(path, dataset, fng_latency, price_latency, sequential=False, deadline=data_module.FETCH_DEADLINE):
+    store = DataStore(path)
+    store.conn.execute('DELETE FROM meta')  # force both sources to be re-fetched
+    store.conn.commit()
+    store.close()
+    patches = patched(path, dataset, fng_latency, price_latency)
+    for p in patches:
+        p.start()
+    try:
+        with mock.patch.object(data_module, 'FETCH_DEADLINE', deadline):
+            start = time.perf_counter()
+            if sequential:
+                data_module._refresh(data_module.load_fear_greed)
+                data_module._refresh(data_module.load_prices, data_module.PRICE_SOURCE)
+            else:
+                data_module.load_sources()
+            return time.perf_counter() - start
+    finally:
+        for p in patches:
+            p.stop()
+
+def main():
+    dataset = make_dataset(2500)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'store.sqlite')
+        sequential = timed_load(path, dataset, FNG_LATENCY, PRICE_LATENCY, sequential=True)
+        concurrent = timed_load(path, dataset, FNG_LATENCY, PRICE_LATENCY)
+        slow = timed_load(path, dataset, FNG_LATENCY, 5.0, deadline=1.0)
+        data_module._fetch_pool.shutdown(wait=True)
+
+    print(f"latencies {FNG_LATENCY}s + {PRICE_LATENCY}s")
+    print(f"sequential fetch            {sequential * 1000:8.1f} ms")
+    print(f"concurrent fetch            {concurrent * 1000:8.1f} ms")
+    print(f"price source 5s, 1s deadline {slow * 1000:7.1f} ms (stored copy served)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+import re
+import subprocess
+import sys
+
+# Cold-start import cost of each entry point, from `python -X importtime`. The UI stack
+# (streamlit + plotly + yfinance) is what every worker paid while libraries.data imported
+# streamlit and yfinance at module level.
+TARGETS = {
+    'before: data + UI stack': 'import streamlit, yfinance, requests, plotly.graph_objects, libraries.data',
+    'libraries.data': 'import libraries.data',
+    'libraries.optimizer': 'import libraries.optimizer',
+    'libraries.cli': 'import libraries.cli',
+    'libraries.plots (UI)': 'import libraries.plots',
+}
+HEAVY = ['streamlit', 'plotly', 'yfinance', 'requests']
+RUNS = 3
+
+def import_profile(statement):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, check=True)
+    # Lines look like "import time:  self [us] | cumulative | name"; top-level modules are unindented
+    total, loaded = 0, set()
+    for self_us, cumulative, name in re.findall(r'import time:\s+(\d+) \|\s+(\d+) \|( *\S+)', result.stderr):
+        if not name.startswith('  '):
+            total += int(cumulative)
+        loaded.add(name.strip().split('.')[0])
+    return total / 1e6, [pkg for pkg in HEAVY if pkg in loaded]
+
+def main():
+    for label, statement in TARGETS.items():
+        runs = [import_profile(statement) for _ in range(RUNS)]
+        seconds = min(run[0] for run in runs)
+        heavy = ', '.join(runs[0][1]) or '-'
+        print(f"{label:26} {seconds:6.3f} s   heavy imports: {heavy}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+import time
+
+from benchmarks.synthetic import make_dataset, BENCH_CONFIG
+from libraries.features import addFeatures, addSignals
+from libraries.trading import indicator_cache, calculate_rsi, calculate_bollinger_bands
+
+def render(data, config):
+    # One Strategy Creator rerun: features, then signals for the current config
+    return addSignals(addFeatures(data.copy()), config)
+
+def main():
+    for n_rows in [2500, 1_000_000]:
+        data = make_dataset(n_rows)
+        indicator_cache.clear()
+
+        start = time.perf_counter()
+        first = render(data, BENCH_CONFIG)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(10):
+            render(data, BENCH_CONFIG)
+        warm = (time.perf_counter() - start) / 10
+
+        # Cached columns must equal the uncached computations
+        assert first['rsi'].equals(calculate_rsi(data, BENCH_CONFIG['rsi_period']))
+        assert first['bollinger_lower'].equals(calculate_bollinger_bands(data, 20, BENCH_CONFIG['bollinger_std_dev_multiplier'])[2])
+
+        # Sweep over multipliers and thresholds that share RSI periods and MA windows
+        start = time.perf_counter()
+        for rsi_period in [7, 14, 21]:
+            for multiplier in [1.5, 2.0, 2.5]:
+                for ma_period in [10, 20]:
+                    addSignals(data.copy(), {**BENCH_CONFIG, 'rsi_period': rsi_period,
+                                             'bollinger_std_dev_multiplier': multiplier,
+                                             'short_term_ma_period': ma_period})
+        sweep = time.perf_counter() - start
+
+        print(f"{n_rows:>9,} rows  cold render {cold * 1000:8.1f} ms  warm render {warm * 1000:8.1f} ms  "
+              f"18-config sweep {sweep * 1000:8.1f} ms  {indicator_cache.stats()}")
+
+if __name__ == '__main__':
+    main()
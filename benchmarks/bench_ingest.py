@@ -0,0 +1,121 @@
+import json
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_market, fake_yf_download, CLASSIFICATIONS, CLASSIFICATION_BINS
+from libraries.data import parse_fear_greed, parse_prices
+from libraries.features import asofFearGreed, compactData, mergeSources
+
+# Sizes of the payload and merge runs. The full history served by alternative.me is a few
+# thousand days; a 10M-record JSON payload would not fit in memory as Python objects, so the
+# payload parse tops out at 1M records and the 10M-row run covers the merge of minute bars.
+PAYLOAD_ROWS = [3_000, 1_000_000]
+MERGE_ROWS = [3_000, 50_000, 10_000_000]
+
+def make_payload(n_rows, seed=0):
+    # The API response as requests hands it over: newest day first, numbers as strings. Epoch
+    # seconds go past what pandas holds as nanoseconds, but the store and parsers use seconds.
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, 101, n_rows)
+    labels = np.array(CLASSIFICATIONS)[np.digitize(values, CLASSIFICATION_BINS)]
+    timestamps = 1517443200 + 86400 * np.arange(n_rows)[::-1]
+    records = [{'value': str(value), 'value_classification': label, 'timestamp': str(timestamp)}
+               for value, label, timestamp in zip(values.tolist(), labels.tolist(), timestamps.tolist())]
+    records[0]['time_until_update'] = '3600'
+    return json.loads(json.dumps(records))
+
+def reference_parse(records):
+    # fetch_fear_greed before the columnar path
+    df = pd.DataFrame(records)
+    df['value'] = df['value'].astype(int)
+    df['timestamp'] = pd.to_datetime(df['timestamp'].astype(int), unit='s')
+    df = df.set_index('timestamp')
+    df = df.rename(columns={'value': 'fear_greed'})
+    df = df.drop(columns=['time_until_update'], errors='ignore')
+    return df
+
+def reference_prices(df1):
+    df1 = df1[['Close']].copy()
+    df1 = df1.rename(columns={'Close': 'close'})
+    df1.index.name = 'timestamp'
+    df1 = df1.reset_index()
+    df1['timestamp'] = pd.to_datetime(df1['timestamp']).dt.tz_localize(None)
+    return df1.set_index('timestamp')
+
+def reference_merge(fear_greed, prices, interval='1d'):
+    # mergeSources before the sorted-array join, followed by compactData as getData did
+    if interval == '1d':
+        data = fear_greed.merge(prices, on='timestamp')
+    else:
+        data = asofFearGreed(prices, fear_greed).dropna(subset=['fear_greed'])
+        data = data[['fear_greed', 'value_classification', 'close']]
+        data['fear_greed'] = data['fear_greed'].astype(int)
+    data = data.sort_index()
+    return data.reset_index()
+
+def measure(func, *args, repeats=5):
+    # Best time of a few runs (one for the large sizes), then one more run under tracemalloc
+    # (which slows Python down) for the peak
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - start)
+    elapsed = min(times)
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def size(frame):
+    return frame.memory_usage(deep=True).sum()
+
+def report(label, old, new):
+    print(f"{label:36} old {old[1] * 1000:8.1f} ms {old[2] / 2**20:7.1f} MiB peak {size(old[0]) / 2**20:7.1f} MiB out   "
+          f"new {new[1] * 1000:8.1f} ms {new[2] / 2**20:7.1f} MiB peak {size(new[0]) / 2**20:7.1f} MiB out")
+
+def main():
+    # tracemalloc sees numpy and Python allocations but not Arrow string buffers, so the size
+    # of each result (memory_usage(deep=True)) is shown as well
+    print("peak: tracemalloc peak while running; out: size of the result")
+    for n_rows in PAYLOAD_ROWS:
+        records = make_payload(n_rows)
+        repeats = 5 if n_rows < 1_000_000 else 1
+        old = measure(reference_parse, records, repeats=repeats)
+        new = measure(parse_fear_greed, records, repeats=repeats)
+        expected = old[0].assign(fear_greed=old[0]['fear_greed'].astype(np.int8))
+        pd.testing.assert_frame_equal(new[0], expected, check_dtype=False, check_categorical=False, check_index_type=False)
+        report(f"parse {len(records):,} payload records", old, new)
+        del records, old, new
+
+    for n_rows in MERGE_ROWS:
+        fear_greed, bars, interval = make_market(n_rows)
+        repeats = 5 if n_rows < 1_000_000 else 1
+        fear_greed = fear_greed.set_index('timestamp').set_axis(fear_greed['timestamp'].to_numpy().astype('M8[s]'))
+        fear_greed.index.name = 'timestamp'
+        download = fake_yf_download(bars)('BTC-USD')
+        old_prices = measure(reference_prices, download, repeats=repeats)
+        new_prices = measure(parse_prices, download, repeats=repeats)
+        pd.testing.assert_frame_equal(new_prices[0], old_prices[0], check_index_type=False)
+        prices = new_prices[0].set_axis(new_prices[0].index.as_unit('s'))
+        del download, bars
+
+        old = measure(reference_merge, fear_greed, prices, interval, repeats=repeats)
+        new = measure(mergeSources, fear_greed, prices, interval, repeats=repeats)
+        # Labels come back categorical rather than as strings
+        pd.testing.assert_frame_equal(new[0].astype({'value_classification': str}), old[0], check_dtype=False)
+        report(f"prices frame, {n_rows:,} {interval} bars", old_prices, new_prices)
+        report(f"merge, {n_rows:,} {interval} bars", old, new)
+        del old, new
+        old = measure(lambda: compactData(reference_merge(fear_greed, prices, interval)), repeats=repeats)
+        new = measure(mergeSources, fear_greed, prices, interval, True, repeats=repeats)
+        pd.testing.assert_frame_equal(new[0], old[0])
+        report(f"merge + compact, {n_rows:,} {interval} bars", old, new)
+        del old, new, old_prices, new_prices
+
+if __name__ == '__main__':
+    main()
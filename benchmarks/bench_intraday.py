@@ -0,0 +1,68 @@
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_dataset, BENCH_CONFIG
+from libraries.backtest import signal_counts
+from libraries.columnar import ColumnFiles, asof_join_in_chunks, signals_in_chunks
+from libraries.features import addSignals, asofFearGreed
+from libraries.trading import indicator_cache
+
+N_ROWS = 5_000_000
+CHUNK_ROWS = 500_000
+
+def write_minute_bars(path, n_rows, chunk_rows, seed=0):
+    # Generated chunk by chunk straight into the column files
+    rng = np.random.default_rng(seed)
+    bars = ColumnFiles.create(path, {'timestamp': 'datetime64[ns]', 'close': np.float64}, n_rows)
+    start_time, last_close = pd.Timestamp('2018-02-01'), 10000.0
+    for start in range(0, n_rows, chunk_rows):
+        size = min(chunk_rows, n_rows - start)
+        close = last_close * np.exp(np.cumsum(rng.normal(0, 0.0008, size)))
+        last_close = close[-1]
+        bars.write(start, pd.DataFrame({
+            'timestamp': start_time + pd.to_timedelta(np.arange(start, start + size), unit='min'),
+            'close': close,
+        }))
+    return bars
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def main():
+    fear_greed = make_dataset(N_ROWS // 1440 + 2).set_index('timestamp')
+    with tempfile.TemporaryDirectory() as tmp:
+        bars = write_minute_bars(os.path.join(tmp, 'bars'), N_ROWS, CHUNK_ROWS)
+
+        def chunked():
+            asof_join_in_chunks(bars, fear_greed, CHUNK_ROWS)
+            signals_in_chunks(bars, BENCH_CONFIG, CHUNK_ROWS)
+        _, chunked_time, chunked_peak = measure(chunked)
+
+        def in_memory():
+            frame = bars.read(0, len(bars), ['timestamp', 'close'])
+            frame = asofFearGreed(frame.set_index('timestamp'), fear_greed[['fear_greed']]).reset_index()
+            with indicator_cache.bypass():
+                frame = addSignals(frame, BENCH_CONFIG)
+            return signal_counts(frame, 'buy')
+        buy_counts, memory_time, memory_peak = measure(in_memory)
+
+        # Warmup rows make the chunk edges exact
+        assert np.array_equal(np.asarray(bars.column('buy_count')), buy_counts)
+
+    print(f"{N_ROWS:,} minute bars, {CHUNK_ROWS:,}-row chunks")
+    print(f"chunked (memory-mapped)  {chunked_time:6.2f} s  {N_ROWS / chunked_time / 1e6:5.2f} M rows/s  peak {chunked_peak / 2**20:8.1f} MiB")
+    print(f"whole frame in memory    {memory_time:6.2f} s  {N_ROWS / memory_time / 1e6:5.2f} M rows/s  peak {memory_peak / 2**20:8.1f} MiB")
+
+if __name__ == '__main__':
+    main()
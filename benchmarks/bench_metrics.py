@@ -0,0 +1,60 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_multi_dataset, BENCH_CONFIG
+from libraries.backtest import batch_signal_counts, run_backtest_batch
+from libraries.metrics import compute_metrics
+
+N_CURVES = 10_000
+N_ROWS = 1000
+N_REFERENCE = 200
+
+def pandas_metrics(close, total, btc, buys, sells):
+    # The ad-hoc per-run version: one Series at a time
+    total, close = pd.Series(total), pd.Series(close)
+    returns = total.pct_change().iloc[1:].where(total.shift().iloc[1:] > 0, 0.0)
+    downside = np.sqrt((returns.clip(upper=0) ** 2).mean())
+    last_buy_price = close.where(pd.Series(buys)).ffill()
+    closed = pd.Series(sells) & last_buy_price.notna()
+    wins = closed & (close > last_buy_price)
+    balance = total - pd.Series(btc)
+    return {
+        'total_return': (total.iloc[-1] / total.iloc[0] - 1) * 100,
+        'max_drawdown': ((total.cummax() - total) / total.cummax()).max() * 100,
+        'sharpe': returns.mean() / returns.std() * np.sqrt(365) if returns.std() > 0 else np.nan,
+        'sortino': returns.mean() / downside * np.sqrt(365) if downside > 0 else np.nan,
+        'win_rate': wins.sum() / closed.sum() * 100 if closed.sum() else np.nan,
+        'exposure': (pd.Series(btc) > 0).mean() * 100,
+        'turnover': balance.diff().abs().sum() / total.mean(),
+    }
+
+def main():
+    fear_greed, closes = make_multi_dataset(N_CURVES, N_ROWS)
+    # Every asset listed from the first row, so each curve is a full-length backtest
+    closes = closes.bfill()
+    buy_counts, sell_counts = batch_signal_counts(closes, fear_greed['fear_greed'], BENCH_CONFIG)
+    _, btc_values, total_values, buys, sells = run_backtest_batch(closes, buy_counts, sell_counts, BENCH_CONFIG)
+    close, total_values, btc_values, buys, sells = (np.ascontiguousarray(a.T) for a in
+                                                    (closes.to_numpy(), total_values, btc_values, buys, sells))
+
+    start = time.perf_counter()
+    metrics = compute_metrics(total_values, btc_values, close, buys, sells)
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = [pandas_metrics(close[i], total_values[i], btc_values[i], buys[i], sells[i]) for i in range(N_REFERENCE)]
+    loop_time = (time.perf_counter() - start) / N_REFERENCE * N_CURVES
+
+    for i, expected in enumerate(reference):
+        for name, value in expected.items():
+            assert np.isclose(metrics[name][i], value, rtol=1e-9, equal_nan=True), (name, i, metrics[name][i], value)
+
+    print(f"{N_CURVES:,} equity curves x {N_ROWS:,} rows")
+    print(f"batched metrics        {batch_time * 1000:8.1f} ms")
+    print(f"pandas, one at a time  {loop_time * 1000:8.1f} ms  (extrapolated from {N_REFERENCE}, same values)")
+    print(f"median sharpe {np.nanmedian(metrics['sharpe']):.2f}  median max drawdown {np.median(metrics['max_drawdown']):.1f}%")
+
+if __name__ == '__main__':
+    main()
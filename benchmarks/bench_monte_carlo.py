@@ -0,0 +1,51 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_dataset, BENCH_CONFIG
+from libraries.backtest import signal_counts, run_backtest
+from libraries.features import addSignals
+from libraries.metrics import backtest_metrics
+from libraries.simulation import block_bootstrap, monte_carlo, distribution_summary, PATHS_PER_TASK
+
+N_PATHS = 10_000
+N_ROWS = 2500  # roughly the full daily history
+N_REFERENCE = 20
+
+def main():
+    data = make_dataset(N_ROWS)
+
+    start = time.perf_counter()
+    paths = monte_carlo(data, BENCH_CONFIG, N_PATHS, seed=42, processes=True)
+    batch_time = time.perf_counter() - start
+
+    # The app's default: the same paths on a thread pool
+    start = time.perf_counter()
+    assert paths.equals(monte_carlo(data, BENCH_CONFIG, N_PATHS, seed=42))
+    thread_time = time.perf_counter() - start
+
+    # Same seed, same paths, whatever the worker count
+    assert paths.head(PATHS_PER_TASK * 2).equals(monte_carlo(data, BENCH_CONFIG, PATHS_PER_TASK * 2, seed=42, workers=2))
+
+    # The first paths of the first task, replayed one at a time through addSignals + run_backtest
+    seed = np.random.SeedSequence(42).spawn(1)[0]
+    closes, fear_greeds = block_bootstrap(data['close'], data['fear_greed'], PATHS_PER_TASK, rng=np.random.default_rng(seed))
+    start = time.perf_counter()
+    for j in range(N_REFERENCE):
+        frame = addSignals(pd.DataFrame({'close': closes[:, j], 'fear_greed': fear_greeds[:, j]}), BENCH_CONFIG)
+        _, btc_values, total_values, buys, sells = run_backtest(
+            closes[:, j], signal_counts(frame, 'buy'), signal_counts(frame, 'sell'), BENCH_CONFIG)
+        expected = backtest_metrics(closes[:, j], btc_values, total_values, buys, sells)
+        for name in ['final_value', 'max_drawdown', 'trades']:
+            assert np.isclose(paths[name].iloc[j], expected[name], rtol=1e-9), (name, j)
+    loop_time = (time.perf_counter() - start) / N_REFERENCE * N_PATHS
+
+    print(f"{N_PATHS:,} bootstrapped paths x {N_ROWS:,} days")
+    print(f"batched, process pool    {batch_time:7.2f} s")
+    print(f"batched, thread pool     {thread_time:7.2f} s")
+    print(f"one path at a time       {loop_time:7.2f} s  (extrapolated from {N_REFERENCE}, same results)")
+    print(distribution_summary(paths).round(2).to_string())
+
+if __name__ == '__main__':
+    main()
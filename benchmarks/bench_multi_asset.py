@@ -0,0 +1,68 @@
+import os
+import tempfile
+import time
+from unittest import mock
+
+import numpy as np
+
+from benchmarks.synthetic import make_multi_dataset, fake_fng_get, fake_yf_download, BENCH_CONFIG
+from libraries import data as data_module
+from libraries.backtest import batch_signal_counts, run_backtest_batch, signal_counts, run_backtest
+from libraries.features import addSignals
+from libraries.store import DataStore
+
+N_ASSETS = 100
+N_ROWS = 2500
+
+def load_offline(fear_greed, closes):
+    # getMultiData against mocked upstreams and a throwaway store
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'store.sqlite')
+        fng = fear_greed.assign(close=closes.iloc[:, 0])
+        with mock.patch.object(data_module.http_session(), 'get', fake_fng_get(fng)), \
+             mock.patch('yfinance.download', fake_yf_download(fng, closes=closes)), \
+             mock.patch.object(data_module, 'DataStore', lambda: DataStore(path)):
+            data_module.getMultiData.clear()
+            return data_module.getMultiData(list(closes.columns))
+
+def per_asset(data, tickers, config):
+    results = []
+    for ticker in tickers:
+        frame = data[['timestamp', 'fear_greed', ticker]].rename(columns={ticker: 'close'})
+        frame = frame[frame['close'].notna()].reset_index(drop=True)
+        frame = addSignals(frame, config)
+        results.append(run_backtest(frame['close'].to_numpy(), signal_counts(frame, 'buy'), signal_counts(frame, 'sell'), config))
+    return results
+
+def main():
+    fear_greed, closes = make_multi_dataset(N_ASSETS, N_ROWS)
+    tickers = list(closes.columns)
+
+    start = time.perf_counter()
+    data = load_offline(fear_greed, closes)
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    buy_counts, sell_counts = batch_signal_counts(data[tickers], data['fear_greed'], BENCH_CONFIG)
+    balances, btc_values, total_values, buys, sells = run_backtest_batch(data[tickers], buy_counts, sell_counts, BENCH_CONFIG)
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reference = per_asset(data, tickers, BENCH_CONFIG)
+    loop_time = time.perf_counter() - start
+
+    # Each column must match a single-asset run over that asset's listed rows
+    for j, (ref_balances, _, ref_totals, ref_buys, ref_sells) in enumerate(reference):
+        listed = data[tickers[j]].notna().to_numpy()
+        assert np.array_equal(balances[listed, j], ref_balances)
+        assert np.array_equal(total_values[listed, j], ref_totals)
+        assert np.flatnonzero(buys[listed, j]).tolist() == ref_buys
+        assert np.flatnonzero(sells[listed, j]).tolist() == ref_sells
+
+    print(f"{N_ASSETS} assets x {N_ROWS:,} days")
+    print(f"offline load (one batched download)  {load_time * 1000:8.1f} ms")
+    print(f"batched signals + backtest           {batch_time * 1000:8.1f} ms")
+    print(f"one asset at a time                  {loop_time * 1000:8.1f} ms  (identical results)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+import time
+
+from benchmarks.synthetic import make_dataset, BENCH_CONFIG
+from libraries.optimizer import evaluate_config, optimize
+
+PARAM_SPACE = {
+    'short_term_ma_period': [5, 10, 20, 30],
+    'long_term_ma_period': [50, 100, 200],
+    'rsi_period': [7, 14, 21],
+    'rsi_buy_threshold': [25, 30, 35],
+    'bollinger_std_dev_multiplier': [1.5, 2.0, 2.5],
+    'fear_greed_buy_threshold': [15, 25, 35],
+    'buy_threshold': [1, 2, 3],
+    'stop_loss_percentage': [5.0, 10.0],
+}
+
+def main():
+    data = make_dataset(2500)
+
+    start = time.perf_counter()
+    table = optimize(data, BENCH_CONFIG, PARAM_SPACE, mode='grid')
+    grid_time = time.perf_counter() - start
+    print(f"grid     {len(table):>6,} configs {grid_time:7.2f} s  ({len(table) / grid_time:,.0f} configs/s)")
+
+    # Single-process reference for the best config
+    best = {**BENCH_CONFIG, **{name: table[name].iloc[0].item() for name in PARAM_SPACE}}
+    assert abs(evaluate_config(data, best)['total_return'] - table.iloc[0]['total_return']) < 1e-9
+
+    for mode in ['random', 'halving']:
+        start = time.perf_counter()
+        table = optimize(data, BENCH_CONFIG, PARAM_SPACE, mode=mode, n_samples=2000)
+        print(f"{mode:8} {len(table):>6,} configs {time.perf_counter() - start:7.2f} s  best return {table.iloc[0]['total_return']:.2f}%")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import make_dataset
+
+N_ROWS = 2500
+REPEATS = 3
+PAGE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'pages', '2_Fear_Greed_Index.py')
+
+def seed_store(path, dataset):
+    from libraries.store import DataStore
+
+    store = DataStore(path)
+    frame = dataset.set_index('timestamp')
+    store.save_fear_greed(frame)
+    store.save_prices('BTC-USD', frame)
+    store.mark_fetched('fear_greed')
+    store.mark_fetched('BTC-USD')
+    store.close()
+
+def timed(run):
+    start = time.perf_counter()
+    at = run()
+    assert not at.exception, [e.value for e in at.exception]
+    return time.perf_counter() - start
+
+def rerun_times(dataset):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(PAGE, default_timeout=120)
+    first, last = dataset['timestamp'].iloc[0].date(), dataset['timestamp'].iloc[-1].date()
+    times = {'first run': timed(at.run)}
+    # Each interaction reruns the whole script, as a click in the browser does
+    times['rerun, nothing changed'] = timed(at.run)
+    times['rolling window slider'] = timed(lambda: at.slider[0].set_value(60).run())
+    times['time window select'] = timed(lambda: at.selectbox[0].set_value(7).run())
+    times['date range'] = timed(lambda: at.date_input[0].set_value((first + (last - first) / 2, last)).run())
+    times['back to full range'] = timed(lambda: at.date_input[0].set_value((first, last)).run())
+    return times
+
+def best_of(enabled, dataset):
+    from libraries import cache
+
+    cache.STAGE_CACHE = enabled
+    runs = []
+    for _ in range(REPEATS):
+        cache.clear_stages()
+        runs.append(rerun_times(dataset))
+    return {name: min(run[name] for run in runs) for name in runs[0]}
+
+def main():
+    dataset = make_dataset(N_ROWS)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['FGI_STORE_PATH'] = os.path.join(tmp, 'store.sqlite')
+        seed_store(os.environ['FGI_STORE_PATH'], dataset)
+
+        uncached = best_of(False, dataset)
+        cached = best_of(True, dataset)
+
+    print(f"Fear & Greed page, {N_ROWS:,} rows, best of {REPEATS}")
+    print(f"{'':26} {'uncached':>10} {'cached':>10}")
+    for name in uncached:
+        print(f"{name:26} {uncached[name] * 1000:8.1f} ms {cached[name] * 1000:8.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_dataset, BENCH_CONFIG
+from libraries.backtest import strategy_signals, run_backtest
+from libraries.features import addSignals
+from libraries.paper import PaperTradingEngine, replay_feed
+
+N_ROWS = 2000
+
+def make_configs(n):
+    # Spread over a few parameter values, so strategies share some indicators but not all
+    rng = np.random.default_rng(0)
+    return {f'strategy_{i}': {**BENCH_CONFIG,
+                              'short_term_ma_period': int(rng.choice([5, 10, 20])),
+                              'long_term_ma_period': int(rng.choice([50, 100])),
+                              'rsi_period': int(rng.choice([7, 14])),
+                              'fear_greed_buy_threshold': int(rng.integers(15, 35)),
+                              'buy_threshold': int(rng.integers(1, 3)),
+                              'stop_loss_enabled': bool(rng.integers(0, 2)),
+                              'buy_rule': 'rsi(14) < 35 AND fear_greed < 40' if i % 4 == 0 else '',
+                              'sell_rule': 'close > bollinger_upper(20, 1.5) OR momentum(7) < -0.05' if i % 4 == 1 else ''}
+            for i in range(n)}
+
+def check_against_backtest(data, configs):
+    engine = PaperTradingEngine(configs)
+    asyncio.run(engine.run(replay_feed(data)))
+    fills = {}
+    for timestamp, name, side, _ in engine.exchange.fills:
+        fills.setdefault(name, []).append((timestamp, side))
+
+    for name, config in configs.items():
+        signals = strategy_signals(addSignals(data.copy(), config))
+        balances, btc_values, _, buy_positions, sell_positions = run_backtest(
+            data['close'].to_numpy(), signals['buy_counts'], signals['sell_counts'], config)
+        expected = sorted([(data['timestamp'].iloc[i], 'buy') for i in buy_positions] +
+                          [(data['timestamp'].iloc[i], 'sell') for i in sell_positions])
+        assert sorted(fills.get(name, [])) == expected, name
+        account = engine.exchange.accounts[name]
+        assert np.isclose(account['balance'], balances[-1], rtol=1e-12), name
+        assert np.isclose(account['btc_held'] * data['close'].iloc[-1], btc_values[-1], rtol=1e-12), name
+    return len(engine.exchange.fills)
+
+def main():
+    data = make_dataset(N_ROWS)
+    n_fills = check_against_backtest(data, make_configs(40))
+    print(f"replayed trades match run_backtest for 40 configs ({n_fills:,} fills)")
+
+    for n_strategies in [1, 10, 100, 1000]:
+        engine = PaperTradingEngine(make_configs(n_strategies))
+        start = time.perf_counter()
+        asyncio.run(engine.run(replay_feed(data)))
+        elapsed = time.perf_counter() - start
+        summary = engine.latency_summary()
+        print(f"{n_strategies:>5} strategies  {N_ROWS / elapsed:9,.0f} bars/s  {N_ROWS * n_strategies / elapsed:11,.0f} strategy-bars/s  "
+              f"decision latency p50 {summary['p50_us']:8.1f} us  p99 {summary['p99_us']:8.1f} us")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+import tempfile
+import timeit
+
+from benchmarks.suite import run_pipeline, set_cache_backend, no_cache
+from benchmarks.synthetic import make_market
+from libraries import profiling
+
+N_CALLS = 1_000_000
+N_ROWS = 100_000
+REPEATS = 5
+
+@profiling.traced()
+def traced_noop(x):
+    return x
+
+def per_call_ns(func):
+    return min(timeit.repeat(lambda: func(1), number=N_CALLS, repeat=5)) / N_CALLS * 1e9
+
+def pipeline_time(tmp, market):
+    return min(run_pipeline(*market, tmp)['end_to_end'] for _ in range(REPEATS))
+
+def main():
+    profiling.clear()
+    plain = per_call_ns(traced_noop.__wrapped__)
+    disabled = per_call_ns(traced_noop)
+    run = profiling.start_run('bench')
+    enabled = per_call_ns(traced_noop)
+    profiling.finish_run(run)
+    profiling.clear()
+    print(f"no-op call: plain {plain:6.0f} ns  traced, no run {disabled:6.0f} ns  traced, in a run {enabled:6.0f} ns")
+
+    set_cache_backend(no_cache)
+    market = make_market(N_ROWS)
+    with tempfile.TemporaryDirectory() as tmp:
+        run_pipeline(*make_market(1000), tmp)  # warm-up
+        off = pipeline_time(tmp, market)
+        run = profiling.start_run('bench')
+        on = pipeline_time(tmp, market)
+        profiling.finish_run(run)
+        spans_per_run = len(run['spans']) // REPEATS
+        run = profiling.start_run('bench', memory=True)
+        with_memory = pipeline_time(tmp, market)
+        profiling.finish_run(run)
+
+    overhead = (disabled - plain) * spans_per_run / 1e9
+    print(f"pipeline, {N_ROWS:,} rows, {spans_per_run} traced calls per run (best of {REPEATS})")
+    print(f"  profiling off        {off * 1000:8.1f} ms  (traced wrappers add ~{overhead * 1e6:.1f} us, {overhead / off:.5%})")
+    print(f"  timing spans         {on * 1000:8.1f} ms")
+    print(f"  timing + memory      {with_memory * 1000:8.1f} ms")
+
+if __name__ == '__main__':
+    main()
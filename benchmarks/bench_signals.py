@@ -0,0 +1,37 @@
+import time
+from unittest import mock
+
+import numpy as np
+
+from benchmarks.synthetic import make_dataset, BENCH_CONFIG
+from libraries import plots
+from libraries.backtest import strategy_signals, fired_indicators
+from libraries.features import addSignals
+
+def main():
+    for n_rows in [2500, 100_000]:
+        data = addSignals(make_dataset(n_rows), BENCH_CONFIG)
+
+        start = time.perf_counter()
+        signals = strategy_signals(data)
+        fired_indicators(signals['buy']), fired_indicators(signals['sell'])
+        counting = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loop_counts = [plots.count_signals(row, 'buy') for _, row in data.head(min(n_rows, 10_000)).iterrows()]
+        loop = (time.perf_counter() - start) * n_rows / len(loop_counts)
+        assert np.array_equal(signals['buy_counts'][:len(loop_counts)], loop_counts)
+
+        # Figure construction plus the JSON serialization st.plotly_chart performs
+        figures = []
+        with mock.patch.object(plots.st, 'plotly_chart', lambda fig, **kwargs: figures.append(fig.to_json())), \
+             mock.patch.object(plots.st, 'subheader'):
+            start = time.perf_counter()
+            plots.plot_strategy_signals(data, signals)
+            plotting = time.perf_counter() - start
+
+        print(f"{n_rows:>8,} rows  signal matrix + labels {counting * 1000:8.2f} ms  "
+              f"iterrows counting {loop * 1000:9.1f} ms  plotly build + serialize {plotting * 1000:8.1f} ms")
+
+if __name__ == '__main__':
+    main()
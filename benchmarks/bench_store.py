@@ -0,0 +1,43 @@
+import os
+import tempfile
+import time
+from unittest import mock
+
+from benchmarks.synthetic import make_dataset, fake_fng_get, fake_yf_download
+from libraries import data as data_module
+from libraries.store import DataStore
+
+LATENCY = 0.5  # simulated round-trip per upstream request
+
+def cold_start(path, dataset):
+    with mock.patch.object(data_module.http_session(), 'get', fake_fng_get(dataset, LATENCY)) as get, \
+         mock.patch('yfinance.download', fake_yf_download(dataset, LATENCY)):
+        with mock.patch.object(data_module, 'DataStore', lambda: DataStore(path)):
+            data_module.getData.clear()
+            start = time.perf_counter()
+            result = data_module.getData()
+            return time.perf_counter() - start, result
+
+def main():
+    dataset = make_dataset(2500)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'store.sqlite')
+        full_time, full = cold_start(path, dataset)
+        warm_time, warm = cold_start(path, dataset)
+        assert full.equals(warm)
+
+        # A store that is a few days stale only pulls the missing tail
+        store = DataStore(path)
+        store.conn.execute('DELETE FROM meta')
+        store.conn.execute('DELETE FROM fear_greed WHERE timestamp > ?', (int(dataset['timestamp'].iloc[-5].timestamp()),))
+        store.conn.commit()
+        store.close()
+        stale_time, stale = cold_start(path, dataset)
+        assert full.equals(stale)
+
+    print(f"full fetch (empty store) {full_time * 1000:8.1f} ms")
+    print(f"stale store, tail fetch  {stale_time * 1000:8.1f} ms")
+    print(f"warm store, no network   {warm_time * 1000:8.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_dataset
+from libraries.streaming import MovingAverage, BollingerBands, RSI, Momentum, VWAP, save_state, load_state
+from libraries.trading import calculate_rsi, calculate_bollinger_bands, calculate_momentum, calculate_vwap
+
+def make_indicators():
+    return {
+        'ma': MovingAverage(50),
+        'bollinger': BollingerBands(20, 2.0),
+        'rsi': RSI(14),
+        'momentum': Momentum(14),
+        'vwap': VWAP(20),
+    }
+
+def update_all(indicators, close, volume):
+    return (indicators['ma'].update(close), *indicators['bollinger'].update(close), indicators['rsi'].update(close),
+            indicators['momentum'].update(close), indicators['vwap'].update(close, volume))
+
+def batch_all(data):
+    return (data['close'].rolling(window=50).mean(), *calculate_bollinger_bands(data, 20, 2.0), calculate_rsi(data, 14),
+            calculate_momentum(data, 14), calculate_vwap(data, 20))
+
+def check_against_batch(data):
+    indicators = make_indicators()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'state.json')
+        rows = []
+        for i, (close, volume) in enumerate(zip(data['close'].tolist(), data['volume'].tolist())):
+            rows.append(update_all(indicators, close, volume))
+            if i == len(data) // 2:
+                # Resume halfway through from persisted state
+                save_state(indicators, path)
+                indicators = load_state(path)
+    streamed = np.array(rows)
+    for j, expected in enumerate(batch_all(data.copy())):
+        np.testing.assert_allclose(streamed[:, j], expected.to_numpy(), rtol=1e-9, atol=1e-9, equal_nan=True)
+
+def main():
+    data = make_dataset(20_000)
+    data['volume'] = np.random.default_rng(1).uniform(1e3, 1e5, len(data))
+    check_against_batch(data)
+    print("streamed values match batch functions (rtol 1e-9), including after state restore")
+
+    for n_rows in [1_000, 10_000, 100_000, 1_000_000]:
+        history = make_dataset(n_rows)
+        history['volume'] = 1e4
+        start = time.perf_counter()
+        batch_all(history.copy())
+        recompute = time.perf_counter() - start
+
+        indicators = make_indicators()
+        closes = history['close'].tolist()
+        for close in closes[-200:]:
+            update_all(indicators, close, 1e4)
+        start = time.perf_counter()
+        for close in closes[-1000:]:
+            update_all(indicators, close, 1e4)
+        per_bar = (time.perf_counter() - start) / 1000
+
+        print(f"{n_rows:>9,} bars  full recompute {recompute * 1000:9.2f} ms  incremental update {per_bar * 1e6:7.2f} us/bar")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import make_dataset, BENCH_CONFIG
+from libraries.backtest import signal_counts, run_backtest
+from libraries.features import addSignals
+from libraries.metrics import backtest_metrics
+from libraries.optimizer import walk_forward, walk_forward_windows, grid_configs
+
+PARAM_SPACE = {
+    'short_term_ma_period': [5, 10, 20, 30],
+    'rsi_period': [7, 14, 21],
+    'buy_threshold': [1, 2, 3],
+}
+TRAIN_ROWS = 500
+TEST_ROWS = 125
+
+def per_window(data, configs, windows):
+    # Recomputes every config's indicators for every window, over the history up to that window
+    chosen = []
+    for train_start, test_start, test_end in windows:
+        best, best_score, best_counts = None, -np.inf, None
+        for i, config in enumerate(configs):
+            frame = addSignals(data.iloc[:test_end].copy(), config)
+            close = frame['close'].to_numpy(dtype=float)
+            buy, sell = signal_counts(frame, 'buy'), signal_counts(frame, 'sell')
+            _, btc_values, total_values, buys, sells = run_backtest(
+                close[train_start:test_start], buy[train_start:test_start], sell[train_start:test_start], config)
+            score = backtest_metrics(close[train_start:test_start], btc_values, total_values, buys, sells)['total_return']
+            if score > best_score:
+                best, best_score = i, score
+        chosen.append(best)
+    return chosen
+
+def main():
+    data = make_dataset(2500)
+    configs = list(grid_configs(BENCH_CONFIG, PARAM_SPACE))
+    windows = walk_forward_windows(len(data), TRAIN_ROWS, TEST_ROWS)
+
+    start = time.perf_counter()
+    table, equity = walk_forward(data, BENCH_CONFIG, PARAM_SPACE, TRAIN_ROWS, TEST_ROWS)
+    shared_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chosen = per_window(data, configs, windows)
+    loop_time = time.perf_counter() - start
+
+    picked = [{name: configs[i][name] for name in PARAM_SPACE} for i in chosen]
+    assert picked == table[list(PARAM_SPACE)].to_dict('records')
+
+    print(f"{len(configs)} configs x {len(windows)} windows ({TRAIN_ROWS} train / {TEST_ROWS} test rows)")
+    print(f"shared indicators, parallel windows  {shared_time * 1000:8.1f} ms")
+    print(f"recomputed per window                {loop_time * 1000:8.1f} ms  (same configs chosen)")
+    print(f"out-of-sample return {(equity['stitched_value'].iloc[-1] / BENCH_CONFIG['initial_balance'] - 1) * 100:.2f}%"
+          f"  mean window return {table['test_total_return'].mean():.2f}%")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_market, fake_fng_get, fake_yf_download, BENCH_CONFIG
+from libraries import data as data_module
+from libraries import plots
+from libraries.cache import set_cache_backend, no_cache
+from libraries.backtest import implement_strategy, strategy_signals
+from libraries.correlation import process_data
+from libraries.features import addFeatures, addSignals
+from libraries.store import DataStore
+from libraries.trading import indicator_cache
+
+# Times each stage of the app's pipeline on synthetic data, fully offline, and compares runs
+# against a saved baseline:
+#
+#   python -m benchmarks.suite --save main              # record a baseline
+#   python -m benchmarks.suite --compare main           # flag stages slower than the baseline
+#   python -m benchmarks.suite --sizes 10m --compare main
+#
+# Baselines are JSON files in benchmarks/baselines/; timings only compare on the same machine.
+
+SIZES = {'1k': 1_000, '100k': 100_000, '10m': 10_000_000}
+DEFAULT_SIZES = ['1k', '100k']
+REPEATS = {'1k': 15, '100k': 5, '10m': 1}
+STAGES = ['getData', 'addFeatures', 'addSignals', 'implement_strategy', 'plot_strategy_signals',
+          'process_data', 'end_to_end']
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+THRESHOLD = 0.2  # relative slowdown reported as a regression
+MIN_DELTA = 0.001  # seconds; smaller differences are timer noise
+
+def offline(fear_greed, bars, store_path):
+    # requests and yfinance are replaced by the synthetic upstreams and the store by a fresh
+    # one, so every getData call parses and stores the full history. Without a deadline, large
+    # sizes time the whole fetch rather than the fallback to the (still empty) store. The
+    # synthetic minute bars start in 2018, so Yahoo's intraday lookback is not applied.
+    stack = [
+        mock.patch.object(data_module, 'FETCH_DEADLINE', None),
+        mock.patch.object(data_module, 'INTRADAY_LOOKBACK', {}),
+        mock.patch.object(data_module.http_session(), 'get', fake_fng_get(fear_greed)),
+        mock.patch('yfinance.download', fake_yf_download(bars)),
+        mock.patch.object(data_module, 'DataStore', lambda: DataStore(store_path)),
+        mock.patch.object(plots.st, 'plotly_chart', lambda fig, **kwargs: fig.to_json()),
+        mock.patch.object(plots.st, 'subheader'),
+    ]
+    for patch in stack:
+        patch.start()
+    return stack
+
+def run_pipeline(fear_greed, bars, interval, tmp):
+    # One pass through every stage; returns seconds per stage
+    times = {}
+
+    def timed(stage, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        times[stage] = time.perf_counter() - start
+        return result
+
+    store_path = os.path.join(tmp, f'store-{time.perf_counter_ns()}.sqlite')
+    patches = offline(fear_greed, bars, store_path)
+    try:
+        indicator_cache.clear()
+        start = time.perf_counter()
+        data = timed('getData', data_module.getData, interval=interval)
+        features = timed('addFeatures', addFeatures, data)
+        signaled = timed('addSignals', addSignals, features.copy(deep=False), BENCH_CONFIG)
+        signals = strategy_signals(signaled)
+        timed('implement_strategy', implement_strategy, signaled, BENCH_CONFIG, signals)
+        timed('plot_strategy_signals', plots.plot_strategy_signals, signaled, signals)
+        timed('process_data', process_data, features.copy(deep=False), 7)
+        times['end_to_end'] = time.perf_counter() - start
+    finally:
+        for patch in patches:
+            patch.stop()
+        os.remove(store_path)
+    return times
+
+def run_suite(sizes):
+    set_cache_backend(no_cache)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Warm-up pass, so first-call costs (lazy imports, plotly validators) are not timed
+        run_pipeline(*make_market(SIZES['1k']), tmp)
+        for size in sizes:
+            fear_greed, bars, interval = make_market(SIZES[size])
+            runs = [run_pipeline(fear_greed, bars, interval, tmp) for _ in range(REPEATS[size])]
+            for stage in STAGES:
+                results[f'{stage}[{size}]'] = min(run[stage] for run in runs)
+            print(f"{size:>5}: " + '  '.join(f"{stage} {results[f'{stage}[{size}]'] * 1000:.1f} ms" for stage in STAGES),
+                  file=sys.stderr)
+    return results
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'date': pd.Timestamp.now().isoformat(timespec='seconds'),
+    }
+
+def baseline_path(name):
+    return name if name.endswith('.json') else os.path.join(BASELINE_DIR, f'{name}.json')
+
+def save_baseline(name, results):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    with open(baseline_path(name), 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+
+def load_baseline(name):
+    path = baseline_path(name)
+    if not os.path.exists(path):
+        raise SystemExit(f'No baseline at {path}; record one with --save {name}')
+    with open(path) as f:
+        return json.load(f)
+
+def compare(baseline, results, threshold=THRESHOLD, min_delta=MIN_DELTA):
+    # One row per benchmark in both runs; status is 'regression', 'improvement' or 'ok'
+    rows = []
+    for key, current in results.items():
+        previous = baseline['results'].get(key)
+        if previous is None:
+            continue
+        change = current / previous - 1 if previous > 0 else 0.0
+        if change > threshold and current - previous > min_delta:
+            status = 'regression'
+        elif change < -threshold / (1 + threshold) and previous - current > min_delta:
+            status = 'improvement'
+        else:
+            status = 'ok'
+        rows.append({'benchmark': key, 'baseline_ms': previous * 1000, 'current_ms': current * 1000,
+                     'change_pct': change * 100, 'status': status})
+    return pd.DataFrame(rows, columns=['benchmark', 'baseline_ms', 'current_ms', 'change_pct', 'status'])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite', description='Benchmark the data and strategy pipeline offline.')
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=DEFAULT_SIZES,
+                        help='dataset sizes to run (default: 1k 100k; 10m needs a few GB of memory)')
+    parser.add_argument('--save', metavar='NAME', help='save the timings as baseline NAME')
+    parser.add_argument('--compare', metavar='NAME', help='compare the timings with baseline NAME')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help=f'relative slowdown flagged as a regression (default: {THRESHOLD})')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes)
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"saved baseline {baseline_path(args.save)}", file=sys.stderr)
+    if not args.compare:
+        for key, seconds in results.items():
+            print(f"{key:32} {seconds * 1000:10.2f} ms")
+        return
+
+    baseline = load_baseline(args.compare)
+    if baseline['environment'].get('machine') != platform.machine() or baseline['environment'].get('cpus') != os.cpu_count():
+        print("warning: the baseline was recorded on a different machine", file=sys.stderr)
+    report = compare(baseline, results, args.threshold)
+    print(report.to_string(index=False, float_format=lambda x: f'{x:.2f}'))
+    regressions = report[report['status'] == 'regression']
+    if len(regressions):
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions['benchmark'])}")
+        sys.exit(1)
+    print(f"no regressions beyond {args.threshold:.0%}")
+
+if __name__ == '__main__':
+    main()
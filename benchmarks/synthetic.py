@@ -0,0 +1,128 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+CLASSIFICATION_BINS = [25, 47, 55, 76]
+CLASSIFICATIONS = ['Extreme Fear', 'Fear', 'Neutral', 'Greed', 'Extreme Greed']
+
+# Deterministic stand-in for the frame returned by getData
+def make_dataset(n_rows, seed=0, freq='D'):
+    rng = np.random.default_rng(seed)
+    close = 10000 * np.exp(np.cumsum(rng.normal(0, 0.03, n_rows)))
+    fear_greed, classification = _fear_greed_walk(rng, n_rows)
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2018-02-01', periods=n_rows, freq=freq),
+        'fear_greed': fear_greed,
+        'value_classification': classification,
+        'close': close,
+    })
+
+def _fear_greed_walk(rng, n_rows):
+    fear_greed = np.clip(50 + np.cumsum(rng.normal(0, 4, n_rows)) % 100 - 50 + rng.integers(-5, 6, n_rows), 0, 100).astype(int)
+    return fear_greed, np.array(CLASSIFICATIONS)[np.digitize(fear_greed, CLASSIFICATION_BINS)]
+
+# Deterministic upstream data at any size: the daily Fear & Greed history and OHLCV bars over
+# the same period. Bars are daily up to DAILY_LIMIT rows and minute bars beyond, since daily
+# timestamps would run past the year 2262 that pandas can represent.
+DAILY_LIMIT = 50_000
+
+def make_market(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    freq, volatility = ('D', 0.03) if n_rows <= DAILY_LIMIT else ('min', 0.0008)
+    timestamps = pd.date_range('2018-02-01', periods=n_rows, freq=freq)
+    close = 10000 * np.exp(np.cumsum(rng.normal(0, volatility, n_rows)))
+    open_ = np.concatenate([close[:1], close[:-1]])
+    wick = np.abs(rng.normal(0, volatility / 2, n_rows))
+    bars = pd.DataFrame({
+        'timestamp': timestamps,
+        'open': open_,
+        'high': np.maximum(open_, close) * (1 + wick),
+        'low': np.minimum(open_, close) * (1 - wick),
+        'close': close,
+        'volume': rng.lognormal(10, 1, n_rows),
+    })
+    days = pd.date_range(timestamps[0].normalize(), timestamps[-1].normalize(), freq='D')
+    fear_greed, classification = _fear_greed_walk(rng, len(days))
+    fear_greed = pd.DataFrame({'timestamp': days, 'fear_greed': fear_greed, 'value_classification': classification})
+    return fear_greed, bars, '1d' if freq == 'D' else '1m'
+
+# Date x asset closes sharing one Fear & Greed series; later assets list part-way through
+def make_multi_dataset(n_assets, n_rows, seed=0):
+    data = make_dataset(n_rows, seed=seed)
+    rng = np.random.default_rng(seed + 1)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.04, (n_rows, n_assets)), axis=0))
+    listed_from = rng.integers(0, n_rows // 2, n_assets)
+    listed_from[0] = 0
+    closes[np.arange(n_rows)[:, None] < listed_from] = np.nan
+    tickers = [f'COIN{i}-USD' for i in range(n_assets)]
+    return data.drop(columns=['close']), pd.DataFrame(closes, columns=tickers)
+
+BENCH_CONFIG = {
+    'moving_avg_enabled': True,
+    'short_term_ma_period': 10,
+    'long_term_ma_period': 50,
+    'fear_greed_enabled': True,
+    'fear_greed_buy_threshold': 25,
+    'fear_greed_sell_threshold': 76,
+    'rsi_enabled': True,
+    'rsi_period': 14,
+    'rsi_buy_threshold': 30,
+    'rsi_sell_threshold': 70,
+    'bollinger_enabled': True,
+    'bollinger_std_dev_multiplier': 2.0,
+    'momentum_enabled': True,
+    'momentum_period': 14,
+    'buy_threshold': 2,
+    'sell_threshold': 2,
+    'stop_loss_enabled': True,
+    'stop_loss_percentage': 5.0,
+    'take_profit_enabled': True,
+    'take_profit_percentage': 10.0,
+    'dollar_cost_avg_enabled': False,
+    'dollar_cost_avg_period': 'Daily',
+    'initial_balance': 1000,
+    'trade_amount': 50
+}
+
+# Offline stand-ins for the two upstreams, serving a synthetic dataset
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        pass
+
+def fake_fng_get(data, latency=0.0):
+    def get(url, *args, **kwargs):
+        time.sleep(latency)
+        limit = int(url.split('limit=')[1].split('&')[0]) if 'limit=' in url else 1
+        rows = data.iloc[::-1] if limit == 0 else data.iloc[::-1].head(limit)
+        payload = [{
+            'value': str(value),
+            'value_classification': classification,
+            'timestamp': str(int(ts.timestamp())),
+        } for value, classification, ts in zip(rows['fear_greed'], rows['value_classification'], rows['timestamp'])]
+        if payload:
+            payload[0]['time_until_update'] = '3600'
+        return FakeResponse({'name': 'Fear and Greed Index', 'data': payload})
+    return get
+
+def fake_yf_download(data, latency=0.0, closes=None):
+    # closes: optional date x ticker frame served for batched (list) downloads
+    def download(ticker, interval='1d', start=None, **kwargs):
+        time.sleep(latency)
+        if isinstance(ticker, list):
+            frame = closes[ticker].set_axis(data['timestamp']).dropna(how='all')
+            frame.columns = pd.MultiIndex.from_product([['Close'], ticker])
+        else:
+            columns = [col for col in ['open', 'high', 'low', 'close', 'volume'] if col in data.columns]
+            frame = data.set_index('timestamp')[columns].rename(columns=str.capitalize)
+        frame.index.name = 'Date'
+        if start is not None:
+            frame = frame[frame.index >= pd.Timestamp(start)]
+        return frame
+    return download
@@ -0,0 +1,268 @@
+import numpy as np
+import pandas as pd
+from libraries.trading import calculate_rsi, calculate_bollinger_bands, calculate_momentum
+from libraries.rules import evaluate_rules_batch
+from libraries.profiling import traced
+
+SIGNAL_INDICATORS = ['ma', 'fear_greed', 'rsi', 'bollinger', 'momentum', 'rule']
+SIGNAL_LABELS = {
+    'ma': 'Moving Average',
+    'fear_greed': 'Fear & Greed',
+    'rsi': 'RSI',
+    'bollinger': 'Bollinger Bands',
+    'momentum': 'Momentum',
+    'rule': 'Custom Rule',
+}
+
+# Strategy settings the Strategy Creator starts from; config files only need the keys they change
+DEFAULT_CONFIG = {
+    'moving_avg_enabled': False,
+    'short_term_ma_period': 10,
+    'long_term_ma_period': 50,
+    'fear_greed_enabled': False,
+    'fear_greed_buy_threshold': 25,
+    'fear_greed_sell_threshold': 76,
+    'rsi_enabled': False,
+    'rsi_period': 14,
+    'rsi_buy_threshold': 30,
+    'rsi_sell_threshold': 70,
+    'bollinger_enabled': False,
+    'bollinger_std_dev_multiplier': 2.0,
+    'momentum_enabled': False,
+    'momentum_period': 14,
+    'buy_threshold': 1,
+    'sell_threshold': 1,
+    'stop_loss_enabled': False,
+    'stop_loss_percentage': 5.0,
+    'take_profit_enabled': False,
+    'take_profit_percentage': 10.0,
+    'dollar_cost_avg_enabled': False,
+    'dollar_cost_avg_period': 'Daily',
+    'initial_balance': 1000,
+    'trade_amount': 50,
+    'dca_amount': 50,  # USD each DCA baseline buys per period; 0 spreads the start balance over the range
+    'buy_rule': '',
+    'sell_rule': ''
+}
+
+# (n_rows x n_indicators) boolean matrix of the *_{signal_type}_signal columns; missing columns are all False
+def signal_matrix(data, signal_type):
+    matrix = np.zeros((len(data), len(SIGNAL_INDICATORS)), dtype=bool)
+    for j, indicator in enumerate(SIGNAL_INDICATORS):
+        col = f'{indicator}_{signal_type}_signal'
+        if col in data.columns:
+            matrix[:, j] = data[col].to_numpy(dtype=bool, na_value=False)
+    return matrix
+
+# Vectorized equivalent of plots.count_signals over the whole frame
+def signal_counts(data, signal_type):
+    return signal_matrix(data, signal_type).sum(axis=1)
+
+def fired_indicators(matrix):
+    # Comma-separated labels of the indicators that fired on each row, via a lookup over bitmasks
+    labels = [SIGNAL_LABELS[indicator] for indicator in SIGNAL_INDICATORS]
+    table = np.array([', '.join(label for j, label in enumerate(labels) if code >> j & 1)
+                      for code in range(2 ** len(labels))], dtype=object)
+    return table[matrix @ (1 << np.arange(len(labels)))]
+
+# Buy and sell matrices plus per-row counts, built once and shared by the backtest and the plots
+@traced()
+def strategy_signals(data):
+    buy, sell = signal_matrix(data, 'buy'), signal_matrix(data, 'sell')
+    return {
+        'buy': buy,
+        'sell': sell,
+        'buy_counts': buy.sum(axis=1),
+        'sell_counts': sell.sum(axis=1),
+    }
+
+def place_buy_order(balance, btc_held, price, trade_amount):
+    spend = min(trade_amount, balance)
+    return balance - spend, btc_held + spend / price
+
+def place_sell_order(balance, btc_held, price, trade_amount):
+    btc_to_sell = min(trade_amount / price, btc_held)
+    return balance + btc_to_sell * price, btc_held - btc_to_sell
+
+def trade_permissions(buy_counts, sell_counts, buy_threshold, sell_threshold):
+    # Signal strength rules from implement_strategy, evaluated for every row at once
+    buy_strength = buy_counts / buy_threshold if buy_threshold > 0 else np.zeros(len(buy_counts))
+    sell_strength = sell_counts / sell_threshold if sell_threshold > 0 else np.zeros(len(sell_counts))
+    can_buy = (buy_strength > sell_strength) & (buy_counts >= buy_threshold)
+    can_sell = (sell_counts > buy_counts) & (sell_counts >= sell_threshold)
+    return can_buy, can_sell
+
+@traced()
+def run_backtest(close, buy_counts, sell_counts, config):
+    balance = config['initial_balance']
+    btc_held = 0
+    trade_amount = config['trade_amount']
+    stop_loss_enabled = config['stop_loss_enabled']
+    stop_loss_percentage = config['stop_loss_percentage'] / 100
+    take_profit_enabled = config['take_profit_enabled']
+    take_profit_percentage = config['take_profit_percentage'] / 100
+
+    can_buy, can_sell = trade_permissions(np.asarray(buy_counts), np.asarray(sell_counts),
+                                          config['buy_threshold'], config['sell_threshold'])
+
+    n = len(close)
+    balances = [0] * n
+    btc_values = [0] * n
+    total_values = [0] * n
+    buy_positions = []
+    sell_positions = []
+    last_buy_price = None
+
+    # The state machine stays sequential, but runs over plain Python floats
+    for i, price, buy_ok, sell_ok in zip(range(n), np.asarray(close, dtype=float).tolist(),
+                                         can_buy.tolist(), can_sell.tolist()):
+        if last_buy_price is not None and (stop_loss_enabled or take_profit_enabled):
+            if stop_loss_enabled:
+                exit_trade = price <= last_buy_price * (1 - stop_loss_percentage)
+            else:
+                exit_trade = price >= last_buy_price * (1 + take_profit_percentage)
+            if exit_trade:
+                balance, btc_held = place_sell_order(balance, btc_held, price, trade_amount)
+                sell_positions.append(i)
+                if btc_held == 0:
+                    last_buy_price = None
+        elif buy_ok and balance > 0:
+            balance, btc_held = place_buy_order(balance, btc_held, price, trade_amount)
+            buy_positions.append(i)
+            last_buy_price = price
+        elif sell_ok and btc_held > 0:
+            balance, btc_held = place_sell_order(balance, btc_held, price, trade_amount)
+            sell_positions.append(i)
+            if btc_held == 0:
+                last_buy_price = None
+
+        btc_value = btc_held * price
+        balances[i] = balance
+        btc_values[i] = btc_value
+        total_values[i] = balance + btc_value
+
+    return balances, btc_values, total_values, buy_positions, sell_positions
+
+# Row-by-row signal count, kept as the reference for signal_counts
+def count_signals(row, signal_type):
+    signal_columns = [
+        f'ma_{signal_type}_signal',
+        f'fear_greed_{signal_type}_signal',
+        f'rsi_{signal_type}_signal',
+        f'bollinger_{signal_type}_signal',
+        f'momentum_{signal_type}_signal',
+        f'rule_{signal_type}_signal'
+    ]
+    return sum(row.get(col, False) for col in signal_columns if col in row.index)
+
+@traced()
+def implement_strategy(data, config, signals=None):
+    signals = signals if signals is not None else strategy_signals(data)
+
+    balances, btc_values, total_values, buy_positions, sell_positions = run_backtest(
+        data['close'].to_numpy(), signals['buy_counts'], signals['sell_counts'], config)
+
+    # Report trades by index label, as the row-by-row version did
+    buy_signals = data.index[buy_positions].tolist()
+    sell_signals = data.index[sell_positions].tolist()
+
+    return balances, btc_values, total_values, buy_signals, sell_signals
+
+# Signal counts for many assets at once; closes is a date x asset frame and the rules mirror addSignals.
+# fear_greed is one column shared by every asset, or a date x asset array of its own.
+def batch_signal_counts(closes, fear_greed, config):
+    data = {'close': closes}
+    buy_counts = np.zeros(closes.shape, dtype=np.int64)
+    sell_counts = np.zeros(closes.shape, dtype=np.int64)
+
+    def add(buy_signal, sell_signal):
+        buy_counts[:] += np.asarray(buy_signal, dtype=bool)
+        sell_counts[:] += np.asarray(sell_signal, dtype=bool)
+
+    if config['moving_avg_enabled']:
+        ma_short = closes.rolling(window=config['short_term_ma_period']).mean()
+        ma_long = closes.rolling(window=config['long_term_ma_period']).mean()
+        add(ma_short > ma_long, ma_short < ma_long)
+    if config['fear_greed_enabled']:
+        fg = np.asarray(fear_greed, dtype=float)
+        fg = fg[:, None] if fg.ndim == 1 else fg
+        add(np.broadcast_to(fg < config['fear_greed_buy_threshold'], closes.shape),
+            np.broadcast_to(fg > config['fear_greed_sell_threshold'], closes.shape))
+    if config['rsi_enabled']:
+        rsi = calculate_rsi(data, config['rsi_period'])
+        add(rsi < config['rsi_buy_threshold'], rsi > config['rsi_sell_threshold'])
+    if config['bollinger_enabled']:
+        _, upper, lower = calculate_bollinger_bands(data, 20, config['bollinger_std_dev_multiplier'])
+        add(closes < lower, closes > upper)
+    if config['momentum_enabled']:
+        momentum = calculate_momentum(data, config['momentum_period'])
+        add(momentum > 0, momentum < 0)
+    # Custom rules run column-wise over every asset at once, sharing their indicators;
+    # config.get keeps configs from before rules working
+    rules = [(rule, counts) for rule, counts in [(config.get('buy_rule'), buy_counts), (config.get('sell_rule'), sell_counts)] if rule]
+    if rules:
+        fired = evaluate_rules_batch({'close': closes, 'fear_greed': np.asarray(fear_greed, dtype=float)},
+                                     [rule for rule, _ in rules])
+        for (_, counts), values in zip(rules, fired):
+            counts += values
+
+    return buy_counts, sell_counts
+
+# Same rules as run_backtest, stepping through time with every asset column updated at once.
+# Prices may be NaN before an asset is listed; no trades happen on those rows.
+def run_backtest_batch(closes, buy_counts, sell_counts, config):
+    closes = np.asarray(closes, dtype=float)
+    n, m = closes.shape
+    trade_amount = config['trade_amount']
+    stop_loss_enabled = config['stop_loss_enabled']
+    stop_loss_percentage = config['stop_loss_percentage'] / 100
+    take_profit_enabled = config['take_profit_enabled']
+    take_profit_percentage = config['take_profit_percentage'] / 100
+
+    can_buy, can_sell = trade_permissions(np.asarray(buy_counts), np.asarray(sell_counts),
+                                          config['buy_threshold'], config['sell_threshold'])
+
+    balance = np.full(m, float(config['initial_balance']))
+    btc_held = np.zeros(m)
+    last_buy_price = np.full(m, np.nan)
+    balances = np.empty((n, m))
+    btc_values = np.empty((n, m))
+    buys = np.zeros((n, m), dtype=bool)
+    sells = np.zeros((n, m), dtype=bool)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for i in range(n):
+            price = closes[i]
+            listed = ~np.isnan(price)
+            in_trade = ~np.isnan(last_buy_price)
+
+            if stop_loss_enabled or take_profit_enabled:
+                # While a position is open only the exit rule is checked, as in run_backtest
+                if stop_loss_enabled:
+                    exit_trade = in_trade & (price <= last_buy_price * (1 - stop_loss_percentage))
+                else:
+                    exit_trade = in_trade & (price >= last_buy_price * (1 + take_profit_percentage))
+                rules = ~in_trade & listed
+            else:
+                exit_trade = np.zeros(m, dtype=bool)
+                rules = listed
+
+            buy = rules & can_buy[i] & (balance > 0)
+            sell = exit_trade | (rules & ~buy & can_sell[i] & (btc_held > 0))
+
+            spend = np.minimum(trade_amount, balance)
+            balance = np.where(buy, balance - spend, balance)
+            btc_held = np.where(buy, btc_held + spend / price, btc_held)
+            last_buy_price = np.where(buy, price, last_buy_price)
+
+            btc_to_sell = np.minimum(trade_amount / price, btc_held)
+            balance = np.where(sell, balance + btc_to_sell * price, balance)
+            btc_held = np.where(sell, btc_held - btc_to_sell, btc_held)
+            last_buy_price = np.where(sell & (btc_held == 0), np.nan, last_buy_price)
+
+            balances[i] = balance
+            btc_values[i] = np.where(listed, btc_held * price, 0.0)
+            buys[i] = buy
+            sells[i] = sell
+
+    return balances, btc_values, balances + btc_values, buys, sells
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from libraries.profiling import traced
+
+# Passive strategies to compare a backtest against. Each returns (balances, btc_values,
+# total_values) arrays, the equity-curve part of what implement_strategy returns.
+
+CADENCES = {'Daily': 'D', 'Weekly': 'W', 'Monthly': 'M'}
+
+def cadence_rows(timestamps, cadence='Daily'):
+    # First bar of every day, week or month
+    periods = pd.DatetimeIndex(timestamps).to_period(CADENCES[cadence]).asi8
+    return np.flatnonzero(np.r_[True, periods[1:] != periods[:-1]])
+
+def _accumulate(close, amounts, initial_balance):
+    # amounts holds the USD planned for each row (0 when not buying). Spending is capped by
+    # the cash left, as in place_buy_order, and the sums run in the same order as a loop
+    # over the rows would, so results are bit-for-bit equal to one.
+    cash_after = np.cumsum(np.concatenate([[float(initial_balance)], -amounts]))
+    spend = amounts.copy()
+    short = np.flatnonzero(cash_after[1:] < 0)
+    if len(short):
+        spend[short[0]] = cash_after[short[0]]
+        spend[short[0] + 1:] = 0.0
+    balances = np.cumsum(np.concatenate([[float(initial_balance)], -spend]))[1:]
+    btc_values = np.cumsum(spend / close) * close
+    return balances, btc_values, balances + btc_values
+
+def buy_and_hold(close, initial_balance):
+    close = np.asarray(close, dtype=float)
+    amounts = np.zeros(len(close))
+    amounts[:1] = initial_balance
+    return _accumulate(close, amounts, initial_balance)
+
+# Buys `amount` on the first bar of every period; without an amount the whole initial
+# balance is spread evenly over the periods in the range
+def dca(close, timestamps, initial_balance, cadence='Daily', amount=None):
+    close = np.asarray(close, dtype=float)
+    rows = cadence_rows(timestamps, cadence)
+    amounts = np.zeros(len(close))
+    amounts[rows] = initial_balance / len(rows) if amount is None else amount
+    return _accumulate(close, amounts, initial_balance)
+
+# DCA that scales each purchase by (100 - fear_greed) / 50: twice the base amount at
+# extreme fear (0), nothing at extreme greed (100). Without an amount the base is chosen
+# so the whole initial balance is spent over the range.
+def fear_greed_dca(close, fear_greed, timestamps, initial_balance, cadence='Daily', amount=None):
+    close = np.asarray(close, dtype=float)
+    rows = cadence_rows(timestamps, cadence)
+    weights = (100 - np.asarray(fear_greed, dtype=float)[rows]) / 50
+    base = initial_balance / weights.sum() if amount is None and weights.sum() > 0 else (amount or 0.0)
+    amounts = np.zeros(len(close))
+    amounts[rows] = base * weights
+    return _accumulate(close, amounts, initial_balance)
+
+BASELINE_LABELS = {
+    'buy_and_hold': 'Buy & Hold',
+    'dca': 'DCA',
+    'fear_greed_dca': 'Fear & Greed DCA',
+}
+
+def dca_amount(config):
+    # The config's DCA amount, or None to spread the start balance; configs saved before
+    # the key existed buy the trade amount
+    amount = config.get('dca_amount', config['trade_amount'])
+    return amount or None
+
+@traced()
+def baseline_curves(data, config):
+    # Every baseline for a backtest's data and config, keyed as in BASELINE_LABELS
+    close, timestamps = data['close'].to_numpy(dtype=float), data['timestamp']
+    initial_balance, cadence = config['initial_balance'], config['dollar_cost_avg_period']
+    amount = dca_amount(config)
+    return {
+        'buy_and_hold': buy_and_hold(close, initial_balance),
+        'dca': dca(close, timestamps, initial_balance, cadence, amount),
+        'fear_greed_dca': fear_greed_dca(close, data['fear_greed'], timestamps, initial_balance, cadence, amount),
+    }
@@ -0,0 +1,139 @@
+import copy
+import functools
+import inspect
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Pluggable result cache for the data loaders. A backend is a callable (func, ttl) -> cached func.
+# The backend is resolved on the first call rather than at import, so worker processes never
+# import streamlit while the pages, which import it first, keep using st.cache_data.
+
+def memory_cache(func, ttl=None):
+    # Per-process cache keyed on the pickled call arguments, for the CLI and other headless runs.
+    # Like st.cache_data, callers get a copy they are free to mutate.
+    results = {}
+    lock = threading.Lock()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = pickle.dumps((args, sorted(kwargs.items())))
+        with lock:
+            hit = results.get(key)
+        if hit is not None and (ttl is None or time.monotonic() - hit[0] < ttl):
+            return copy.copy(hit[1])
+        value = func(*args, **kwargs)
+        with lock:
+            results[key] = (time.monotonic(), value)
+        return copy.copy(value)
+
+    wrapper.clear = results.clear
+    return wrapper
+
+def no_cache(func, ttl=None):
+    return func
+
+def streamlit_cache(func, ttl=None):
+    import streamlit as st
+    return st.cache_data(ttl=ttl)(func)
+
+_backend = None
+
+def set_cache_backend(backend):
+    # Only affects functions that have not been called yet
+    global _backend
+    _backend = backend
+
+def get_cache_backend():
+    if _backend is not None:
+        return _backend
+    return streamlit_cache if 'streamlit' in sys.modules else memory_cache
+
+def cache_data(ttl=None):
+    def decorator(func):
+        cached = None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal cached
+            if cached is None:
+                cached = get_cache_backend()(func, ttl)
+            return cached(*args, **kwargs)
+
+        def clear():
+            if cached is not None and hasattr(cached, 'clear'):
+                cached.clear()
+
+        wrapper.clear = clear
+        return wrapper
+    return decorator
+
+# Caching for the stages of a page's pipeline (features, filtering, per-plot computations).
+# Results are keyed by the stage's inputs and shared between reruns and sessions rather than
+# copied like cache_data: frames come back as shallow copy-on-write copies, arrays read-only and
+# Plotly figures as copies, so callers can add columns or update layouts without touching the
+# cached result. Arguments whose names start with _ are left out of the key, as with
+# st.cache_data; pass an upstream stage's result that way together with the inputs that
+# determined it, so a stage reruns only when those change.
+STAGE_CACHE = True  # switched off by benchmarks to measure the uncached pipeline
+
+# Streamlit re-executes a page on every rerun, redefining its stage functions, so each
+# stage's entries are kept here by source file and name rather than on the function
+_stages = {}
+_stages_lock = threading.Lock()
+
+def _freeze(value):
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        value = tuple(_freeze(item) for item in value)
+    return value
+
+def _share(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, tuple):
+        return tuple(_share(item) for item in value)
+    if hasattr(value, 'to_plotly_json'):
+        return type(value)(value)  # figures are mutable, so every caller gets its own copy
+    return value
+
+def cache_stage(max_entries=16):
+    def decorator(func):
+        signature = inspect.signature(func)
+        with _stages_lock:
+            results, lock = _stages.setdefault((func.__code__.co_filename, func.__qualname__),
+                                               (OrderedDict(), threading.Lock()))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not STAGE_CACHE:
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = tuple((name, value) for name, value in bound.arguments.items() if not name.startswith('_'))
+            with lock:
+                if key in results:
+                    results.move_to_end(key)
+                    return _share(results[key])
+            value = _freeze(func(*args, **kwargs))
+            with lock:
+                results[key] = value
+                while len(results) > max_entries:
+                    results.popitem(last=False)
+            return _share(value)
+
+        wrapper.clear = results.clear
+        return wrapper
+    return decorator
+
+def clear_stages():
+    with _stages_lock:
+        for results, lock in _stages.values():
+            with lock:
+                results.clear()
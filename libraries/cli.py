@@ -0,0 +1,249 @@
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from libraries.backtest import DEFAULT_CONFIG, strategy_signals, run_backtest
+from libraries.baselines import baseline_curves
+from libraries.features import addSignals, mergeSources, sliceDates
+from libraries.metrics import backtest_metrics, bars_per_year
+from libraries.store import DataStore, STORE_PATH, price_source
+
+# Headless batch runner: python -m libraries.cli configs.json --out results/
+# Reads only the local store (run the app once, or let it refresh, to fill it) and
+# never imports streamlit or plotly, so a run starts in well under a second.
+
+_worker_data = None
+
+def _set_worker_data(data):
+    global _worker_data
+    _worker_data = data
+
+def load_dataset(store_path=STORE_PATH, ticker='BTC-USD', interval='1d', start=None, end=None):
+    store = DataStore(store_path)
+    try:
+        fear_greed = store.load_fear_greed()
+        prices = store.load_prices(price_source(ticker, interval))
+    finally:
+        store.close()
+    if fear_greed.empty or prices.empty:
+        raise SystemExit(f'No stored data for fear_greed and {price_source(ticker, interval)} in {store_path}')
+    data = mergeSources(fear_greed, prices, interval)
+    if start is not None or end is not None:
+        data = sliceDates(data, pd.Timestamp(start or data['timestamp'].iloc[0]),
+                          _day_end(end) if end else data['timestamp'].iloc[-1])
+    if data.empty:
+        raise SystemExit(f'No stored {price_source(ticker, interval)} rows between {start or "the first day"} '
+                         f'and {end or "the last day"} in {store_path}')
+    return data
+
+def _day_end(value):
+    # A bare date means the whole of that day, so intraday bars after midnight are kept
+    try:
+        date.fromisoformat(value)
+    except ValueError:
+        return pd.Timestamp(value)
+    return pd.Timestamp(value) + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')
+
+def _read_config_file(path):
+    with open(path) as f:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise SystemExit('Reading YAML configs needs PyYAML (pip install pyyaml); JSON configs work without it')
+            return yaml.safe_load(f)
+        return json.load(f)
+
+def _check_keys(path, name, keys):
+    unknown = set(keys) - set(DEFAULT_CONFIG)
+    if unknown:
+        raise SystemExit(f'{path}: {name} has unknown keys: {", ".join(sorted(unknown))}')
+
+def load_configs(path):
+    # One config, a list of configs, or a {name: config} mapping; each is merged over DEFAULT_CONFIG
+    raw = _read_config_file(path)
+
+    if isinstance(raw, list):
+        named = {f'config_{i}': config for i, config in enumerate(raw)}
+    elif isinstance(raw, dict) and raw and all(isinstance(value, dict) for value in raw.values()):
+        named = raw
+    elif isinstance(raw, dict):
+        named = {os.path.splitext(os.path.basename(path))[0]: raw}
+    else:
+        raise SystemExit(f'{path}: expected a config object, a list of configs or a mapping of names to configs')
+
+    configs = {}
+    for name, config in named.items():
+        _check_keys(path, f'config {name!r}', config)
+        configs[str(name)] = {**DEFAULT_CONFIG, **config}
+    return configs
+
+def load_param_space(path):
+    # {"base": {...}, "space": {key: [values, ...]}} for walk-forward runs
+    raw = _read_config_file(path)
+    if not isinstance(raw, dict) or not isinstance(raw.get('space'), dict):
+        raise SystemExit(f'{path}: walk-forward needs a "space" mapping of config keys to lists of values')
+    _check_keys(path, 'base', raw.get('base', {}))
+    _check_keys(path, 'space', raw['space'])
+    return {**DEFAULT_CONFIG, **raw.get('base', {})}, raw['space']
+
+def run_config(data, config):
+    data = addSignals(data.copy(deep=False), config)
+    signals = strategy_signals(data)
+    close = data['close'].to_numpy(dtype=float)
+    balances, btc_values, total_values, buy_positions, sell_positions = run_backtest(
+        close, signals['buy_counts'], signals['sell_counts'], config)
+
+    equity = pd.DataFrame({
+        'timestamp': data['timestamp'].to_numpy(),
+        'close': close,
+        'balance': balances,
+        'btc_value': btc_values,
+        'total_value': total_values,
+    })
+    positions = buy_positions + sell_positions
+    trades = pd.DataFrame({
+        'timestamp': data['timestamp'].to_numpy()[positions],
+        'side': ['buy'] * len(buy_positions) + ['sell'] * len(sell_positions),
+        'price': close[positions],
+        'buy_count': signals['buy_counts'][positions],
+        'sell_count': signals['sell_counts'][positions],
+    }).sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+    summary = backtest_metrics(close, btc_values, total_values, buy_positions, sell_positions,
+                               bars_per_year(data['timestamp']))
+    # Total return of each passive baseline over the same rows, for comparison
+    for name, (_, _, baseline_values) in baseline_curves(data, config).items():
+        summary[f'{name}_return'] = ((baseline_values[-1] - baseline_values[0]) / baseline_values[0] * 100
+                                     if baseline_values[0] else 0.0)
+    return summary, equity, trades
+
+def _run_task(task):
+    name, config = task
+    return name, run_config(_worker_data, config)
+
+def run_configs(data, configs, workers=None):
+    tasks = list(configs.items())
+    workers = min(workers or os.cpu_count(), len(tasks))
+    if workers <= 1:
+        _set_worker_data(data)
+        return [_run_task(task) for task in tasks]
+    # The dataset is sent to each worker once, not once per config
+    with ProcessPoolExecutor(max_workers=workers, initializer=_set_worker_data, initargs=(data,)) as pool:
+        return list(pool.map(_run_task, tasks))
+
+def _check_format(fmt):
+    if fmt == 'parquet' and importlib.util.find_spec('pyarrow') is None and importlib.util.find_spec('fastparquet') is None:
+        raise SystemExit('Parquet output needs pyarrow (pip install pyarrow); use --format json instead')
+
+def _write_table(frame, out_dir, table, fmt):
+    if fmt == 'parquet':
+        frame.to_parquet(os.path.join(out_dir, f'{table}.parquet'), index=False)
+    else:
+        frame.to_json(os.path.join(out_dir, f'{table}.json'), orient='records', date_format='iso')
+
+def write_results(results, configs, out_dir, fmt='parquet'):
+    _check_format(fmt)
+    os.makedirs(out_dir, exist_ok=True)
+
+    # NaN (e.g. no closed trades for a win rate) is written as null to keep the file valid JSON
+    summary = [{'name': name, **{k: None if v != v else v for k, v in result[0].items()},
+                'config': configs[name]} for name, result in results]
+    with open(os.path.join(out_dir, 'summary.json'), 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    # Equity curves and trades of every config in one long table each, keyed by name
+    for i, table in [(1, 'equity'), (2, 'trades')]:
+        frame = pd.concat([result[i].assign(name=name) for name, result in results], ignore_index=True)
+        frame = frame[['name'] + [col for col in frame.columns if col != 'name']]
+        _write_table(frame, out_dir, table, fmt)
+
+def run_walk_forward(args, data):
+    from libraries.optimizer import walk_forward
+
+    base_config, param_space = load_param_space(args.configs)
+    train_rows, test_rows = args.walk_forward
+    windows, equity = walk_forward(data, base_config, param_space, train_rows, test_rows, step=args.step,
+                                   metric=args.metric, workers=args.workers)
+    _check_format(args.format)
+    os.makedirs(args.out, exist_ok=True)
+    _write_table(windows, args.out, 'windows', args.format)
+    _write_table(equity, args.out, 'equity', args.format)
+
+    print(windows.to_string(index=False))
+    final = equity['stitched_value'].iloc[-1]
+    print(f"stitched out-of-sample return {(final / base_config['initial_balance'] - 1) * 100:.2f}%")
+
+def run_monte_carlo(args, data, configs):
+    from libraries.simulation import monte_carlo, distribution_summary
+
+    _check_format(args.format)
+    os.makedirs(args.out, exist_ok=True)
+    summaries, paths = {}, []
+    for name, config in configs.items():
+        result = monte_carlo(data, config, args.monte_carlo, args.block_size, args.seed, args.workers,
+                             bars_per_year(data['timestamp']), processes=True)
+        summaries[name] = distribution_summary(result)
+        paths.append(result.assign(name=name, path=np.arange(len(result))))
+        print(f"{name}\n{summaries[name].round(2).to_string()}")
+
+    with open(os.path.join(args.out, 'monte_carlo.json'), 'w') as f:
+        json.dump({name: summary.to_dict(orient='index') for name, summary in summaries.items()}, f, indent=2)
+    _write_table(pd.concat(paths, ignore_index=True), args.out, 'paths', args.format)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m libraries.cli', description='Run strategy backtests without the Streamlit UI.')
+    parser.add_argument('configs', help='JSON (or YAML, with PyYAML) file of strategy configs')
+    parser.add_argument('--out', default='results', help='output directory (default: results)')
+    parser.add_argument('--format', choices=['parquet', 'json'], default='parquet', help='equity and trades file format')
+    parser.add_argument('--store', default=STORE_PATH, help='SQLite store to read (default: FGI_STORE_PATH or data/store.sqlite)')
+    parser.add_argument('--ticker', default='BTC-USD')
+    parser.add_argument('--interval', default='1d')
+    parser.add_argument('--start', help='first date to include (YYYY-MM-DD)')
+    parser.add_argument('--end', help='last date to include, the whole day (YYYY-MM-DD)')
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per CPU)')
+    parser.add_argument('--dca-amount', type=float, metavar='USD',
+                        help="USD the DCA baselines buy per period, for every config (0 spreads the start balance; default: each config's dca_amount)")
+    parser.add_argument('--walk-forward', nargs=2, type=int, metavar=('TRAIN', 'TEST'),
+                        help='walk-forward over TRAIN/TEST-row windows; the file then holds {"base": config, "space": {key: values}}')
+    parser.add_argument('--step', type=int, help='rows between walk-forward windows (default: TEST)')
+    parser.add_argument('--metric', default='total_return', help='metric each train window is optimized for')
+    parser.add_argument('--monte-carlo', type=int, metavar='PATHS',
+                        help='run each config over PATHS block-bootstrapped histories instead of the real one')
+    parser.add_argument('--block-size', type=int, default=30, help='days per bootstrap block (default: 30)')
+    parser.add_argument('--seed', type=int, default=0, help='bootstrap seed (default: 0)')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    data = load_dataset(args.store, args.ticker, args.interval, args.start, args.end)
+    if args.walk_forward:
+        run_walk_forward(args, data)
+        print(f"walk-forward on {len(data):,} rows in {time.perf_counter() - started:.2f} s -> {args.out}", file=sys.stderr)
+        return
+
+    configs = load_configs(args.configs)
+    if args.dca_amount is not None:
+        configs = {name: {**config, 'dca_amount': args.dca_amount} for name, config in configs.items()}
+    if args.monte_carlo:
+        run_monte_carlo(args, data, configs)
+        print(f"{len(configs)} configs x {args.monte_carlo:,} paths in {time.perf_counter() - started:.2f} s -> {args.out}", file=sys.stderr)
+        return
+
+    results = run_configs(data, configs, args.workers)
+    write_results(results, configs, args.out, args.format)
+
+    for name, (summary, _, _) in results:
+        print(f"{name:24} return {summary['total_return']:8.2f}%  max drawdown {summary['max_drawdown']:6.2f}%  "
+              f"sharpe {summary['sharpe']:5.2f}  trades {summary['trades']}")
+    print(f"{len(results)} configs on {len(data):,} rows in {time.perf_counter() - started:.2f} s -> {args.out}", file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import os
+import numpy as np
+import pandas as pd
+
+from libraries.backtest import signal_counts
+from libraries.features import addSignals, asofFearGreed
+from libraries.rules import rule_warmup
+from libraries.trading import indicator_cache
+
+# A dataset stored as one memory-mapped .npy file per column, so long intraday histories
+# can be processed a chunk at a time without ever loading every row into RAM.
+class ColumnFiles:
+    def __init__(self, path):
+        self.path = path
+        self.columns = sorted(f[:-4] for f in os.listdir(path) if f.endswith('.npy'))
+
+    @classmethod
+    def create(cls, path, dtypes, n_rows):
+        os.makedirs(path, exist_ok=True)
+        for name, dtype in dtypes.items():
+            np.lib.format.open_memmap(os.path.join(path, f'{name}.npy'), mode='w+', dtype=dtype, shape=(n_rows,)).flush()
+        return cls(path)
+
+    def column(self, name, mode='r'):
+        return np.load(os.path.join(self.path, f'{name}.npy'), mmap_mode=mode)
+
+    def __len__(self):
+        return len(self.column(self.columns[0])) if self.columns else 0
+
+    def add_column(self, name, dtype):
+        np.lib.format.open_memmap(os.path.join(self.path, f'{name}.npy'), mode='w+', dtype=dtype, shape=(len(self),)).flush()
+        self.columns = sorted(set(self.columns) | {name})
+
+    def write(self, start, frame):
+        for name in frame.columns:
+            target = self.column(name, mode='r+')
+            target[start:start + len(frame)] = frame[name].to_numpy(dtype=target.dtype)
+            target.flush()
+            del target
+
+    def read(self, start, stop, columns=None):
+        return pd.DataFrame({name: np.array(self.column(name)[start:stop]) for name in columns or self.columns})
+
+    # Yields (start, frame) where frame also holds up to `warmup` rows before start, so
+    # rolling indicators are exact at the chunk edge; callers drop those rows afterwards
+    def iter_chunks(self, chunk_rows, warmup=0, columns=None):
+        for start in range(0, len(self), chunk_rows):
+            yield start, self.read(max(0, start - warmup), min(start + chunk_rows, len(self)), columns)
+
+def signal_warmup(config):
+    # Rows needed before a bar for every enabled indicator to see its full window
+    return max(config['short_term_ma_period'], config['long_term_ma_period'], config['rsi_period'] + 1,
+               20, config['momentum_period'] + 1,
+               *(rule_warmup(config[key]) for key in ('buy_rule', 'sell_rule') if config.get(key)))
+
+def asof_join_in_chunks(bars, fear_greed, chunk_rows=1_000_000):
+    # fear_greed is the small daily frame; bars gains a forward-filled fear_greed column
+    bars.add_column('fear_greed', np.float32)
+    for start, chunk in bars.iter_chunks(chunk_rows, columns=['timestamp']):
+        joined = asofFearGreed(chunk.set_index('timestamp'), fear_greed[['fear_greed']])
+        bars.write(start, pd.DataFrame({'fear_greed': joined['fear_greed'].to_numpy()}))
+
+def signals_in_chunks(bars, config, chunk_rows=1_000_000):
+    # Writes per-bar buy/sell signal counts next to the bar columns
+    warmup = signal_warmup(config)
+    bars.add_column('buy_count', np.int8)
+    bars.add_column('sell_count', np.int8)
+    for start, chunk in bars.iter_chunks(chunk_rows, warmup, columns=['close', 'fear_greed']):
+        # Chunks are never revisited, so keep them out of the indicator cache
+        with indicator_cache.bypass():
+            chunk = addSignals(chunk, config)
+        skip = start - max(0, start - warmup)
+        bars.write(start, pd.DataFrame({
+            'buy_count': signal_counts(chunk, 'buy')[skip:],
+            'sell_count': signal_counts(chunk, 'sell')[skip:],
+        }))
@@ -0,0 +1,79 @@
+import warnings
+import numpy as np
+import pandas as pd
+from libraries.profiling import traced
+
+DEFAULT_LAGS = [1, 2, 3, 5, 7, 10, 14, 21, 30, 45, 60, 90]
+DEFAULT_WINDOWS = list(range(5, 366, 5))
+
+# The Fear & Greed page's view of the data for one time window: the index averaged over the
+# window next to the close price change (%) over it
+@traced()
+def process_data(dataset, window):
+    if window == 1:
+        dataset['close_change'] = dataset['close_change'].shift(-1)
+        dataset['fear_greed_avg'] = dataset['fear_greed']
+    else:
+        dataset['close_change'] = dataset['close'].pct_change(periods=window).shift(window) * 100 #periods=window or periods=-window ???
+        dataset['fear_greed_avg'] = dataset['fear_greed'].rolling(window=window).mean()
+    
+    dataset = dataset.dropna(subset=['close_change', 'fear_greed_avg'])
+    return dataset
+
+# For each lag: the Fear & Greed index averaged over the past `lag` days, and the
+# close price change (%) over the following `lag` days. Shape (n_lags, n_rows).
+def lagged_series(data, lags):
+    close = data['close'].to_numpy(dtype=float)
+    fear_greed = data['fear_greed'].to_numpy(dtype=float)
+    n = len(close)
+    x = np.full((len(lags), n), np.nan)
+    y = np.full((len(lags), n), np.nan)
+    fg_cumsum = np.concatenate([[0.0], np.cumsum(fear_greed)])
+    for i, lag in enumerate(lags):
+        if lag >= n:
+            continue
+        x[i, lag - 1:] = (fg_cumsum[lag:] - fg_cumsum[:-lag]) / lag
+        y[i, :-lag] = (close[lag:] / close[:-lag] - 1) * 100
+    return x, y
+
+# Rolling Pearson correlation between the rows of x and y for many windows at once,
+# from cumulative sums. Like pandas rolling().corr(), a window needs `window` rows
+# where both values are present. Returns shape (n_series, n_windows, n_rows).
+def rolling_corr(x, y, windows):
+    x = np.atleast_2d(np.asarray(x, dtype=float))
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    valid = ~(np.isnan(x) | np.isnan(y))
+
+    # Centre each series so the cumulative sums stay small
+    x = np.where(valid, x - np.nanmean(np.where(valid, x, np.nan), axis=1, keepdims=True), 0.0)
+    y = np.where(valid, y - np.nanmean(np.where(valid, y, np.nan), axis=1, keepdims=True), 0.0)
+
+    def cumsum(values):
+        return np.concatenate([np.zeros(values.shape[:-1] + (1,)), np.cumsum(values, axis=-1)], axis=-1)
+
+    cumsums = [cumsum(values) for values in (valid.astype(float), x, y, x * x, y * y, x * y)]
+
+    out = np.full((x.shape[0], len(windows), x.shape[1]), np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for j, window in enumerate(windows):
+            if window > x.shape[1]:
+                continue
+            # Sums over the window ending at each row from window - 1 onwards
+            count, sx, sy, sxx, syy, sxy = (c[:, window:] - c[:, :-window] for c in cumsums)
+            cov = count * sxy - sx * sy
+            var_x = count * sxx - sx * sx
+            var_y = count * syy - sy * sy
+            corr = cov / np.sqrt(var_x * var_y)
+            corr[(count < window) | (var_x <= 0) | (var_y <= 0)] = np.nan
+            out[:, j, window - 1:] = np.clip(corr, -1, 1)
+    return out
+
+# Mean rolling correlation for every (lag, rolling window) combination
+@traced()
+def correlation_matrix(data, lags=DEFAULT_LAGS, windows=DEFAULT_WINDOWS):
+    x, y = lagged_series(data, lags)
+    corr = rolling_corr(x, y, windows)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # combinations without a full window
+        mean_corr = np.nanmean(corr, axis=2)
+    return pd.DataFrame(mean_corr, index=pd.Index(lags, name='lag'), columns=pd.Index(windows, name='window'))
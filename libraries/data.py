@@ -1,101 +1,211 @@
-import requests
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from operator import itemgetter
+import numpy as np
 import pandas as pd
-import yfinance as yf
 from libraries.trading import *
-import streamlit as st
-
-@st.cache_data(ttl="1d")
-def getData(tailDays=0):
-    # Fetch Fear and Greed Index data
-    r = requests.get('https://api.alternative.me/fng/?limit=0')
-    df = pd.DataFrame(r.json()['data'])
-    df['value'] = df['value'].astype(int)
-    df['timestamp'] = pd.to_datetime(df['timestamp'].astype(int), unit='s')
-    df = df.set_index('timestamp')
-    df = df.rename(columns={'value': 'fear_greed'})
-    df = df.drop(['time_until_update'], axis=1)
-
-    # Fetch Bitcoin data history
-    df1 = yf.download('BTC-USD', interval='1d')[['Close']].copy()
-    df1 = df1.rename(columns={'Close': 'close'})
-    df1.index.name = 'timestamp'
-    df1 = df1.reset_index()
-    df1['timestamp'] = pd.to_datetime(df1['timestamp']).dt.tz_localize(None)
-    df1 = df1.set_index('timestamp')
-
-    # Merge the two dataframes
-    data = df.merge(df1, on='timestamp')
-    data = data.sort_index()
-    data = data.reset_index()
+from libraries.features import *
+from libraries.store import DataStore, price_source
+from libraries.cache import cache_data
+from libraries.profiling import traced
+
+PRICE_SOURCE = 'BTC-USD'
+
+FETCH_TIMEOUT = {'fear_greed': 10, PRICE_SOURCE: 20}  # per-request timeout in seconds
+FETCH_RETRIES = 3
+FETCH_BACKOFF = 0.5  # seconds before the first retry, doubled after each failure
+FETCH_DEADLINE = 30  # how long a page load waits for a source before serving its stored copy
+
+logger = logging.getLogger(__name__)
+
+# Pooled HTTP connections and fetch threads shared across reruns
+_session = None
+_fetch_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='fetch')
+
+def http_session():
+    # requests is only imported once something actually needs fetching
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+    return _session
+
+def with_retries(func, *args, **kwargs):
+    for attempt in range(FETCH_RETRIES):
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            if attempt == FETCH_RETRIES - 1:
+                raise
+            time.sleep(FETCH_BACKOFF * 2 ** attempt)
+
+def parse_fear_greed(records):
+    # The API's list of {'value', 'value_classification', 'timestamp', ...} records straight into
+    # typed columns: epoch seconds, int8 values and categorical labels
+    n = len(records)
+    timestamps = np.fromiter(map(int, map(itemgetter('timestamp'), records)), dtype=np.int64, count=n)
+    values = np.fromiter(map(int, map(itemgetter('value'), records)), dtype=np.int8, count=n)
+    labels = pd.Categorical(list(map(itemgetter('value_classification'), records)), categories=CLASSIFICATIONS)
+    if (labels.codes < 0).any():
+        # A label outside the known five: keep the API's own labels
+        labels = pd.Categorical(list(map(itemgetter('value_classification'), records)))
+    index = pd.DatetimeIndex(timestamps.view('M8[s]'), name='timestamp')
+    return pd.DataFrame({'fear_greed': values, 'value_classification': labels}, index=index, copy=False)
+
+@traced('fetch: alternative.me')
+def fetch_fear_greed(limit=0):
+    # Fetch Fear and Greed Index data (limit=0 returns the full history)
+    r = http_session().get(f'https://api.alternative.me/fng/?limit={limit}', timeout=FETCH_TIMEOUT['fear_greed'])
+    r.raise_for_status()
+    return parse_fear_greed(r.json()['data'])
+
+def parse_prices(frame, ticker=None):
+    # Close column of a yfinance frame, indexed by naive timestamps: the one shape every price
+    # frame is stored in. Columns may be flat or yfinance's (Price, Ticker) levels, where ticker
+    # picks one from a multi-ticker download; bars without a close (before a coin was listed)
+    # are dropped
+    close = frame['Close']
+    if close.ndim == 2:
+        close = close.iloc[:, 0] if ticker is None else close[ticker]
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    prices = pd.DataFrame({'close': close.to_numpy(dtype=float)}, index=index.rename('timestamp'), copy=False)
+    return prices if prices['close'].notna().all() else prices.dropna()
+
+# Days of intraday history Yahoo serves per request (1m bars: 7 days per request, 30 in all),
+# less a day of margin, since it rejects a start before that instead of clamping it
+INTRADAY_LOOKBACK = {'1m': 6, '2m': 59, '5m': 59, '15m': 59, '30m': 59, '90m': 59, '60m': 729, '1h': 729}
+
+def intraday_start(start, interval, now=None):
+    # The start to request: unchanged for daily and longer bars, and for intraday bars no earlier
+    # than Yahoo's lookback, so a first fetch or a long-stale store gets the most it can
+    if interval not in INTRADAY_LOOKBACK:
+        return start
+    earliest = (now or pd.Timestamp.now('UTC').tz_localize(None)).normalize() - pd.Timedelta(days=INTRADAY_LOOKBACK[interval])
+    if start is None or pd.Timestamp(start) < earliest:
+        return earliest.strftime('%Y-%m-%d')
+    return start
+
+@traced('fetch: yfinance')
+def fetch_prices(ticker, start=None, interval='1d', now=None):
+    # Fetch price history, optionally only from the start date onwards
+    import yfinance as yf  # slow to import, and only needed when the store is stale
+    start = intraday_start(start, interval, now)
+    df1 = yf.download(ticker, interval=interval, start=start, timeout=FETCH_TIMEOUT.get(ticker, FETCH_TIMEOUT[PRICE_SOURCE]))
+    if df1.empty:
+        raise ValueError(f'No price data returned for {ticker}')
+    return parse_prices(df1)
+
+@traced('fetch: yfinance batch')
+def fetch_prices_batch(tickers, start=None):
+    # One yfinance call for every ticker; returns each ticker's prices as parse_prices gives them
+    import yfinance as yf
+    df = yf.download(list(tickers), interval='1d', start=start, group_by='column',
+                     timeout=FETCH_TIMEOUT[PRICE_SOURCE])
+    if df.empty:
+        raise ValueError(f'No price data returned for {tickers}')
+    return {ticker: parse_prices(df, ticker) for ticker in tickers}
+
+def load_fear_greed(store):
+    if not store.is_fresh('fear_greed'):
+        last = store.last_timestamp('fear_greed')
+        # The API only serves the latest N days, so ask for everything since the last stored day
+        limit = 0 if last is None else (pd.Timestamp.now('UTC').tz_localize(None) - last).days + 2
+        store.save_fear_greed(with_retries(fetch_fear_greed, limit))
+        store.mark_fetched('fear_greed')
+    return store.load_fear_greed()
+
+def load_prices(store, ticker, interval='1d', now=None):
+    source = price_source(ticker, interval)
+    if not store.is_fresh(source):
+        last = store.last_timestamp(source)
+        # Re-fetch the last stored day as well, its close may have been taken mid-day
+        start = None if last is None else last.strftime('%Y-%m-%d')
+        store.save_prices(source, with_retries(fetch_prices, ticker, start=start, interval=interval, now=now))
+        store.mark_fetched(source)
+    return store.load_prices(source)
+
+def load_prices_batch(store, tickers):
+    stale = [ticker for ticker in tickers if not store.is_fresh(ticker)]
+    if stale:
+        lasts = [store.last_timestamp(ticker) for ticker in stale]
+        start = None if any(last is None for last in lasts) else min(lasts).strftime('%Y-%m-%d')
+        prices = with_retries(fetch_prices_batch, stale, start=start)
+        for ticker in stale:
+            store.save_prices(ticker, prices[ticker])
+            store.mark_fetched(ticker)
+    return pd.DataFrame({ticker: store.load_prices(ticker)['close'] for ticker in tickers})
+
+def _refresh(load, *args):
+    # Each fetch thread gets its own SQLite connection
+    store = DataStore()
+    try:
+        return load(store, *args)
+    finally:
+        store.close()
+
+def _load_stored(store, source):
+    return store.load_fear_greed() if source == 'fear_greed' else store.load_prices(source)
+
+@traced()
+def load_sources(interval='1d'):
+    # Fetch both upstreams concurrently; a source that fails or misses the deadline
+    # is served from its last stored copy and finishes refreshing in the background
+    # Each fetch runs in a copy of the caller's context, so its spans go to the caller's profiling run
+    futures = {
+        'fear_greed': _fetch_pool.submit(contextvars.copy_context().run, _refresh, load_fear_greed),
+        price_source(PRICE_SOURCE, interval): _fetch_pool.submit(contextvars.copy_context().run, _refresh, load_prices,
+                                                                 PRICE_SOURCE, interval),
+    }
+    wait(futures.values(), timeout=FETCH_DEADLINE)
+
+    frames = {}
+    for source, future in futures.items():
+        if future.done() and future.exception() is None:
+            frames[source] = future.result()
+            continue
+        error = future.exception() if future.done() else 'deadline exceeded'
+        frames[source] = _refresh(_load_stored, source)
+        if frames[source].empty:
+            raise RuntimeError(f'Could not fetch {source} and no stored copy exists: {error}')
+        logger.warning('Serving stored %s data, fetch failed: %s', source, error)
+    return frames['fear_greed'], frames[price_source(PRICE_SOURCE, interval)]
+
+@traced()
+@cache_data(ttl=24 * 60 * 60)
+def getData(tailDays=0, compact=False, interval='1d'):
+    # Serve from the local store, only fetching the days it is missing. Intraday bars are
+    # loaded whole too, as far back as the store goes; for histories that do not fit in
+    # memory, count signals a chunk at a time with libraries/columnar.py instead
+    df, df1 = load_sources(interval)
+
+    # Merge the two dataframes, with compact dtypes straight from the join
+    data = mergeSources(df, df1, interval, compact=compact)
 
     if tailDays > 0:
         data = data.tail(tailDays).reset_index(drop=True)
 
     return data
 
-def addFeatures(data):
-    data['timestamp'] = pd.to_datetime(data['timestamp'])
-
-    # Existing color mapping
-    classification_colors = {
-        'Extreme Fear': 'red',
-        'Fear': 'orange',
-        'Neutral': 'gray',
-        'Greed': 'lightblue',
-        'Extreme Greed': 'blue'
-    }
-    data['color'] = data['value_classification'].map(classification_colors)
-
-    # Existing features
-    data['close_tomorrow'] = data['close'].shift(-1)
-    data['close_change'] = data['close'].pct_change()
-    data['fear_greed_tomorrow'] = data['fear_greed'].shift(-1)
-    data['fear_greed_change'] = data['fear_greed'].pct_change()
-
-    # Moving Averages (using default periods)
-    data['ma_close_short'] = data['close'].rolling(window=10).mean()
-    data['ma_close_long'] = data['close'].rolling(window=50).mean()
-
-    # RSI (using default period)
-    data['rsi'] = calculate_rsi(data, 14)
-
-    # Bollinger Bands (using default parameters)
-    data['bollinger_mid'], data['bollinger_upper'], data['bollinger_lower'] = calculate_bollinger_bands(data, 20, 2.0)
-
-    # Momentum (using default period)
-    data['momentum'] = calculate_momentum(data, 14)
-
-    return data
+@traced()
+@cache_data(ttl=24 * 60 * 60)
+def getMultiData(tickers, tailDays=0):
+    # Fear & Greed index with one close column per ticker (NaN before a coin was listed)
+    store = DataStore()
+    try:
+        df = load_fear_greed(store)
+        closes = load_prices_batch(store, list(tickers))
+    finally:
+        store.close()
+
+    data = df.join(closes, how='left')
+    data = data.sort_index()
+    data = data.reset_index()
 
-def addSignals(data, config):
-    # Moving Averages
-    if config['moving_avg_enabled']:
-        data['ma_close_short'] = data['close'].rolling(window=config['short_term_ma_period']).mean()
-        data['ma_close_long'] = data['close'].rolling(window=config['long_term_ma_period']).mean()
-        data['ma_buy_signal'] = data['ma_close_short'] > data['ma_close_long']
-        data['ma_sell_signal'] = data['ma_close_short'] < data['ma_close_long']
-
-    # Fear and Greed Index
-    if config['fear_greed_enabled']:
-        data['fear_greed_buy_signal'] = data['fear_greed'] < config['fear_greed_buy_threshold']
-        data['fear_greed_sell_signal'] = data['fear_greed'] > config['fear_greed_sell_threshold']
-
-    # RSI
-    if config['rsi_enabled']:
-        data['rsi'] = calculate_rsi(data, config['rsi_period'])
-        data['rsi_buy_signal'] = data['rsi'] < config['rsi_buy_threshold']
-        data['rsi_sell_signal'] = data['rsi'] > config['rsi_sell_threshold']
-
-    # Bollinger Bands
-    if config['bollinger_enabled']:
-        data['bollinger_mid'], data['bollinger_upper'], data['bollinger_lower'] = calculate_bollinger_bands(data, 20, config['bollinger_std_dev_multiplier'])
-        data['bollinger_buy_signal'] = data['close'] < data['bollinger_lower']
-        data['bollinger_sell_signal'] = data['close'] > data['bollinger_upper']
-
-    # Momentum
-    if config['momentum_enabled']:
-        data['momentum'] = calculate_momentum(data, config['momentum_period'])
-        data['momentum_buy_signal'] = data['momentum'] > 0
-        data['momentum_sell_signal'] = data['momentum'] < 0
+    if tailDays > 0:
+        data = data.tail(tailDays).reset_index(drop=True)
 
     return data
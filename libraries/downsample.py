@@ -0,0 +1,62 @@
+import numpy as np
+
+POINT_BUDGET = 4000  # points per trace sent to the browser; the daily history fits untouched
+SCATTER_BUDGET = 5000
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return x.astype(float)
+
+# Largest-Triangle-Three-Buckets: keeps the points that best preserve the line's shape.
+# Returns sorted row positions; `keep` positions always survive. The first row of every run
+# of NaNs is kept too, so Plotly still breaks the line at gaps.
+def lttb_indices(x, y, budget=POINT_BUDGET, keep=None):
+    y = _as_float(y)
+    if len(y) <= budget or budget < 3:
+        selected = np.arange(len(y))
+    else:
+        x = _as_float(x)
+        finite = np.flatnonzero(np.isfinite(y))
+        gaps = np.flatnonzero(~np.isfinite(y))
+        gaps = gaps[np.r_[True, np.diff(gaps) > 1]] if len(gaps) else gaps
+        n = len(finite)
+        if n <= budget:
+            selected = finite
+        else:
+            fx, fy = x[finite], y[finite]
+            edges = np.linspace(1, n - 1, budget - 1).astype(int)
+            selected = np.empty(budget, dtype=np.int64)
+            selected[0], selected[-1] = 0, n - 1
+            a = 0
+            for i in range(budget - 2):
+                start, end = edges[i], edges[i + 1]
+                next_end = edges[i + 2] if i + 2 < len(edges) else n
+                avg_x, avg_y = fx[end:next_end].mean(), fy[end:next_end].mean()
+                area = np.abs((fx[a] - avg_x) * (fy[start:end] - fy[a]) - (fx[a] - fx[start:end]) * (avg_y - fy[a]))
+                a = start + int(area.argmax())
+                selected[i + 1] = a
+            selected = finite[selected]
+        selected = np.union1d(selected, gaps)
+    if keep is not None and len(keep):
+        selected = np.union1d(selected, np.asarray(keep, dtype=np.int64))
+    return selected
+
+def _buckets(n, budget):
+    return np.linspace(0, n, min(budget, n) + 1).astype(int)[:-1]
+
+# Bar series aggregated into at most `budget` buckets, labelled by each bucket's first x
+def aggregate_bars(x, values, budget=POINT_BUDGET, how=np.maximum):
+    values = np.asarray(values)
+    n = len(values)
+    if n <= budget:
+        return np.asarray(x), values, np.arange(n)
+    starts = _buckets(n, budget)
+    return np.asarray(x)[starts], how.reduceat(values, starts), starts
+
+def sample_indices(n, budget=SCATTER_BUDGET, seed=0):
+    # Deterministic uniform sample for scatter plots, where there is no line shape to keep
+    if n <= budget:
+        return np.arange(n)
+    return np.sort(np.random.default_rng(seed).choice(n, budget, replace=False))
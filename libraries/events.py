@@ -0,0 +1,159 @@
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from libraries.features import CLASSIFICATIONS
+from libraries.profiling import traced
+
+# Event study of the Fear & Greed index: the close price change (%) from every day to many
+# horizons ahead, summarised by the day's classification or by index-value bucket. The
+# forward returns are computed once and kept; when new days arrive only the rows whose
+# horizons reach them are recomputed, and the summary tables are rebuilt from the kept
+# returns, so a page shows them in milliseconds however long the history is.
+
+HORIZONS = [1, 3, 7, 14, 30, 60, 90, 180, 365]  # calendar days
+DAY = 24 * 60 * 60
+BUCKET_WIDTH = 10
+BUCKET_LABELS = [f'{low}–{low + BUCKET_WIDTH - 1}' for low in range(0, 90, BUCKET_WIDTH)] + ['90–100']
+GROUPINGS = {'classification': 'Classification', 'bucket': 'Index value'}
+GROUP_LABELS = {'classification': CLASSIFICATIONS, 'bucket': BUCKET_LABELS}
+
+QUANTILES = {'p5': 0.05, 'p25': 0.25, 'median': 0.5, 'p75': 0.75, 'p95': 0.95}
+# Columns of a summary table after group and horizon; the fences are the box plot whiskers
+# (furthest values within 1.5 IQR of the quartiles), so a box can be drawn without the points
+STATS = ['count', 'mean', 'hit_rate', *QUANTILES, 'lower_fence', 'upper_fence']
+
+def day_keys(timestamps):
+    return pd.DatetimeIndex(timestamps).as_unit('s').asi8
+
+def forward_returns(timestamps, close, horizons=HORIZONS):
+    # Close price change (%) from each day to the day `horizon` days later, for every horizon
+    # at once: shape (n_horizons, n_rows), NaN where that day is not in the data.
+    # timestamps are sorted epoch seconds.
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    close = np.asarray(close, dtype=float)
+    if len(timestamps) == 0:
+        return np.empty((len(horizons), 0))
+    targets = timestamps + np.asarray(horizons, dtype=np.int64)[:, None] * DAY
+    rows = np.minimum(np.searchsorted(timestamps, targets), len(timestamps) - 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(timestamps[rows] == targets, (close[rows] / close - 1) * 100, np.nan)
+
+def regime_codes(data, by):
+    # Group of every row (-1 for none) and the group labels
+    if by == 'classification':
+        codes = pd.Categorical(data['value_classification'], categories=CLASSIFICATIONS).codes
+        return codes.astype(np.int64), GROUP_LABELS[by]
+    if by == 'bucket':
+        values = data['fear_greed'].to_numpy(dtype=np.int64)
+        return np.clip(values // BUCKET_WIDTH, 0, len(BUCKET_LABELS) - 1), GROUP_LABELS[by]
+    raise ValueError(f"Unknown grouping {by!r}; expected one of {', '.join(GROUPINGS)}")
+
+def summarize(values, codes, n_groups):
+    # STATS of each row of values (n_series, n_rows) for each group of columns, NaNs left out.
+    # Sorted once by group, so each group is a contiguous block summarised for every series
+    # at once. Returns {stat: array of shape (n_groups, n_series)}.
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(np.asarray(codes)[order], np.arange(n_groups + 1))
+    grouped = values[:, order]
+    stats = {name: np.full((n_groups, len(values)), np.nan) for name in STATS}
+    stats['count'] = np.zeros((n_groups, len(values)), dtype=np.int64)
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # series without a value in a group
+        for group in range(n_groups):
+            block = grouped[:, bounds[group]:bounds[group + 1]]
+            if block.shape[1] == 0:
+                continue
+            count = (~np.isnan(block)).sum(axis=1)
+            stats['count'][group] = count
+            stats['mean'][group] = np.nansum(block, axis=1) / count
+            stats['hit_rate'][group] = (block > 0).sum(axis=1) / count
+            for name, row in zip(QUANTILES, np.nanquantile(block, list(QUANTILES.values()), axis=1)):
+                stats[name][group] = row
+            reach = 1.5 * (stats['p75'][group] - stats['p25'][group])
+            low, high = (stats['p25'][group] - reach)[:, None], (stats['p75'][group] + reach)[:, None]
+            stats['lower_fence'][group] = np.nanmin(np.where(block >= low, block, np.nan), axis=1)
+            stats['upper_fence'][group] = np.nanmax(np.where(block <= high, block, np.nan), axis=1)
+    return stats
+
+def regime_table(values, codes, labels, horizons):
+    # Long table, one row per (group, horizon) in label then horizon order
+    stats = summarize(values, codes, len(labels))
+    table = pd.DataFrame({name: stats[name].ravel() for name in STATS})
+    table.insert(0, 'group', np.repeat(labels, len(horizons)))
+    table.insert(1, 'horizon', np.tile(horizons, len(labels)))
+    return table
+
+class EventStudy:
+    # Forward returns of every day, kept between refreshes. A refresh compares the new data
+    # with the kept days: rows before the first changed (or new) day keep their returns unless
+    # a horizon reaches that day. Full-history tables are kept until the next change.
+    def __init__(self, horizons=HORIZONS):
+        self.horizons = list(horizons)
+        self.timestamps = np.empty(0, dtype=np.int64)
+        self.close = np.empty(0)
+        self.fear_greed = np.empty(0, dtype=np.int64)
+        self.returns = np.empty((len(self.horizons), 0))
+        self.codes = {by: (np.empty(0, dtype=np.int64), GROUP_LABELS[by]) for by in GROUPINGS}
+        self.tables = {}
+        self.recomputed = 0  # rows whose returns the last refresh computed
+
+    @traced('EventStudy.refresh')
+    def refresh(self, data):
+        timestamps = day_keys(data['timestamp'])
+        close = data['close'].to_numpy(dtype=float)
+        fear_greed = data['fear_greed'].to_numpy(dtype=np.int64)
+        n = min(len(timestamps), len(self.timestamps))
+        changed = np.flatnonzero((timestamps[:n] != self.timestamps[:n]) | (close[:n] != self.close[:n]) |
+                                 (fear_greed[:n] != self.fear_greed[:n]))
+        first = changed[0] if len(changed) else n
+        if first == len(timestamps) == len(self.timestamps):
+            self.recomputed = 0
+            return self
+
+        # The earliest day that differs, on either side (a removed day counts too)
+        boundary = min(keys[first] for keys in (timestamps, self.timestamps) if first < len(keys))
+        start = np.searchsorted(timestamps, boundary - max(self.horizons) * DAY) if self.horizons else first
+        start = min(start, first)
+        tail = forward_returns(timestamps[start:], close[start:], self.horizons)
+        self.returns = np.concatenate([self.returns[:, :start], tail], axis=1)
+        self.timestamps, self.close, self.fear_greed = timestamps, close, fear_greed
+        for by in GROUPINGS:
+            codes, labels = regime_codes(data.iloc[first:], by)
+            self.codes[by] = (np.concatenate([self.codes[by][0][:first], codes]), labels)
+        self.tables = {}
+        self.recomputed = len(timestamps) - start
+        return self
+
+    def date_rows(self, start=None, end=None):
+        # Positions of the events starting within [start, end]
+        first = 0 if start is None else np.searchsorted(self.timestamps, int(pd.Timestamp(start).timestamp()))
+        last = len(self.timestamps) if end is None else np.searchsorted(self.timestamps, int(pd.Timestamp(end).timestamp()), side='right')
+        return first, last
+
+    @traced('EventStudy.table')
+    def table(self, by='classification', start=None, end=None):
+        # Summary of the events starting within [start, end]; returns may look past end
+        if by not in GROUPINGS:
+            raise ValueError(f"Unknown grouping {by!r}; expected one of {', '.join(GROUPINGS)}")
+        first, last = self.date_rows(start, end)
+        full = first == 0 and last == len(self.timestamps)
+        if full and by in self.tables:
+            return self.tables[by]
+        codes, labels = self.codes[by]
+        table = regime_table(self.returns[:, first:last], codes[first:last], labels, self.horizons)
+        if full:
+            self.tables[by] = table
+        return table
+
+# One study per process, shared by the page runs of every session
+_study = EventStudy()
+_lock = threading.Lock()
+
+def study_table(data, by='classification', start=None, end=None):
+    # Refreshes the shared study with data (incrementally) and returns its summary table
+    with _lock:
+        return _study.refresh(data).table(by, start, end).copy(deep=False)
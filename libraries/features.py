@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+from libraries.trading import *
+from libraries.rules import evaluate_rules
+from libraries.profiling import traced
+
+def asofFearGreed(bars, fear_greed):
+    # Give every intraday bar the latest daily Fear & Greed value published at or before it
+    bars = bars.sort_index()
+    fear_greed = fear_greed.sort_index()
+    fear_greed = fear_greed.set_axis(fear_greed.index.as_unit(bars.index.unit))  # merge keys must share a resolution
+    return pd.merge_asof(bars, fear_greed, left_index=True, right_index=True, direction='backward')
+
+def _sorted_keys(frame, unit):
+    # Integer keys of a frame's timestamp index in the given unit, with the frame sorted by them
+    # (as_unit copies even to the same unit, and is_monotonic_increasing caches a copy in the
+    # index engine, so both are avoided on the price side)
+    index = frame.index
+    keys = (index if index.unit == unit else index.as_unit(unit)).asi8
+    if (keys[1:] < keys[:-1]).any():
+        order = np.argsort(keys, kind='stable')
+        frame, keys = frame.iloc[order], keys[order]
+    return keys, frame
+
+JOIN_CHUNK = 1 << 20  # bars per block of the intraday join, bounding its index arrays
+
+@traced()
+def mergeSources(fear_greed, prices, interval='1d', compact=False):
+    # Daily bars join on date; intraday bars take the latest daily index value.
+    # Both sides are joined as sorted integer keys (timestamps are unique, as in the store).
+    # The index side is daily and small, so its columns are converted to the output dtypes
+    # first (labels as categorical codes) and every output column is a single allocation.
+    unit = prices.index.unit
+    price_keys, prices = _sorted_keys(prices, unit)
+    fear_greed_keys, fear_greed = _sorted_keys(fear_greed, unit)
+    values = fear_greed['fear_greed'].to_numpy(dtype=np.uint8 if compact else np.int64)
+    labels = pd.Categorical(fear_greed['value_classification'])
+    if compact:
+        # Recoding the inferred categories is much quicker than matching every label against them
+        labels = labels.set_categories(CLASSIFICATIONS)
+    close = prices['close'].to_numpy(dtype=np.float64)
+
+    if interval == '1d':
+        rows = np.searchsorted(fear_greed_keys, price_keys)
+        found = rows < len(fear_greed_keys)
+        found[found] = fear_greed_keys[rows[found]] == price_keys[found]
+        if found.all():
+            timestamps, close = price_keys.copy(), close.copy()
+        else:
+            price_rows = np.flatnonzero(found)
+            rows, timestamps, close = rows[price_rows], price_keys[price_rows], close[price_rows]
+        fear_greed_values = values.take(rows)
+        codes = labels.codes.take(rows)
+    else:
+        # Bars before the first index value have none and are dropped; the rest are joined in
+        # blocks written straight into the output arrays
+        start = np.searchsorted(price_keys, fear_greed_keys[0]) if len(fear_greed_keys) else len(price_keys)
+        timestamps, close = price_keys[start:].copy(), close[start:].copy()
+        fear_greed_values = np.empty(len(timestamps), dtype=values.dtype)
+        codes = np.empty(len(timestamps), dtype=labels.codes.dtype)
+        for block in range(0, len(timestamps), JOIN_CHUNK):
+            rows = np.searchsorted(fear_greed_keys, timestamps[block:block + JOIN_CHUNK], side='right') - 1
+            np.take(values, rows, out=fear_greed_values[block:block + JOIN_CHUNK], mode='clip')
+            np.take(labels.codes, rows, out=codes[block:block + JOIN_CHUNK], mode='clip')
+
+    return pd.DataFrame({
+        'timestamp': timestamps.view(f'M8[{unit}]'),
+        'fear_greed': fear_greed_values,
+        'value_classification': pd.Categorical.from_codes(codes, dtype=labels.dtype, validate=False),
+        'close': close,
+    }, copy=False)
+
+CLASSIFICATIONS = ['Extreme Fear', 'Fear', 'Neutral', 'Greed', 'Extreme Greed']
+# Derived columns that tolerate float32; price-level columns stay float64 since signals compare them to close
+FLOAT32_COLUMNS = ['close_change', 'fear_greed_tomorrow', 'fear_greed_change', 'rsi', 'momentum']
+
+@traced()
+def compactData(data):
+    # Smaller dtypes for whichever columns are present, so it can run before or after addFeatures
+    data = data.copy(deep=False)
+    for col in data.columns:
+        if col == 'value_classification':
+            data[col] = pd.Categorical(data[col], categories=CLASSIFICATIONS)
+        elif col == 'fear_greed':
+            data[col] = data[col].astype('uint8')
+        elif col in FLOAT32_COLUMNS:
+            data[col] = data[col].astype('float32')
+        elif col.endswith('_signal'):
+            data[col] = data[col].astype(bool)
+        elif pd.api.types.is_string_dtype(data[col]) or pd.api.types.is_object_dtype(data[col]):
+            data[col] = data[col].astype('category')
+    return data
+
+def dataVersion(data):
+    # Identity of a dataset's contents, for keying cached stages derived from it: any changed
+    # close or index value, not just a new last day, gives a new version
+    if len(data) == 0:
+        return (0,)
+    return (len(data), data['timestamp'].iloc[0], data['timestamp'].iloc[-1],
+            series_fingerprint(data['close']), series_fingerprint(data['fear_greed']))
+
+def sliceDates(data, start_date, end_date):
+    # Rows are sorted by timestamp, so the range is a positional slice rather than a boolean-mask copy
+    timestamps = data['timestamp'].to_numpy()
+    start = timestamps.searchsorted(pd.Timestamp(start_date).to_datetime64(), side='left')
+    end = timestamps.searchsorted(pd.Timestamp(end_date).to_datetime64(), side='right')
+    return data.iloc[start:end]
+
+@traced()
+def addFeatures(data):
+    # Works on a shallow copy, so a cached frame passed in is never modified (copy-on-write keeps it cheap)
+    data = data.copy(deep=False)
+    data['timestamp'] = pd.to_datetime(data['timestamp'])
+
+    # Existing color mapping
+    classification_colors = {
+        'Extreme Fear': 'red',
+        'Fear': 'orange',
+        'Neutral': 'gray',
+        'Greed': 'lightblue',
+        'Extreme Greed': 'blue'
+    }
+    data['color'] = data['value_classification'].map(classification_colors)
+
+    # Existing features
+    data['close_tomorrow'] = data['close'].shift(-1)
+    data['close_change'] = data['close'].pct_change()
+    data['fear_greed_tomorrow'] = data['fear_greed'].shift(-1)
+    data['fear_greed_change'] = data['fear_greed'].pct_change()
+
+    # Indicators are served from the indicator cache, keyed on this fingerprint
+    fingerprint = series_fingerprint(data['close'])
+
+    # Moving Averages (using default periods)
+    data['ma_close_short'] = cached_moving_average(data, 10, fingerprint)
+    data['ma_close_long'] = cached_moving_average(data, 50, fingerprint)
+
+    # RSI (using default period)
+    data['rsi'] = cached_rsi(data, 14, fingerprint)
+
+    # Bollinger Bands (using default parameters)
+    data['bollinger_mid'], data['bollinger_upper'], data['bollinger_lower'] = cached_bollinger_bands(data, 20, 2.0, fingerprint)
+
+    # Momentum (using default period)
+    data['momentum'] = cached_momentum(data, 14, fingerprint)
+
+    return data
+
+@traced()
+def addSignals(data, config):
+    fingerprint = series_fingerprint(data['close'])
+
+    # Moving Averages
+    if config['moving_avg_enabled']:
+        data['ma_close_short'] = cached_moving_average(data, config['short_term_ma_period'], fingerprint)
+        data['ma_close_long'] = cached_moving_average(data, config['long_term_ma_period'], fingerprint)
+        data['ma_buy_signal'] = data['ma_close_short'] > data['ma_close_long']
+        data['ma_sell_signal'] = data['ma_close_short'] < data['ma_close_long']
+
+    # Fear and Greed Index
+    if config['fear_greed_enabled']:
+        data['fear_greed_buy_signal'] = data['fear_greed'] < config['fear_greed_buy_threshold']
+        data['fear_greed_sell_signal'] = data['fear_greed'] > config['fear_greed_sell_threshold']
+
+    # RSI
+    if config['rsi_enabled']:
+        data['rsi'] = cached_rsi(data, config['rsi_period'], fingerprint)
+        data['rsi_buy_signal'] = data['rsi'] < config['rsi_buy_threshold']
+        data['rsi_sell_signal'] = data['rsi'] > config['rsi_sell_threshold']
+
+    # Bollinger Bands
+    if config['bollinger_enabled']:
+        data['bollinger_mid'], data['bollinger_upper'], data['bollinger_lower'] = cached_bollinger_bands(data, 20, config['bollinger_std_dev_multiplier'], fingerprint)
+        data['bollinger_buy_signal'] = data['close'] < data['bollinger_lower']
+        data['bollinger_sell_signal'] = data['close'] > data['bollinger_upper']
+
+    # Momentum
+    if config['momentum_enabled']:
+        data['momentum'] = cached_momentum(data, config['momentum_period'], fingerprint)
+        data['momentum_buy_signal'] = data['momentum'] > 0
+        data['momentum_sell_signal'] = data['momentum'] < 0
+
+    # Custom AND/OR rules (see libraries/rules.py); config.get keeps configs saved before rules working
+    if config.get('buy_rule'):
+        data['rule_buy_signal'] = evaluate_rules(data, [config['buy_rule']])[0]
+    if config.get('sell_rule'):
+        data['rule_sell_signal'] = evaluate_rules(data, [config['sell_rule']])[0]
+
+    return data
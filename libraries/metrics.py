@@ -0,0 +1,100 @@
+import numpy as np
+
+from libraries.profiling import traced
+
+METRIC_NAMES = ['final_value', 'total_return', 'max_drawdown', 'volatility', 'sharpe', 'sortino',
+                'win_rate', 'exposure', 'turnover', 'trades']
+
+# Every metric for one or many equity curves in one vectorized pass. Arrays are (n_rows,) for
+# one backtest or (n_curves, n_rows) for a batch, with buys/sells as boolean trade masks;
+# close may be shared by every curve. Batches are processed `chunk` curves at a time to bound
+# memory. Returns floats for a single curve and (n_curves,) arrays otherwise.
+def compute_metrics(total_values, btc_values, close, buys, sells, periods_per_year=365, chunk=1024):
+    total_values = np.asarray(total_values, dtype=float)
+    single = total_values.ndim == 1
+    total_values = np.atleast_2d(total_values)
+    if total_values.shape[1] == 0:
+        raise ValueError('No rows to compute metrics over; the date range is empty')
+    btc_values, buys, sells = (np.broadcast_to(np.atleast_2d(a), total_values.shape)
+                               for a in (btc_values, buys, sells))
+    close = np.broadcast_to(np.atleast_2d(np.asarray(close, dtype=float)), total_values.shape)
+
+    n_curves = total_values.shape[0]
+    out = {name: np.empty(n_curves) for name in METRIC_NAMES}
+    for start in range(0, n_curves, chunk):
+        part = slice(start, start + chunk)
+        for name, values in _chunk_metrics(total_values[part], np.asarray(btc_values[part], dtype=float),
+                                           close[part], np.asarray(buys[part], dtype=bool),
+                                           np.asarray(sells[part], dtype=bool), periods_per_year).items():
+            out[name][part] = values
+
+    if single:
+        return {name: out[name][0].item() for name in METRIC_NAMES} | {'trades': int(out['trades'][0])}
+    return out
+
+def _chunk_metrics(total, btc, close, buys, sells, periods_per_year):
+    n_curves, n = total.shape
+    initial, final = total[:, 0], total[:, -1]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        total_return = np.where(initial != 0, (final - initial) / initial * 100, 0.0)
+
+        peak = np.maximum.accumulate(total, axis=1)
+        drawdown = np.where(peak > 0, (peak - total) / peak, 0.0)
+
+        # Per-bar returns of the whole portfolio, shared by volatility, Sharpe and Sortino
+        returns = np.where(total[:, :-1] > 0, np.diff(total, axis=1) / total[:, :-1], 0.0)
+        mean = returns.mean(axis=1) if n > 1 else np.zeros(n_curves)
+        std = returns.std(axis=1, ddof=1) if n > 2 else np.zeros(n_curves)
+        downside = np.sqrt((np.minimum(returns, 0) ** 2).mean(axis=1)) if n > 1 else np.zeros(n_curves)
+        annualize = np.sqrt(periods_per_year)
+        sharpe = np.where(std > 0, mean / std * annualize, np.nan)
+        sortino = np.where(downside > 0, mean / downside * annualize, np.nan)
+
+        # A sell wins when it is above the price of the last buy before it, the same entry
+        # price run_backtest uses for its stop-loss and take-profit rules
+        last_buy = np.maximum.accumulate(np.where(buys, np.arange(n), -1), axis=1)
+        entry_price = np.take_along_axis(close, np.maximum(last_buy, 0), axis=1)
+        closed = sells & (last_buy >= 0)
+        n_closed = closed.sum(axis=1)
+        wins = (closed & (close > entry_price)).sum(axis=1)
+        win_rate = np.where(n_closed > 0, wins / n_closed * 100, np.nan)
+
+        # The cash balance only moves on trades, so its changes are the traded notional
+        balance = total - btc
+        traded = np.abs(np.diff(balance, axis=1)).sum(axis=1)
+        mean_equity = total.mean(axis=1)
+        turnover = np.where(mean_equity > 0, traded / mean_equity, 0.0)
+
+    return {
+        'final_value': final,
+        'total_return': total_return,
+        'max_drawdown': drawdown.max(axis=1) * 100,
+        'volatility': std * annualize * 100,
+        'sharpe': sharpe,
+        'sortino': sortino,
+        'win_rate': win_rate,
+        'exposure': (btc > 0).mean(axis=1) * 100,
+        'turnover': turnover,
+        'trades': (buys.sum(axis=1) + sells.sum(axis=1)).astype(float),
+    }
+
+def trade_mask(positions, n_rows):
+    mask = np.zeros(n_rows, dtype=bool)
+    mask[np.asarray(positions, dtype=np.int64)] = True
+    return mask
+
+# Metrics for the output of run_backtest, whose trades are lists of row positions
+@traced()
+def backtest_metrics(close, btc_values, total_values, buy_positions, sell_positions, periods_per_year=365):
+    n = len(total_values)
+    return compute_metrics(total_values, btc_values, close, trade_mask(buy_positions, n),
+                           trade_mask(sell_positions, n), periods_per_year)
+
+def bars_per_year(timestamps):
+    # Annualization factor from the median bar spacing, so intraday runs are scaled correctly
+    timestamps = np.asarray(timestamps, dtype='datetime64[ns]')
+    if len(timestamps) < 2:
+        return 365
+    spacing = np.median(np.diff(timestamps).astype(np.int64))
+    return 365 * 24 * 60 * 60 * 1e9 / spacing if spacing > 0 else 365
@@ -0,0 +1,231 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from libraries.backtest import signal_counts, run_backtest
+from libraries.metrics import METRIC_NAMES, backtest_metrics
+from libraries.features import addSignals
+from libraries.rules import check_config_rules
+
+SHARED_COLUMNS = ['close', 'fear_greed']
+
+# Base frame rebuilt once per worker process from shared memory
+_worker_data = None
+_worker_segments = []
+
+def _check_rules(configs):
+    # Workers only see SHARED_COLUMNS, so a rule naming anything else must fail here rather
+    # than inside the pool; configs mostly share their rules, so each pair is checked once
+    for buy_rule, sell_rule in {(config.get('buy_rule'), config.get('sell_rule')) for config in configs}:
+        check_config_rules({'buy_rule': buy_rule, 'sell_rule': sell_rule}, SHARED_COLUMNS)
+
+def _share_columns(data):
+    segments, specs = [], []
+    for col in SHARED_COLUMNS:
+        values = data[col].to_numpy(dtype=np.float64)
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)[:] = values
+        segments.append(shm)
+        specs.append((col, shm.name, values.shape))
+    return segments, specs
+
+def _attach_columns(specs):
+    global _worker_data
+    columns = {}
+    for col, name, shape in specs:
+        shm = shared_memory.SharedMemory(name=name)
+        _worker_segments.append(shm)
+        columns[col] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    _worker_data = pd.DataFrame(columns, copy=False)
+
+def evaluate_config(data, config):
+    data = addSignals(data.copy(deep=False), config)
+    balances, btc_values, total_values, buy_positions, sell_positions = run_backtest(
+        data['close'].to_numpy(), signal_counts(data, 'buy'), signal_counts(data, 'sell'), config)
+    return backtest_metrics(data['close'].to_numpy(), btc_values, total_values, buy_positions, sell_positions)
+
+def _evaluate_task(task):
+    config, rows = task
+    data = _worker_data if rows is None else _worker_data.iloc[-rows:]
+    return evaluate_config(data, config)
+
+def grid_configs(base_config, param_space):
+    names = list(param_space)
+    for values in itertools.product(*(param_space[name] for name in names)):
+        yield {**base_config, **dict(zip(names, values))}
+
+def random_configs(base_config, param_space, n_samples, seed=0):
+    # Samples each parameter independently, so huge grids never get enumerated
+    rng = np.random.default_rng(seed)
+    names = list(param_space)
+    choices = [list(param_space[name]) for name in names]
+    n_combinations = np.prod([len(c) for c in choices], dtype=float)
+    seen, configs = set(), []
+    while len(configs) < min(n_samples, n_combinations):
+        values = tuple(c[rng.integers(len(c))] for c in choices)
+        if values not in seen:
+            seen.add(values)
+            configs.append({**base_config, **dict(zip(names, values))})
+    return configs
+
+def _results_table(configs, results, param_space, extra=None):
+    table = pd.DataFrame([{name: config[name] for name in param_space} for config in configs])
+    table = pd.concat([table, pd.DataFrame(results)], axis=1)
+    for col, values in (extra or {}).items():
+        table[col] = values
+    return table
+
+# Evaluate strategy configs in parallel and rank them by total return.
+# param_space maps config keys to the values to try. mode is 'grid' (every combination),
+# 'random' (n_samples combinations) or 'halving' (successive halving over n_samples random
+# combinations: each round keeps the best 1/eta and re-evaluates them on eta times more of
+# the most recent history, starting from min_rows rows)
+def optimize(data, base_config, param_space, mode='grid', n_samples=1000, eta=3, min_rows=250,
+             workers=None, seed=0):
+    if mode == 'grid':
+        configs = list(grid_configs(base_config, param_space))
+    elif mode in ('random', 'halving'):
+        configs = random_configs(base_config, param_space, n_samples, seed)
+    else:
+        raise ValueError(f"Unknown optimizer mode: {mode}")
+
+    _check_rules(configs)
+    workers = workers or os.cpu_count()
+    segments, specs = _share_columns(data)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_columns, initargs=(specs,)) as pool:
+            def evaluate(configs, rows=None):
+                chunksize = max(1, len(configs) // (workers * 4))
+                return list(pool.map(_evaluate_task, [(config, rows) for config in configs], chunksize=chunksize))
+
+            if mode != 'halving':
+                table = _results_table(configs, evaluate(configs), param_space)
+            else:
+                rows, rungs = min(min_rows, len(data)), []
+                while True:
+                    results = evaluate(configs, rows)
+                    rungs.append(_results_table(configs, results, param_space, {'rows': rows}))
+                    if rows >= len(data) or len(configs) <= 1:
+                        break
+                    keep = np.argsort([-r['total_return'] for r in results], kind='stable')[:max(1, len(configs) // eta)]
+                    configs = [configs[i] for i in keep]
+                    rows = min(rows * eta, len(data))
+                # Each config is reported from the longest history it survived to
+                table = pd.concat(rungs[::-1], ignore_index=True)
+                table = table.drop_duplicates(subset=list(param_space), keep='first')
+                return table.sort_values(['rows', 'total_return'], ascending=False, kind='stable').reset_index(drop=True)
+    finally:
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+
+    return table.sort_values('total_return', ascending=False, kind='stable').reset_index(drop=True)
+
+# Walk-forward analysis: optimize on each rolling train window, then trade the winner on the
+# test window that follows it. Metrics where lower is better are minimized instead.
+LOWER_IS_BETTER = {'max_drawdown', 'volatility', 'turnover'}
+
+_walk_forward_state = None
+
+def walk_forward_windows(n_rows, train_rows, test_rows, step=None):
+    # (train_start, test_start, test_end) row bounds; test windows tile the history when step == test_rows
+    step = step or test_rows
+    if step < test_rows:
+        raise ValueError("step must be at least test_rows so out-of-sample windows do not overlap")
+    windows = []
+    train_start = 0
+    while train_start + train_rows < n_rows:
+        test_start = train_start + train_rows
+        windows.append((train_start, test_start, min(test_start + test_rows, n_rows)))
+        train_start += step
+    return windows
+
+def _config_counts_task(config):
+    data = addSignals(_worker_data.copy(deep=False), config)
+    return signal_counts(data, 'buy').astype(np.int8), signal_counts(data, 'sell').astype(np.int8)
+
+def _set_walk_forward_state(*state):
+    global _walk_forward_state
+    _walk_forward_state = state
+
+def _window_task(window):
+    close, buy_counts, sell_counts, configs, metric = _walk_forward_state
+    train_start, test_start, test_end = window
+    sign = -1 if metric in LOWER_IS_BETTER else 1
+
+    def backtest(i, start, end):
+        _, btc_values, total_values, buys, sells = run_backtest(
+            close[start:end], buy_counts[i, start:end], sell_counts[i, start:end], configs[i])
+        return backtest_metrics(close[start:end], btc_values, total_values, buys, sells), total_values
+
+    scores = np.array([backtest(i, train_start, test_start)[0][metric] for i in range(len(configs))], dtype=float)
+    best = int(np.argmax(np.where(np.isnan(scores), -np.inf, sign * scores)))
+    test_metrics, total_values = backtest(best, test_start, test_end)
+    return best, scores[best], test_metrics, np.asarray(total_values, dtype=float)
+
+# Signals are computed once per candidate over the whole history and sliced per window, so
+# overlapping windows share them and every window starts with fully warmed-up indicators.
+# Returns a per-window table (chosen params, train score, out-of-sample metrics) and the
+# out-of-sample equity, both per window and stitched into one compounded curve.
+def walk_forward(data, base_config, param_space, train_rows, test_rows, step=None, mode='grid',
+                 n_samples=1000, metric='total_return', workers=None, seed=0):
+    if mode == 'grid':
+        configs = list(grid_configs(base_config, param_space))
+    elif mode == 'random':
+        configs = random_configs(base_config, param_space, n_samples, seed)
+    else:
+        raise ValueError(f"Unknown walk-forward mode: {mode}")
+    if metric not in METRIC_NAMES:
+        raise ValueError(f"Unknown metric: {metric}")
+    windows = walk_forward_windows(len(data), train_rows, test_rows, step)
+    if not windows:
+        raise ValueError(f"{len(data)} rows are not enough for a {train_rows}-row train window")
+
+    _check_rules(configs)
+    workers = workers or os.cpu_count()
+    segments, specs = _share_columns(data)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_columns, initargs=(specs,)) as pool:
+            counts = list(pool.map(_config_counts_task, configs, chunksize=max(1, len(configs) // (workers * 4))))
+    finally:
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+    buy_counts = np.stack([buy for buy, _ in counts])
+    sell_counts = np.stack([sell for _, sell in counts])
+
+    state = (data['close'].to_numpy(dtype=float), buy_counts, sell_counts, configs, metric)
+    with ProcessPoolExecutor(max_workers=min(workers, len(windows)), initializer=_set_walk_forward_state,
+                             initargs=state) as pool:
+        results = list(pool.map(_window_task, windows))
+
+    labels = data['timestamp'].to_numpy() if 'timestamp' in data.columns else np.arange(len(data))
+    rows, equity = [], []
+    stitched_value = None
+    for k, ((train_start, test_start, test_end), (best, score, test_metrics, total_values)) in enumerate(zip(windows, results)):
+        config = configs[best]
+        rows.append({
+            'window': k,
+            'train_start': labels[train_start],
+            'test_start': labels[test_start],
+            'test_end': labels[test_end - 1],
+            **{name: config[name] for name in param_space},
+            f'train_{metric}': score,
+            **{f'test_{name}': value for name, value in test_metrics.items()},
+        })
+        # Each test window restarts from the initial balance; stitching compounds them
+        initial_balance = config['initial_balance']
+        stitched_value = initial_balance if stitched_value is None else stitched_value
+        equity.append(pd.DataFrame({
+            'timestamp': labels[test_start:test_end],
+            'window': k,
+            'total_value': total_values,
+            'stitched_value': total_values / initial_balance * stitched_value,
+        }))
+        stitched_value = equity[-1]['stitched_value'].iloc[-1]
+
+    return pd.DataFrame(rows), pd.concat(equity, ignore_index=True)
@@ -0,0 +1,218 @@
+import asyncio
+import math
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from libraries.backtest import place_buy_order, place_sell_order
+from libraries.rules import check_rule, evaluate_scalar, parse_rule, rule_indicators
+from libraries.streaming import MovingAverage, RollingStd, BollingerBands, RSI, Momentum
+
+# Event-driven paper trading: strategies consume a live feed one bar at a time, with the
+# indicators updated incrementally (libraries/streaming.py) and orders filled by a local
+# simulated exchange using the backtest's order functions. Replaying a dataset through it
+# gives the same trades as run_backtest.
+#
+# A feed is any async iterable of (kind, timestamp, value) events, where kind is 'bar'
+# (value is the close) or 'fear_greed' (value is the index). A bar uses the latest index
+# value received before it, like asofFearGreed does for the stored data.
+
+# Columns a custom rule can use in paper trading
+FEED_COLUMNS = ['close', 'fear_greed']
+
+async def replay_feed(data, delay=0.0):
+    # Replays a dataset's rows as a live feed; delay is the wait between bars in seconds
+    last_fear_greed = None
+    for timestamp, close, fear_greed in zip(data['timestamp'], data['close'].tolist(), data['fear_greed'].tolist()):
+        if fear_greed != last_fear_greed:
+            yield 'fear_greed', timestamp, fear_greed
+            last_fear_greed = fear_greed
+        yield 'bar', timestamp, close
+        # Sleeping (even for 0 s) hands control back to the event loop between bars
+        await asyncio.sleep(delay)
+
+async def queue_feed(queue):
+    # Feed from an asyncio.Queue, for producers such as a polling task; None ends it
+    while True:
+        event = await queue.get()
+        if event is None:
+            return
+        yield event
+
+class IndicatorBank:
+    # One streaming indicator per (kind, parameters), updated once per bar however many
+    # strategies read it
+    KINDS = {'ma': MovingAverage, 'std': RollingStd, 'bollinger': BollingerBands, 'rsi': RSI, 'momentum': Momentum}
+    # Indicator names in custom rules, see libraries/rules.py
+    RULE_KINDS = {'sma': 'ma', 'std': 'std', 'rsi': 'rsi', 'momentum': 'momentum'}
+
+    def __init__(self):
+        self.indicators = {}
+        self.values = {}
+
+    def add(self, kind, *params):
+        key = (kind, *params)
+        if key not in self.indicators:
+            self.indicators[key] = self.KINDS[kind](*params)
+            self.values[key] = math.nan
+        return key
+
+    def update(self, close):
+        for key, indicator in self.indicators.items():
+            self.values[key] = indicator.update(close)
+
+class PaperStrategy:
+    # The signal rules of addSignals and the trade rules of run_backtest, one bar at a time
+    def __init__(self, name, config, bank):
+        self.name = name
+        self.config = config
+        self.values = bank.values
+        self.ma_keys = (bank.add('ma', config['short_term_ma_period']), bank.add('ma', config['long_term_ma_period'])) \
+            if config['moving_avg_enabled'] else None
+        self.rsi_key = bank.add('rsi', config['rsi_period']) if config['rsi_enabled'] else None
+        self.bollinger_key = bank.add('bollinger', 20, config['bollinger_std_dev_multiplier']) \
+            if config['bollinger_enabled'] else None
+        self.momentum_key = bank.add('momentum', config['momentum_period']) if config['momentum_enabled'] else None
+        # config.get keeps configs saved before rules working
+        self.rules = [config.get('buy_rule') or None, config.get('sell_rule') or None]
+        for rule in self.rules:
+            if rule:
+                check_rule(rule, FEED_COLUMNS)
+                for name, params in rule_indicators(rule):
+                    bank.add(bank.RULE_KINDS[name], *params)
+        self.last_buy_price = None
+
+    def signal_counts(self, close, fear_greed, rule_values):
+        config, values = self.config, self.values
+        buy = sell = 0
+        if self.ma_keys:
+            short, long = values[self.ma_keys[0]], values[self.ma_keys[1]]
+            buy, sell = buy + (short > long), sell + (short < long)
+        if config['fear_greed_enabled']:
+            buy += fear_greed < config['fear_greed_buy_threshold']
+            sell += fear_greed > config['fear_greed_sell_threshold']
+        if self.rsi_key:
+            rsi = values[self.rsi_key]
+            buy, sell = buy + (rsi < config['rsi_buy_threshold']), sell + (rsi > config['rsi_sell_threshold'])
+        if self.bollinger_key:
+            _, upper, lower = values[self.bollinger_key]
+            buy, sell = buy + (close < lower), sell + (close > upper)
+        if self.momentum_key:
+            momentum = values[self.momentum_key]
+            buy, sell = buy + (momentum > 0), sell + (momentum < 0)
+        if self.rules[0]:
+            buy += rule_values[self.rules[0]]
+        if self.rules[1]:
+            sell += rule_values[self.rules[1]]
+        return buy, sell
+
+    def decide(self, price, buy_count, sell_count, account):
+        # Same order of checks as run_backtest: an open position only watches its exit
+        config = self.config
+        if self.last_buy_price is not None and (config['stop_loss_enabled'] or config['take_profit_enabled']):
+            if config['stop_loss_enabled']:
+                exit_trade = price <= self.last_buy_price * (1 - config['stop_loss_percentage'] / 100)
+            else:
+                exit_trade = price >= self.last_buy_price * (1 + config['take_profit_percentage'] / 100)
+            return 'sell' if exit_trade else None
+
+        buy_threshold, sell_threshold = config['buy_threshold'], config['sell_threshold']
+        buy_strength = buy_count / buy_threshold if buy_threshold > 0 else 0
+        sell_strength = sell_count / sell_threshold if sell_threshold > 0 else 0
+        if buy_strength > sell_strength and buy_count >= buy_threshold and account['balance'] > 0:
+            return 'buy'
+        if sell_count > buy_count and sell_count >= sell_threshold and account['btc_held'] > 0:
+            return 'sell'
+        return None
+
+    def filled(self, side, price, account):
+        if side == 'buy':
+            self.last_buy_price = price
+        elif account['btc_held'] == 0:
+            self.last_buy_price = None
+
+class SimulatedExchange:
+    # Local stand-in for an exchange: market orders fill at the bar's close, through the same
+    # order functions as the backtest. latency simulates the round trip of each order.
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.accounts = {}
+        self.fills = []
+
+    def open_account(self, name, balance):
+        self.accounts[name] = {'balance': balance, 'btc_held': 0}
+
+    async def market_order(self, name, side, price, trade_amount, timestamp=None):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        account = self.accounts[name]
+        order = place_buy_order if side == 'buy' else place_sell_order
+        account['balance'], account['btc_held'] = order(account['balance'], account['btc_held'], price, trade_amount)
+        self.fills.append((timestamp, name, side, price))
+        return account
+
+class PaperTradingEngine:
+    def __init__(self, configs, exchange=None, max_latencies=100_000):
+        self.exchange = exchange or SimulatedExchange()
+        self.bank = IndicatorBank()
+        self.strategies = [PaperStrategy(name, config, self.bank) for name, config in configs.items()]
+        for strategy in self.strategies:
+            self.exchange.open_account(strategy.name, strategy.config['initial_balance'])
+
+        # Custom rules run on the latest bar, reading their indicators from the bank
+        self.rule_list = sorted({rule for strategy in self.strategies for rule in strategy.rules if rule})
+        self.fear_greed = math.nan
+        self.bars = 0
+        # Seconds from a bar arriving to every strategy's orders being sent
+        self.latencies = deque(maxlen=max_latencies)
+
+    def rule_values(self, close):
+        columns = {'close': close, 'fear_greed': self.fear_greed}
+        values, kinds = self.bank.values, self.bank.RULE_KINDS
+
+        def value(node):
+            return columns[node[1]] if node[0] == 'column' else values[(kinds[node[1]], *node[2])]
+        return {rule: evaluate_scalar(parse_rule(rule), value) for rule in self.rule_list}
+
+    async def on_bar(self, timestamp, close):
+        start = time.perf_counter()
+        self.bank.update(close)
+        rule_values = self.rule_values(close)
+        accounts = self.exchange.accounts
+
+        orders = []
+        for strategy in self.strategies:
+            buy_count, sell_count = strategy.signal_counts(close, self.fear_greed, rule_values)
+            side = strategy.decide(close, buy_count, sell_count, accounts[strategy.name])
+            if side:
+                orders.append((strategy, side))
+        self.latencies.append(time.perf_counter() - start)
+        self.bars += 1
+
+        if orders:
+            filled = await asyncio.gather(*[self.exchange.market_order(strategy.name, side, close, strategy.config['trade_amount'], timestamp)
+                                            for strategy, side in orders])
+            for (strategy, side), account in zip(orders, filled):
+                strategy.filled(side, close, account)
+
+    async def run(self, feed):
+        async for kind, timestamp, value in feed:
+            if kind == 'bar':
+                await self.on_bar(timestamp, value)
+            elif kind == 'fear_greed':
+                self.fear_greed = value
+
+    def positions(self, price):
+        # Account values of every strategy at the given price
+        return pd.DataFrame([{'name': name, 'balance': account['balance'], 'btc_held': account['btc_held'],
+                              'total_value': account['balance'] + account['btc_held'] * price}
+                             for name, account in self.exchange.accounts.items()])
+
+    def latency_summary(self):
+        latencies = np.array(self.latencies) * 1e6
+        if not len(latencies):
+            return {}
+        return {'bars': self.bars, 'p50_us': np.percentile(latencies, 50), 'p99_us': np.percentile(latencies, 99),
+                'max_us': latencies.max()}
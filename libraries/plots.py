@@ -1,88 +1,23 @@
 import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
-
-# Define the strategy implementation function
-
-def count_signals(row, signal_type):
-        signal_columns = [
-            f'ma_{signal_type}_signal',
-            f'fear_greed_{signal_type}_signal',
-            f'rsi_{signal_type}_signal',
-            f'bollinger_{signal_type}_signal',
-            f'momentum_{signal_type}_signal'
-        ]
-        return sum(row.get(col, False) for col in signal_columns if col in row.index)
-
-def implement_strategy(data, config):    
-    balance = config['initial_balance']
-    btc_held = 0
-    balances = []
-    btc_values = []
-    total_values = []
-    buy_signals = []
-    sell_signals = []
-
-    trade_amount = config['trade_amount']
-    stop_loss_enabled = config['stop_loss_enabled']
-    stop_loss_percentage = config['stop_loss_percentage'] / 100
-    take_profit_enabled = config['take_profit_enabled']
-    take_profit_percentage = config['take_profit_percentage'] / 100
-
-    last_buy_price = None
-
-    def place_buy_order(row):
-        nonlocal balance, btc_held, last_buy_price
-        btc_to_buy = min(trade_amount, balance) / row['close']
-        btc_held += btc_to_buy
-        balance -= min(trade_amount, balance)
-        buy_signals.append(row.name)
-        last_buy_price = row['close']
-
-    def place_sell_order(row):
-        nonlocal balance, btc_held, last_buy_price
-        btc_to_sell = min(trade_amount / row['close'], btc_held)
-        balance += btc_to_sell * row['close']
-        btc_held -= btc_to_sell
-        sell_signals.append(row.name)
-        if btc_held == 0:
-            last_buy_price = None
-
-    for i, row in data.iterrows():
-        buy_signal_count = count_signals(row, 'buy')
-        sell_signal_count = count_signals(row, 'sell')
-
-        buy_threshold = config['buy_threshold']
-        sell_threshold = config['sell_threshold']
-
-        buy_signal_strength = buy_signal_count / buy_threshold if buy_threshold > 0 else 0
-        sell_signal_strength = sell_signal_count / sell_threshold if sell_threshold > 0 else 0
-
-        # Check for stop-loss and take-profit
-        if stop_loss_enabled and last_buy_price is not None:
-            if row['close'] <= last_buy_price * (1 - stop_loss_percentage):
-                place_sell_order(row)
-
-        elif take_profit_enabled and last_buy_price is not None:
-            if row['close'] >= last_buy_price * (1 + take_profit_percentage):
-                place_sell_order(row)
-
-        elif buy_signal_strength > sell_signal_strength and buy_signal_count >= buy_threshold and balance > 0:
-            place_buy_order(row)
-        elif sell_signal_count > buy_signal_count and sell_signal_count >= sell_threshold and btc_held > 0:
-            place_sell_order(row)
-        
-        btc_value = btc_held * row['close']
-        total_value = balance + btc_value
-        
-        balances.append(balance)
-        btc_values.append(btc_value)
-        total_values.append(total_value)
-
-    return balances, btc_values, total_values, buy_signals, sell_signals
-    
-
-def plot_portfolio(portfolio_df):
+import numpy as np
+from libraries.backtest import strategy_signals, fired_indicators, count_signals, implement_strategy
+from libraries.baselines import BASELINE_LABELS
+from libraries.downsample import POINT_BUDGET, lttb_indices, aggregate_bars
+from libraries.profiling import traced
+
+# Shown under a chart whose points were downsampled. The points are picked once for the whole
+# date range (st.plotly_chart reports no zoom to re-slice on), so zooming in adds no detail.
+DOWNSAMPLED_NOTE = ("Long histories are drawn with the points that best keep each line's shape over the whole "
+                    "date range, so zooming in does not add detail. Narrow the date range above to see every point.")
+
+def downsampled_note(n_shown, n_rows):
+    if n_shown < n_rows:
+        st.caption(DOWNSAMPLED_NOTE)
+
+@traced()
+def plot_portfolio(portfolio_df, metrics=None, baselines=None, point_budget=POINT_BUDGET):
     st.header("Portfolio and Bitcoin Analysis")
 
     # Ensure 'Date' column is in datetime format
@@ -91,12 +26,25 @@ def plot_portfolio(portfolio_df):
     # Set 'Date' as the index
     portfolio_df.set_index('Date', inplace=True)
 
-    # Create a new dataframe for the stacked area chart
-    chart_df = portfolio_df[['USD Balance', 'BTC Value']]
+    # Create a new dataframe for the stacked area chart, keeping the rows that shape the total value line
+    rows = lttb_indices(portfolio_df.index, portfolio_df['Total Value'], point_budget)
+    chart_df = portfolio_df[['USD Balance', 'BTC Value']].iloc[rows]
 
     # Plot portfolio balance
     st.subheader("Portfolio Performance")
     st.area_chart(chart_df, color=["#FE9F0D", "#119323"], height=500)
+    downsampled_note(len(chart_df), len(portfolio_df))
+
+    # Total value next to the passive baselines from libraries.baselines
+    if baselines:
+        compare_df = pd.DataFrame({'Strategy': portfolio_df['Total Value']}, index=portfolio_df.index)
+        for name, (_, _, total_values) in baselines.items():
+            compare_df[BASELINE_LABELS[name]] = total_values
+        budget = max(point_budget // len(compare_df.columns), 3)
+        rows = np.unique(np.concatenate([lttb_indices(compare_df.index, compare_df[col], budget) for col in compare_df]))
+        st.subheader("Strategy vs Baselines")
+        st.line_chart(compare_df.iloc[rows], height=400)
+        downsampled_note(len(rows), len(compare_df))
 
     # Reset index for further operations if needed
     portfolio_df.reset_index(inplace=True)
@@ -110,27 +58,59 @@ def plot_portfolio(portfolio_df):
     col1.metric(label="Final Portfolio Value", value=f"{final_value: .2f} USD", delta=f"{final_value - initial_value: .2f} USD")
     col2.metric(label="Total Return", value=f"{total_return: .2f}%",delta=f"{total_return: .2f}%")
 
-
-def plot_signals(dataset, buy_signals, sell_signals):
+    # Risk and trading metrics from libraries.metrics, when the caller computed them
+    if metrics is not None:
+        def fmt(value, suffix=''):
+            return '-' if value != value else f"{value:.2f}{suffix}"
+
+        col1, col2, col3 = st.columns(3)
+        col1.metric(label="Max Drawdown", value=fmt(metrics['max_drawdown'], '%'))
+        col2.metric(label="Sharpe Ratio", value=fmt(metrics['sharpe']))
+        col3.metric(label="Sortino Ratio", value=fmt(metrics['sortino']))
+        col1, col2, col3 = st.columns(3)
+        col1.metric(label="Win Rate", value=fmt(metrics['win_rate'], '%'), help="Sells above the price of the last buy")
+        col2.metric(label="Time in Market", value=fmt(metrics['exposure'], '%'))
+        col3.metric(label="Turnover", value=fmt(metrics['turnover'], 'x'), help="Traded value over average portfolio value")
+
+    if baselines:
+        columns = st.columns(len(baselines))
+        for col, (name, (_, _, total_values)) in zip(columns, baselines.items()):
+            baseline_return = (total_values[-1] - total_values[0]) / total_values[0] * 100 if total_values[0] else 0.0
+            col.metric(label=f"{BASELINE_LABELS[name]} Return", value=f"{baseline_return: .2f}%",
+                       delta=f"{total_return - baseline_return: .2f}% strategy", delta_color="normal")
+
+
+@traced()
+def plot_signals(dataset, buy_signals, sell_signals, signals=None, point_budget=POINT_BUDGET):
     # Plot Bitcoin price with signals
     st.subheader("Bitcoin Price with Buy/Sell Signals")
     fig_bitcoin = go.Figure()
 
+    # Thin the price line; trade rows are always kept
+    signals = signals if signals is not None else strategy_signals(dataset)
+    trade_rows = dataset.index.get_indexer(buy_signals + sell_signals)
+    line = dataset.iloc[lttb_indices(dataset['timestamp'], dataset['close'], point_budget, keep=trade_rows)]
+
     # Add Bitcoin price line
     fig_bitcoin.add_trace(go.Scatter(
-        x=dataset['timestamp'],
-        y=dataset['close'],
+        x=line['timestamp'],
+        y=line['close'],
         mode='lines',
         name='Bitcoin Price'
     ))
 
+    # Indicators behind each trade, shown on hover
+    buy_text = fired_indicators(signals['buy'][dataset.index.get_indexer(buy_signals)])
+    sell_text = fired_indicators(signals['sell'][dataset.index.get_indexer(sell_signals)])
+
     # Add buy signals
     fig_bitcoin.add_trace(go.Scatter(
         x=dataset['timestamp'][buy_signals],
         y=dataset['close'][buy_signals],
         mode='markers',
         marker=dict(symbol='triangle-up', size=10, color='green'),
-        name='Buy Signal'
+        name='Buy Signal',
+        hovertext=buy_text
     ))
 
     # Add sell signals
@@ -139,7 +119,8 @@ def plot_signals(dataset, buy_signals, sell_signals):
         y=dataset['close'][sell_signals],
         mode='markers',
         marker=dict(symbol='triangle-down', size=10, color='red'),
-        name='Sell Signal'
+        name='Sell Signal',
+        hovertext=sell_text
     ))
 
     fig_bitcoin.update_layout(
@@ -157,27 +138,29 @@ def plot_signals(dataset, buy_signals, sell_signals):
     )
 
     st.plotly_chart(fig_bitcoin)
+    downsampled_note(len(line), len(dataset))
 
-def plot_strategy_signals(dataset):
+@traced()
+def plot_strategy_signals(dataset, signals=None, point_budget=POINT_BUDGET):
     st.subheader("Strategy Buy/Sell Signals")
 
     # Count signals
-    buy_counts = []
-    sell_counts = []
+    signals = signals if signals is not None else strategy_signals(dataset)
 
-    for _, row in dataset.iterrows():
-        buy_count = count_signals(row, 'buy')
-        sell_count = count_signals(row, 'sell')
-        buy_counts.append(buy_count)
-        sell_counts.append(sell_count)
+    # Bars show the strongest count in each bucket, hover lists every indicator that fired in it
+    bar_x, buy_counts, buckets = aggregate_bars(dataset['timestamp'], signals['buy_counts'], point_budget)
+    _, sell_counts, _ = aggregate_bars(dataset['timestamp'], signals['sell_counts'], point_budget)
+    buy_fired = np.logical_or.reduceat(signals['buy'], buckets, axis=0)
+    sell_fired = np.logical_or.reduceat(signals['sell'], buckets, axis=0)
+    line = dataset.iloc[lttb_indices(dataset['timestamp'], dataset['close'], point_budget)]
 
     # Create the figure
     fig = go.Figure()
 
     # Add Bitcoin price line
     fig.add_trace(go.Scatter(
-        x=dataset['timestamp'],
-        y=dataset['close'],
+        x=line['timestamp'],
+        y=line['close'],
         mode='lines',
         name='Bitcoin Price',
         line=dict(color='#FFA500', width=1)
@@ -185,18 +168,20 @@ def plot_strategy_signals(dataset):
 
     # Add buy signal count
     fig.add_trace(go.Bar(
-        x=dataset['timestamp'],
+        x=bar_x,
         y=buy_counts,
         name='Buy Signals',
-        marker_color='rgba(0, 255, 0, 0.9)'
+        marker_color='rgba(0, 255, 0, 0.9)',
+        hovertext=fired_indicators(buy_fired)
     ))
 
     # Add sell signal count
     fig.add_trace(go.Bar(
-        x=dataset['timestamp'],
-        y=[-count for count in sell_counts],  # Negative to show below x-axis
+        x=bar_x,
+        y=-sell_counts,  # Negative to show below x-axis
         name='Sell Signals',
-        marker_color='rgba(255, 0, 0, 0.9)'
+        marker_color='rgba(255, 0, 0, 0.9)',
+        hovertext=fired_indicators(sell_fired)
     ))
 
     # Update layout
@@ -222,8 +207,8 @@ def plot_strategy_signals(dataset):
             title="Signal Count",
             overlaying="y",
             side="right",
-            range=[-max(max(sell_counts), max(buy_counts)) * 1.1,
-                   max(max(sell_counts), max(buy_counts)) * 1.1]
+            range=[-int(max(sell_counts.max(), buy_counts.max())) * 1.1,
+                   int(max(sell_counts.max(), buy_counts.max())) * 1.1]
         )
     )
 
@@ -233,3 +218,22 @@ def plot_strategy_signals(dataset):
 
     # Show the plot
     st.plotly_chart(fig, use_container_width=True)
+    downsampled_note(len(line), len(dataset))
+
+@traced()
+def plot_monte_carlo(paths, initial_balance, summary):
+    st.subheader("Final Portfolio Value Across Simulated Histories")
+
+    fig = go.Figure(go.Histogram(x=paths['final_value'], nbinsx=60, marker_color="#119323", name='Paths'))
+    for label, value, dash in [('5th percentile', summary.loc['final_value', 'p5'], 'dot'),
+                               ('Median', summary.loc['final_value', 'p50'], 'solid'),
+                               ('95th percentile', summary.loc['final_value', 'p95'], 'dot')]:
+        fig.add_vline(x=value, line_dash=dash, annotation_text=label)
+    fig.add_vline(x=initial_balance, line_color="red", annotation_text='Initial balance', annotation_position='bottom right')
+    fig.update_layout(xaxis_title='Final Portfolio Value (USD)', yaxis_title='Paths', height=450, showlegend=False)
+    st.plotly_chart(fig, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    col1.metric(label="Chance of a Loss", value=f"{(paths['total_return'] < 0).mean() * 100:.1f}%")
+    col2.metric(label="Median Max Drawdown", value=f"{summary.loc['max_drawdown', 'p50']:.2f}%")
+    st.dataframe(summary.round(2))
@@ -0,0 +1,236 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+# Lightweight spans around the expensive steps of a page run (fetches, merges, features,
+# backtests, figures). Each span records wall time, CPU time of its thread, peak memory
+# allocated while it ran (only for runs that track memory, since tracemalloc slows Python
+# down) and a row count. Runs can be viewed in the sidebar panel or exported as JSON or as a
+# Chrome trace (chrome://tracing, https://ui.perfetto.dev).
+#
+# Profiling is per session: page_run() starts a run when the session's panel is on (or for
+# every session with FGI_PROFILE=1) and makes it the current run of the script's context.
+# Spans record into the current run of their context; the fetch threads run in a copy of the
+# submitting context (libraries/data.py), so their spans land in the run that started them.
+# Without a current run, a traced function costs one context variable lookup per call.
+#
+# tracemalloc is process-wide: it is on only while a run that tracks memory is in progress,
+# and while it is, other sessions' code is slowed too and memory peaks include their
+# allocations.
+
+MAX_RUNS = 20
+
+_lock = threading.Lock()
+_local = threading.local()
+_current = contextvars.ContextVar('profiling_run', default=None)
+_runs = deque(maxlen=MAX_RUNS)
+_memory_runs = 0  # runs in progress that track memory
+_started_tracing = False
+
+def is_enabled():
+    return _current.get() is not None
+
+def current_run():
+    return _current.get()
+
+def _row_count(value):
+    shape = getattr(value, 'shape', None)
+    return shape[0] if shape else None
+
+class _NoSpan:
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NO_SPAN = _NoSpan()
+
+class Span:
+    def __init__(self, name, rows=None, run=None):
+        self.name = name
+        self.rows = rows
+        self.run = run if run is not None else _current.get()
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        self.depth = len(stack)
+        if self.run is not None and self.run['memory'] and tracemalloc.is_tracing():
+            # The tracemalloc peak is shared, so fold it into the open spans before resetting it
+            current, peak = tracemalloc.get_traced_memory()
+            for span in stack:
+                span.peak = max(span.peak, peak)
+            tracemalloc.reset_peak()
+            self.start_memory, self.peak = current, current
+        else:
+            self.start_memory, self.peak = None, 0
+        stack.append(self)
+        self.start = time.perf_counter()
+        self.start_cpu = time.thread_time()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.start
+        cpu = time.thread_time() - self.start_cpu
+        stack = _local.stack
+        stack.pop()
+        peak_bytes = None
+        if self.start_memory is not None and tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1]
+            for span in stack:
+                span.peak = max(span.peak, peak)
+            peak_bytes = max(self.peak, peak) - self.start_memory
+        record({
+            'name': self.name,
+            'start': self.start,
+            'wall': wall,
+            'cpu': cpu,
+            'peak_bytes': peak_bytes,
+            'rows': self.rows,
+            'depth': self.depth,
+            'thread': threading.current_thread().name,
+        }, self.run)
+        return False
+
+def span(name, rows=None):
+    # with span('merge', rows=len(df)) as s: ...; s.rows can also be set inside the block
+    run = _current.get()
+    return _NO_SPAN if run is None else Span(name, rows, run)
+
+def traced(name=None):
+    # Decorator; the row count is the result's, or else the first argument's, when it has a shape
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            run = _current.get()
+            if run is None:
+                return func(*args, **kwargs)
+            with Span(label, run=run) as s:
+                result = func(*args, **kwargs)
+                s.rows = _row_count(result)
+                if s.rows is None and args:
+                    s.rows = _row_count(args[0])
+                return result
+        return wrapper
+    return decorator
+
+def start_run(name, memory=False):
+    # Starts a run and makes it the current one of this context (and of threads given a copy)
+    global _memory_runs, _started_tracing
+    run = {'name': name, 'start': time.perf_counter(), 'started_at': time.time(), 'memory': memory, 'spans': []}
+    with _lock:
+        _runs.append(run)
+        if memory:
+            _memory_runs += 1
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _started_tracing = True
+    _current.set(run)
+    return run
+
+def finish_run(run):
+    global _memory_runs, _started_tracing
+    if 'wall' in run:
+        return run
+    run['wall'] = time.perf_counter() - run['start']
+    with _lock:
+        if run['memory']:
+            _memory_runs -= 1
+            if _memory_runs == 0 and _started_tracing:
+                tracemalloc.stop()
+                _started_tracing = False
+    if _current.get() is run:
+        _current.set(None)
+    return run
+
+def record(entry, run=None):
+    run = run if run is not None else _current.get()
+    if run is not None:
+        with _lock:
+            run['spans'].append(entry)
+
+def runs():
+    with _lock:
+        return list(_runs)
+
+def clear():
+    with _lock:
+        _runs.clear()
+    _current.set(None)
+
+def to_json(selected=None):
+    selected = runs() if selected is None else selected
+    return json.dumps([{**run, 'spans': sorted(run['spans'], key=lambda s: s['start'])} for run in selected], indent=2)
+
+def to_chrome_trace(selected=None):
+    # Complete ('X') events in microseconds, one row per thread
+    selected = runs() if selected is None else selected
+    events = []
+    for pid, run in enumerate(selected, 1):
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': run['name']}})
+        if 'wall' in run:
+            events.append({'name': run['name'], 'ph': 'X', 'pid': pid, 'tid': 'page',
+                           'ts': 0, 'dur': run['wall'] * 1e6})
+        for entry in run['spans']:
+            events.append({
+                'name': entry['name'], 'ph': 'X', 'pid': pid, 'tid': entry['thread'],
+                'ts': (entry['start'] - run['start']) * 1e6, 'dur': entry['wall'] * 1e6,
+                'args': {'cpu_ms': entry['cpu'] * 1000, 'peak_bytes': entry['peak_bytes'], 'rows': entry['rows']},
+            })
+    return json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'})
+
+# Page hooks: page_run() at the top of a page, performance_panel() at the bottom. Each session
+# keeps its own recent runs for the panel's downloads.
+def page_run(page):
+    import streamlit as st
+
+    st.sidebar.toggle("Performance panel", key='performance_panel')
+    history = st.session_state.setdefault('performance_runs', deque(maxlen=MAX_RUNS))
+    if history and 'wall' not in history[-1]:
+        finish_run(history[-1])  # the previous run stopped before its panel (an exception or st.stop)
+    if not (st.session_state.performance_panel or os.environ.get('FGI_PROFILE') == '1'):
+        _current.set(None)
+        return None
+    run = start_run(page, memory=st.session_state.get('performance_memory', False))
+    history.append(run)
+    return run
+
+def performance_panel(run):
+    import pandas as pd
+    import streamlit as st
+
+    if run is None:
+        return
+    finish_run(run)
+    if not st.session_state.get('performance_panel'):
+        return
+    sidebar = st.sidebar
+    sidebar.checkbox("Track memory (slower)", key='performance_memory')
+    spans = sorted(run['spans'], key=lambda s: s['start'])
+    table = pd.DataFrame({
+        'stage': ['· ' * s['depth'] + s['name'] for s in spans],
+        'wall ms': [s['wall'] * 1000 for s in spans],
+        'cpu ms': [s['cpu'] * 1000 for s in spans],
+        'peak MB': [None if s['peak_bytes'] is None else s['peak_bytes'] / 2**20 for s in spans],
+        'rows': pd.array([s['rows'] for s in spans], dtype='Int64'),
+    })
+    sidebar.caption(f"{run['name']}: {run['wall'] * 1000:.0f} ms this run")
+    sidebar.dataframe(table, hide_index=True, column_config={
+        'wall ms': st.column_config.NumberColumn(format='%.1f'),
+        'cpu ms': st.column_config.NumberColumn(format='%.1f'),
+        'peak MB': st.column_config.NumberColumn(format='%.2f'),
+    })
+    history = list(st.session_state.get('performance_runs', [run]))
+    sidebar.download_button("Download runs (JSON)", to_json(history), file_name='profile.json', mime='application/json')
+    sidebar.download_button("Download Chrome trace", to_chrome_trace(history), file_name='trace.json', mime='application/json')
@@ -0,0 +1,348 @@
+import functools
+import re
+
+import numpy as np
+import pandas as pd
+
+from libraries.trading import (series_fingerprint, cached_moving_average, cached_rolling_std, cached_rsi,
+                               cached_momentum, calculate_rsi, calculate_momentum)
+
+# A small rule language for signals, e.g. "rsi < 30 AND (fear_greed < 25 OR close < bollinger_lower)".
+# Rules are parsed once into hashable tuple trees; equal subtrees compare equal, so evaluating
+# many rules together computes every shared comparison and indicator only once.
+#
+#   rule       := term (OR term)*
+#   term       := factor (AND factor)*
+#   factor     := NOT factor | ( rule ) | comparison
+#   comparison := sum (< | <= | > | >= | == | !=) sum
+#   sum        := product ((+ | -) product)*
+#   product    := value ((* | /) value)*
+#   value      := number | -value | ( sum ) | name | name(number, ...)
+#
+# A bare name is one of the numeric RULE_COLUMNS or an indicator with its default parameters;
+# indicators also take explicit ones, e.g. rsi(7) or bollinger_lower(20, 2.5).
+
+class RuleError(ValueError):
+    pass
+
+# Columns a rule may name: the numeric ones every dataset has. Others, such as the text
+# value_classification or the timestamp, would fail or compare nonsense at evaluation time.
+RULE_COLUMNS = ('close', 'fear_greed')
+
+# name: (default parameters, builder returning the node the call expands to)
+INDICATORS = {
+    'sma': ((20,), lambda window: ('indicator', 'sma', (window,))),
+    'std': ((20,), lambda window: ('indicator', 'std', (window,))),
+    'rsi': ((14,), lambda window: ('indicator', 'rsi', (window,))),
+    'momentum': ((14,), lambda period: ('indicator', 'momentum', (period,))),
+    'bollinger_mid': ((20,), lambda window: ('indicator', 'sma', (window,))),
+    # The bands are written out as mean +/- std * k, so they share sma() and std() nodes
+    'bollinger_upper': ((20, 2.0), lambda window, k: (
+        'math', '+', ('indicator', 'sma', (window,)), ('math', '*', ('indicator', 'std', (window,)), ('number', float(k))))),
+    'bollinger_lower': ((20, 2.0), lambda window, k: (
+        'math', '-', ('indicator', 'sma', (window,)), ('math', '*', ('indicator', 'std', (window,)), ('number', float(k))))),
+}
+
+# Extra rows an indicator needs before its first valid value, beyond its window
+_WARMUP_EXTRA = {'sma': 0, 'std': 0, 'rsi': 1, 'momentum': 1}
+
+_TOKEN = re.compile(r'\s*(?:(\d+\.?\d*|\.\d+)|([A-Za-z_]\w*)|(<=|>=|==|!=|[<>()+\-*/,]))')
+_COMPARISONS = {'<': np.less, '<=': np.less_equal, '>': np.greater, '>=': np.greater_equal,
+                '==': np.equal, '!=': np.not_equal}
+_MATH = {'+': np.add, '-': np.subtract, '*': np.multiply, '/': np.divide}
+
+def _tokenize(text):
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None:
+            raise RuleError(f"Unexpected character {text[pos:].lstrip()[:1]!r} at position {pos} in rule: {text}")
+        number, name, symbol = match.groups()
+        if number is not None:
+            tokens.append(('number', float(number)))
+        elif name is not None and name.upper() in ('AND', 'OR', 'NOT'):
+            tokens.append(('keyword', name.upper()))
+        elif name is not None:
+            tokens.append(('name', name))
+        else:
+            tokens.append(('symbol', symbol))
+        pos = match.end()
+    return tokens
+
+class _Parser:
+    def __init__(self, text):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self, kind=None, value=None):
+        token = self.peek()
+        if token[0] is None or (kind and token[0] != kind) or (value and token[1] != value):
+            found = 'end of rule' if token[0] is None else repr(token[1])
+            raise RuleError(f"Expected {value or kind} but found {found} in rule: {self.text}")
+        self.pos += 1
+        return token
+
+    def rule(self):
+        node = self.logical('OR', self.term)
+        if self.peek()[0] is not None:
+            raise RuleError(f"Unexpected {self.peek()[1]!r} in rule: {self.text}")
+        return node
+
+    def logical(self, keyword, operand):
+        children = [operand()]
+        while self.peek() == ('keyword', keyword):
+            self.take()
+            children.append(operand())
+        if len(children) == 1:
+            return children[0]
+        # Flatten and sort, so "a AND b" and "b AND a" are the same node
+        flat = set()
+        for child in children:
+            flat.update(child[1] if child[0] == keyword.lower() else [child])
+        return (keyword.lower(), tuple(sorted(flat, key=repr)))
+
+    def term(self):
+        return self.logical('AND', self.factor)
+
+    def factor(self):
+        if self.peek() == ('keyword', 'NOT'):
+            self.take()
+            return ('not', self.factor())
+        if self.peek() == ('symbol', '('):
+            # Either a parenthesised rule or the start of an arithmetic comparison
+            start = self.pos
+            self.take()
+            try:
+                node = self.logical('OR', self.term)
+                self.take('symbol', ')')
+                if self.peek()[1] not in _COMPARISONS and self.peek()[1] not in _MATH:
+                    return node
+            except RuleError:
+                pass
+            self.pos = start
+        return self.comparison()
+
+    def comparison(self):
+        left = self.sum()
+        op = self.peek()[1]
+        if op not in _COMPARISONS:
+            raise RuleError(f"Expected a comparison (<, <=, >, >=, ==, !=) in rule: {self.text}")
+        self.take()
+        return ('compare', op, left, self.sum())
+
+    def sum(self):
+        node = self.product()
+        while self.peek()[1] in ('+', '-') and self.peek()[0] == 'symbol':
+            op = self.take()[1]
+            node = ('math', op, node, self.product())
+        return node
+
+    def product(self):
+        node = self.value()
+        while self.peek()[1] in ('*', '/') and self.peek()[0] == 'symbol':
+            op = self.take()[1]
+            node = ('math', op, node, self.value())
+        return node
+
+    def value(self):
+        kind, value = self.peek()
+        if kind == 'number':
+            self.take()
+            return ('number', value)
+        if (kind, value) == ('symbol', '-'):
+            self.take()
+            return ('math', '-', ('number', 0.0), self.value())
+        if (kind, value) == ('symbol', '('):
+            self.take()
+            node = self.sum()
+            self.take('symbol', ')')
+            return node
+        if kind == 'name':
+            self.take()
+            return self.call(value)
+        found = 'end of rule' if kind is None else repr(value)
+        raise RuleError(f"Expected a number, column or indicator but found {found} in rule: {self.text}")
+
+    def call(self, name):
+        args = []
+        if self.peek() == ('symbol', '('):
+            self.take()
+            while True:
+                args.append(self.take('number')[1])
+                if self.peek() == ('symbol', ','):
+                    self.take()
+                    continue
+                self.take('symbol', ')')
+                break
+        if name not in INDICATORS:
+            if args:
+                raise RuleError(f"Unknown indicator {name!r} in rule: {self.text}")
+            if name not in RULE_COLUMNS:
+                raise RuleError(f"Unknown column or indicator {name!r} in rule: {self.text}; "
+                                f"rules can use the columns {' and '.join(RULE_COLUMNS)} and the indicators")
+            return ('column', name)
+        defaults, build = INDICATORS[name]
+        if len(args) > len(defaults):
+            raise RuleError(f"{name} takes at most {len(defaults)} parameters in rule: {self.text}")
+        params = tuple(args) + defaults[len(args):]
+        if params[0] < 1 or params[0] != int(params[0]):
+            raise RuleError(f"{name} needs a positive whole-number window in rule: {self.text}")
+        return build(int(params[0]), *params[1:])
+
+@functools.lru_cache(maxsize=4096)
+def parse_rule(text):
+    if not text or not text.strip():
+        raise RuleError("Empty rule")
+    node = _Parser(text).rule()
+    if node[0] not in ('compare', 'and', 'or', 'not'):
+        raise RuleError(f"Rule does not produce true/false values: {text}")
+    return node
+
+def _walk(node):
+    yield node
+    if node[0] in ('and', 'or'):
+        children = node[1]
+    elif node[0] == 'not':
+        children = node[1:]
+    elif node[0] in ('math', 'compare'):
+        children = node[2:]
+    else:
+        children = ()
+    for child in children:
+        yield from _walk(child)
+
+def rule_columns(rule):
+    node = parse_rule(rule) if isinstance(rule, str) else rule
+    return {n[1] for n in _walk(node) if n[0] == 'column'}
+
+def rule_indicators(rule):
+    # (name, params) of every indicator the rule reads, e.g. ('sma', (20,))
+    node = parse_rule(rule) if isinstance(rule, str) else rule
+    return {n[1:] for n in _walk(node) if n[0] == 'indicator'}
+
+def rule_warmup(rule):
+    # Rows needed before the rule's indicators all have a full window
+    node = parse_rule(rule) if isinstance(rule, str) else rule
+    return max([n[2][0] + _WARMUP_EXTRA[n[1]] for n in _walk(node) if n[0] == 'indicator'], default=0)
+
+def check_rule(rule, columns):
+    missing = rule_columns(rule) - set(columns)
+    if missing:
+        raise RuleError(f"Unknown column or indicator: {', '.join(sorted(missing))}")
+
+def check_config_rules(config, columns):
+    # A config's custom rules checked up front, e.g. before it is sent to worker processes;
+    # config.get keeps configs from before rules working
+    for key in ('buy_rule', 'sell_rule'):
+        if config.get(key):
+            check_rule(config[key], columns)
+
+# Evaluates rules over data into an (n_rules x n_rows) boolean matrix. Every distinct subtree
+# is computed once per call, and indicators also go through the shared indicator cache.
+def evaluate_rules(data, rules):
+    nodes = [parse_rule(rule) if isinstance(rule, str) else rule for rule in rules]
+    for node in nodes:
+        check_rule(node, data.columns)
+    fingerprint = series_fingerprint(data['close'])
+    return _evaluate(nodes, (len(data),), lambda name: data[name].to_numpy(dtype=float),
+                     lambda name, params: _indicator(data, name, params, fingerprint))
+
+# The same for many assets at once: columns maps names to (n_rows x n_assets) frames or arrays,
+# or to 1-D arrays shared by every asset, and the result is (n_rules x n_rows x n_assets).
+# Indicators are computed column-wise over the whole close frame and not cached, since batches
+# such as Monte Carlo paths are one-offs.
+def evaluate_rules_batch(columns, rules):
+    nodes = [parse_rule(rule) if isinstance(rule, str) else rule for rule in rules]
+    for node in nodes:
+        check_rule(node, columns)
+    closes = pd.DataFrame(columns['close'], copy=False)
+
+    def column(name):
+        values = np.asarray(columns[name], dtype=float)
+        return values[:, None] if values.ndim == 1 else values
+
+    return _evaluate(nodes, closes.shape, column, lambda name, params: _batch_indicator(closes, name, params))
+
+def _evaluate(nodes, shape, column, indicator):
+    memo = {}
+
+    def evaluate(node):
+        values = memo.get(node)
+        if values is not None:
+            return values
+        kind = node[0]
+        if kind == 'number':
+            values = np.float64(node[1])
+        elif kind == 'column':
+            values = column(node[1])
+        elif kind == 'indicator':
+            values = indicator(node[1], node[2])
+        elif kind == 'math':
+            values = _MATH[node[1]](evaluate(node[2]), evaluate(node[3]))
+        elif kind == 'compare':
+            values = _COMPARISONS[node[1]](evaluate(node[2]), evaluate(node[3]))
+        elif kind == 'not':
+            values = ~evaluate(node[1])
+        else:
+            combine = np.logical_and if kind == 'and' else np.logical_or
+            values = functools.reduce(combine, [evaluate(child) for child in node[1]])
+        memo[node] = values
+        return values
+
+    out = np.empty((len(nodes), *shape), dtype=bool)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for i, node in enumerate(nodes):
+            out[i] = evaluate(node)
+    return out
+
+# Evaluates one rule on single values, such as the latest bar of a live feed. value(node) gives
+# the current value of a 'column' or 'indicator' node.
+def evaluate_scalar(rule, value):
+    node = parse_rule(rule) if isinstance(rule, str) else rule
+
+    def evaluate(node):
+        kind = node[0]
+        if kind == 'number':
+            return node[1]
+        if kind in ('column', 'indicator'):
+            return value(node)
+        if kind == 'math':
+            return _MATH[node[1]](evaluate(node[2]), evaluate(node[3]))
+        if kind == 'compare':
+            return _COMPARISONS[node[1]](evaluate(node[2]), evaluate(node[3]))
+        if kind == 'not':
+            return not evaluate(node[1])
+        if kind == 'and':
+            return all(evaluate(child) for child in node[1])
+        return any(evaluate(child) for child in node[1])
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return bool(evaluate(node))
+
+def _batch_indicator(closes, name, params):
+    # Same formulas as the cached indicators, on every column of the close frame at once
+    if name == 'sma':
+        series = closes.rolling(window=params[0]).mean()
+    elif name == 'std':
+        series = closes.rolling(window=params[0]).std()
+    elif name == 'rsi':
+        series = calculate_rsi({'close': closes}, params[0])
+    else:
+        series = calculate_momentum({'close': closes}, params[0])
+    return series.to_numpy()
+
+def _indicator(data, name, params, fingerprint):
+    if name == 'sma':
+        series = cached_moving_average(data, params[0], fingerprint)
+    elif name == 'std':
+        series = cached_rolling_std(data, params[0], fingerprint)
+    elif name == 'rsi':
+        series = cached_rsi(data, params[0], fingerprint)
+    else:
+        series = cached_momentum(data, params[0], fingerprint)
+    return series.to_numpy()
@@ -0,0 +1,74 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from libraries.backtest import batch_signal_counts, run_backtest_batch
+from libraries.metrics import compute_metrics
+from libraries.rules import check_config_rules
+from libraries.profiling import traced
+
+# Paths per pool task. Fixed, so a seed gives the same paths whatever the number of workers.
+PATHS_PER_TASK = 250
+
+# Rebuilds n_paths histories from blocks of consecutive days drawn with replacement. A day's
+# close-to-close log return stays paired with that day's Fear & Greed value, so the joint
+# index/price structure and the autocorrelation inside each block survive.
+# Returns (n_rows, n_paths) arrays of closes and index values starting from the real first day.
+def block_bootstrap(close, fear_greed, n_paths, block_size=30, rng=None):
+    rng = rng if rng is not None else np.random.default_rng()
+    close = np.asarray(close, dtype=float)
+    fear_greed = np.asarray(fear_greed, dtype=float)
+    log_returns = np.diff(np.log(close))
+    n_steps = len(log_returns)
+    block_size = max(1, min(block_size, n_steps))
+
+    n_blocks = -(-n_steps // block_size)
+    starts = rng.integers(0, n_steps - block_size + 1, (n_blocks, n_paths))
+    steps = (starts[:, None, :] + np.arange(block_size)[None, :, None]).reshape(-1, n_paths)[:n_steps]
+
+    closes = np.empty((n_steps + 1, n_paths))
+    closes[0] = close[0]
+    closes[1:] = close[0] * np.exp(np.cumsum(log_returns[steps], axis=0))
+    fear_greeds = np.empty((n_steps + 1, n_paths))
+    fear_greeds[0] = fear_greed[0]
+    fear_greeds[1:] = fear_greed[steps + 1]
+    return closes, fear_greeds
+
+def _simulate_task(task):
+    close, fear_greed, config, n_paths, block_size, seed, periods_per_year = task
+    closes, fear_greeds = block_bootstrap(close, fear_greed, n_paths, block_size, np.random.default_rng(seed))
+    buy_counts, sell_counts = batch_signal_counts(pd.DataFrame(closes), fear_greeds, config)
+    _, btc_values, total_values, buys, sells = run_backtest_batch(closes, buy_counts, sell_counts, config)
+    return compute_metrics(total_values.T, btc_values.T, closes.T, buys.T, sells.T, periods_per_year)
+
+# Runs the strategy over n_paths bootstrapped histories, batched across paths and spread
+# over a thread pool, or a process pool with processes=True. Threads are the default so the
+# app never forks from inside a Streamlit run; the CLI asks for processes. Returns one row of
+# metrics per path.
+@traced()
+def monte_carlo(data, config, n_paths=10_000, block_size=30, seed=0, workers=None, periods_per_year=365,
+                processes=False):
+    close = data['close'].to_numpy(dtype=float)
+    fear_greed = data['fear_greed'].to_numpy(dtype=float)
+    check_config_rules(config, ['close', 'fear_greed'])  # the only columns a path has
+    sizes = [min(PATHS_PER_TASK, n_paths - start) for start in range(0, n_paths, PATHS_PER_TASK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(close, fear_greed, config, size, block_size, task_seed, periods_per_year)
+             for size, task_seed in zip(sizes, seeds)]
+
+    workers = min(workers or os.cpu_count(), len(tasks))
+    if workers <= 1:
+        results = [_simulate_task(task) for task in tasks]
+    else:
+        with (ProcessPoolExecutor if processes else ThreadPoolExecutor)(max_workers=workers) as pool:
+            results = list(pool.map(_simulate_task, tasks))
+    return pd.DataFrame({name: np.concatenate([result[name] for result in results]) for name in results[0]})
+
+def distribution_summary(paths, columns=('final_value', 'total_return', 'max_drawdown', 'sharpe'),
+                         percentiles=(5, 25, 50, 75, 95)):
+    summary = pd.DataFrame({'mean': paths[list(columns)].mean()})
+    for p in percentiles:
+        summary[f'p{p}'] = paths[list(columns)].quantile(p / 100)
+    return summary
@@ -0,0 +1,92 @@
+import os
+import sqlite3
+import time
+
+import pandas as pd
+
+from libraries.profiling import traced
+
+STORE_PATH = os.environ.get('FGI_STORE_PATH', os.path.join(os.path.dirname(__file__), '..', 'data', 'store.sqlite'))
+STORE_TTL = 24 * 60 * 60  # matches the st.cache_data ttl on getData
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS fear_greed (
+    timestamp INTEGER PRIMARY KEY,
+    fear_greed INTEGER NOT NULL,
+    value_classification TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS prices (
+    source TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    close REAL NOT NULL,
+    PRIMARY KEY (source, timestamp)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    source TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL
+);
+'''
+
+# Local SQLite copy of each upstream source, keyed by source and date (epoch seconds)
+class DataStore:
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def is_fresh(self, source, ttl=STORE_TTL):
+        row = self.conn.execute('SELECT fetched_at FROM meta WHERE source = ?', (source,)).fetchone()
+        return row is not None and time.time() - row[0] < ttl
+
+    def mark_fetched(self, source):
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', (source, time.time()))
+
+    def last_timestamp(self, source):
+        if source == 'fear_greed':
+            row = self.conn.execute('SELECT MAX(timestamp) FROM fear_greed').fetchone()
+        else:
+            row = self.conn.execute('SELECT MAX(timestamp) FROM prices WHERE source = ?', (source,)).fetchone()
+        return None if row[0] is None else pd.Timestamp(row[0], unit='s')
+
+    @traced('store.load_fear_greed')
+    def load_fear_greed(self):
+        df = pd.read_sql_query('SELECT * FROM fear_greed ORDER BY timestamp', self.conn)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
+        return df.set_index('timestamp')
+
+    @traced('store.load_prices')
+    def load_prices(self, source):
+        df = pd.read_sql_query('SELECT timestamp, close FROM prices WHERE source = ? ORDER BY timestamp',
+                               self.conn, params=(source,))
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
+        return df.set_index('timestamp')
+
+    # Upserts, so re-fetched tail days (e.g. today's still-open bar) replace stored ones
+    @traced('store.save_fear_greed')
+    def save_fear_greed(self, df):
+        rows = zip(_epoch_seconds(df.index), df['fear_greed'].astype(int).tolist(), df['value_classification'].tolist())
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO fear_greed VALUES (?, ?, ?)', rows)
+
+    # df is a prices frame as data.parse_prices gives it: a close column on naive timestamps
+    @traced('store.save_prices')
+    def save_prices(self, source, df):
+        if df.columns.nlevels > 1 or 'close' not in df.columns:
+            raise ValueError(f'Expected a close column for {source}, got {list(df.columns)}; '
+                             'pass yfinance frames through parse_prices first')
+        rows = zip([source] * len(df), _epoch_seconds(df.index), df['close'].astype(float).tolist())
+        with self.conn:
+            self.conn.executemany('INSERT OR REPLACE INTO prices VALUES (?, ?, ?)', rows)
+
+def price_source(ticker, interval='1d'):
+    # Store key for a ticker's bars; daily bars keep the plain ticker
+    return ticker if interval == '1d' else f'{ticker}@{interval}'
+
+def _epoch_seconds(index):
+    return (pd.DatetimeIndex(index).as_unit('s').asi8).tolist()
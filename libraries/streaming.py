@@ -0,0 +1,196 @@
+import json
+import math
+from collections import deque
+
+# Incremental versions of the indicators in libraries/trading.py. Each keeps O(window) state,
+# updates in O(1) per new bar and returns the same value the batch function gives for that bar.
+
+class RollingWindow:
+    # Sums are kept relative to a shift close to the window mean, and recomputed exactly
+    # once per window of updates so rounding error cannot accumulate (amortized O(1))
+    def __init__(self, window, values=()):
+        self.window = window
+        self.values = deque(values, maxlen=window)
+        self._resync()
+
+    def _resync(self):
+        self.shift = math.fsum(self.values) / len(self.values) if self.values else 0.0
+        self.sum = math.fsum(x - self.shift for x in self.values)
+        self.sum_sq = math.fsum((x - self.shift) ** 2 for x in self.values)
+        self.updates = 0
+
+    def push(self, x):
+        if len(self.values) == self.window:
+            old = self.values[0] - self.shift
+            self.sum -= old
+            self.sum_sq -= old * old
+        self.values.append(x)
+        self.sum += x - self.shift
+        self.sum_sq += (x - self.shift) ** 2
+        self.updates += 1
+        if self.updates >= self.window:
+            self._resync()
+
+    def full(self):
+        return len(self.values) == self.window
+
+    def mean(self):
+        return self.shift + self.sum / len(self.values)
+
+    def std(self):
+        n = len(self.values)
+        if n < 2:
+            return math.nan
+        return math.sqrt(max(self.sum_sq - self.sum * self.sum / n, 0.0) / (n - 1))
+
+class StreamingIndicator:
+    def state(self):
+        return {'type': type(self).__name__, **self._state()}
+
+    @classmethod
+    def from_state(cls, state):
+        state = dict(state)
+        indicator_type = INDICATOR_TYPES[state.pop('type')]
+        return indicator_type._from_state(state)
+
+class MovingAverage(StreamingIndicator):
+    def __init__(self, window):
+        self.window = window
+        self.closes = RollingWindow(window)
+
+    def update(self, close):
+        self.closes.push(close)
+        return self.closes.mean() if self.closes.full() else math.nan
+
+    def _state(self):
+        return {'window': self.window, 'closes': list(self.closes.values)}
+
+    @classmethod
+    def _from_state(cls, state):
+        indicator = cls(state['window'])
+        indicator.closes = RollingWindow(state['window'], state['closes'])
+        return indicator
+
+class RollingStd(StreamingIndicator):
+    def __init__(self, window):
+        self.window = window
+        self.closes = RollingWindow(window)
+
+    def update(self, close):
+        self.closes.push(close)
+        return self.closes.std() if self.closes.full() else math.nan
+
+    def _state(self):
+        return {'window': self.window, 'closes': list(self.closes.values)}
+
+    @classmethod
+    def _from_state(cls, state):
+        indicator = cls(state['window'])
+        indicator.closes = RollingWindow(state['window'], state['closes'])
+        return indicator
+
+class BollingerBands(StreamingIndicator):
+    def __init__(self, window, num_std_dev):
+        self.window = window
+        self.num_std_dev = num_std_dev
+        self.closes = RollingWindow(window)
+
+    def update(self, close):
+        self.closes.push(close)
+        if not self.closes.full():
+            return math.nan, math.nan, math.nan
+        mean, std = self.closes.mean(), self.closes.std()
+        return mean, mean + std * self.num_std_dev, mean - std * self.num_std_dev
+
+    def _state(self):
+        return {'window': self.window, 'num_std_dev': self.num_std_dev, 'closes': list(self.closes.values)}
+
+    @classmethod
+    def _from_state(cls, state):
+        indicator = cls(state['window'], state['num_std_dev'])
+        indicator.closes = RollingWindow(state['window'], state['closes'])
+        return indicator
+
+class RSI(StreamingIndicator):
+    # Simple-average RSI with min_periods=1, like calculate_rsi
+    def __init__(self, window):
+        self.window = window
+        self.gains = RollingWindow(window)
+        self.losses = RollingWindow(window)
+        self.last_close = None
+
+    def update(self, close):
+        delta = 0.0 if self.last_close is None else close - self.last_close
+        self.last_close = close
+        self.gains.push(max(delta, 0.0))
+        self.losses.push(max(-delta, 0.0))
+        avg_gain, avg_loss = self.gains.mean(), self.losses.mean()
+        if avg_loss <= 0:
+            return 100.0 if avg_gain > 0 else math.nan
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    def _state(self):
+        return {'window': self.window, 'gains': list(self.gains.values), 'losses': list(self.losses.values),
+                'last_close': self.last_close}
+
+    @classmethod
+    def _from_state(cls, state):
+        indicator = cls(state['window'])
+        indicator.gains = RollingWindow(state['window'], state['gains'])
+        indicator.losses = RollingWindow(state['window'], state['losses'])
+        indicator.last_close = state['last_close']
+        return indicator
+
+class Momentum(StreamingIndicator):
+    def __init__(self, period):
+        self.period = period
+        self.closes = deque(maxlen=period + 1)
+
+    def update(self, close):
+        self.closes.append(close)
+        if len(self.closes) <= self.period:
+            return math.nan
+        return close / self.closes[0] - 1
+
+    def _state(self):
+        return {'period': self.period, 'closes': list(self.closes)}
+
+    @classmethod
+    def _from_state(cls, state):
+        indicator = cls(state['period'])
+        indicator.closes.extend(state['closes'])
+        return indicator
+
+class VWAP(StreamingIndicator):
+    def __init__(self, period):
+        self.period = period
+        self.volume = RollingWindow(period)
+        self.volume_price = RollingWindow(period)
+
+    def update(self, close, volume):
+        self.volume.push(volume)
+        self.volume_price.push(close * volume)
+        if not self.volume.full():
+            return math.nan
+        return self.volume_price.mean() / self.volume.mean()
+
+    def _state(self):
+        return {'period': self.period, 'volume': list(self.volume.values),
+                'volume_price': list(self.volume_price.values)}
+
+    @classmethod
+    def _from_state(cls, state):
+        indicator = cls(state['period'])
+        indicator.volume = RollingWindow(state['period'], state['volume'])
+        indicator.volume_price = RollingWindow(state['period'], state['volume_price'])
+        return indicator
+
+INDICATOR_TYPES = {cls.__name__: cls for cls in [MovingAverage, RollingStd, BollingerBands, RSI, Momentum, VWAP]}
+
+def save_state(indicators, path):
+    with open(path, 'w') as f:
+        json.dump({name: indicator.state() for name, indicator in indicators.items()}, f)
+
+def load_state(path):
+    with open(path) as f:
+        return {name: StreamingIndicator.from_state(state) for name, state in json.load(f).items()}
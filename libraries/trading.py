@@ -1,3 +1,10 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
 def calculate_rsi(data, window):
     delta = data['close'].diff(1)
     gain = delta.where(delta > 0, 0)
@@ -23,4 +30,92 @@ def calculate_vwap(data, period):
     data['cumulative_volume'] = data['volume'].rolling(window=period).sum()
     data['cumulative_volume_price'] = data['volume_price'].rolling(window=period).sum()
     vwap = data['cumulative_volume_price'] / data['cumulative_volume']
-    return vwap
\ No newline at end of file
+    return vwap
+
+
+# LRU cache of indicator arrays keyed by (indicator, parameters, fingerprint of the close series)
+class IndicatorCache:
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def get_or_compute(self, key, compute):
+        if getattr(self._local, 'bypass', False):
+            return np.asarray(compute(), dtype=float)
+
+        with self._lock:
+            values = self._entries.get(key)
+            if values is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return values
+            self.misses += 1
+
+        values = np.asarray(compute(), dtype=float)
+        values.flags.writeable = False  # shared between callers, never mutated in place
+
+        with self._lock:
+            if key not in self._entries and values.nbytes <= self.max_bytes:
+                self._entries[key] = values
+                self.nbytes += values.nbytes
+                while self.nbytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.nbytes -= evicted.nbytes
+        return values
+
+    # Compute without storing anything in this thread, e.g. for one-off chunked passes
+    @contextmanager
+    def bypass(self):
+        self._local.bypass = True
+        try:
+            yield
+        finally:
+            self._local.bypass = False
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries), 'nbytes': self.nbytes}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+indicator_cache = IndicatorCache()
+
+def series_fingerprint(series):
+    values = np.ascontiguousarray(series.to_numpy(dtype=float))
+    return hashlib.sha256(values).hexdigest()
+
+def cached_indicator(data, name, params, compute, fingerprint=None):
+    # Callers computing several indicators should fingerprint the close series once and pass it in
+    key = (name, params, fingerprint or series_fingerprint(data['close']))
+    # Cached values are positional, so they are re-labelled with the caller's index
+    return pd.Series(indicator_cache.get_or_compute(key, compute), index=data.index, copy=False)
+
+def cached_moving_average(data, window, fingerprint=None):
+    return cached_indicator(data, 'rolling_mean', (window,), lambda: data['close'].rolling(window=window).mean(), fingerprint)
+
+def cached_rolling_std(data, window, fingerprint=None):
+    return cached_indicator(data, 'rolling_std', (window,), lambda: data['close'].rolling(window=window).std(), fingerprint)
+
+def cached_rsi(data, window, fingerprint=None):
+    return cached_indicator(data, 'rsi', (window,), lambda: calculate_rsi(data, window), fingerprint)
+
+def cached_bollinger_bands(data, window, num_std_dev, fingerprint=None):
+    # Mean and std are cached per window, so sweeping the multiplier reuses them
+    rolling_mean = cached_moving_average(data, window, fingerprint)
+    rolling_std = cached_rolling_std(data, window, fingerprint)
+    upper_band = rolling_mean + (rolling_std * num_std_dev)
+    lower_band = rolling_mean - (rolling_std * num_std_dev)
+    return rolling_mean, upper_band, lower_band
+
+def cached_momentum(data, period, fingerprint=None):
+    return cached_indicator(data, 'momentum', (period,), lambda: calculate_momentum(data, period), fingerprint)
@@ -2,8 +2,10 @@ import streamlit as st
 
 from libraries.data import *
 from libraries.plots import *
+from libraries.profiling import page_run, performance_panel
 
-dataset = getData()
+run = page_run('Dataset')
+dataset = getData(compact=True)
 
 num_days = st.slider('Select Number of Past Days to Analyze', 1, len(dataset), 365)
 dataset = dataset.tail(num_days).reset_index(drop=True)
@@ -11,5 +13,7 @@ dataset = dataset.tail(num_days).reset_index(drop=True)
 st.dataframe(dataset, use_container_width=True)
 
 if st.button("Add Features to Dataset"):
-    addFeatures(dataset)
-    st.dataframe(dataset, use_container_width=True)
\ No newline at end of file
+    dataset = addFeatures(dataset)
+    st.dataframe(dataset, use_container_width=True)
+
+performance_panel(run)
@@ -1,29 +1,34 @@
 import streamlit as st
 from libraries.plots import *
 from libraries.data import *
+from libraries.correlation import process_data, rolling_corr, correlation_matrix
+from libraries.downsample import lttb_indices, sample_indices
+from libraries.cache import cache_stage
+from libraries.events import HORIZONS, GROUPINGS, regime_codes, regime_table, study_table
+from libraries.profiling import page_run, performance_panel, traced
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import numpy as np
 
-def process_data(dataset, window):
-    if window == 1:
-        dataset['close_change'] = dataset['close_change'].shift(-1)
-        dataset['fear_greed_avg'] = dataset['fear_greed']
-    else:
-        dataset['close_change'] = dataset['close'].pct_change(periods=window).shift(window) * 100 #periods=window or periods=-window ???
-        dataset['fear_greed_avg'] = dataset['fear_greed'].rolling(window=window).mean()
-    
-    dataset = dataset.dropna(subset=['close_change', 'fear_greed_avg'])
-    return dataset
+CLASSIFICATION_COLORS = {
+    "Extreme Fear": '#FF4136',
+    "Fear": '#FF851B',
+    "Neutral": '#FFDC00',
+    "Greed": '#2ECC40',
+    "Extreme Greed": '#0074D9'
+}
 
+@traced()
 def display_correlation(dataset):
     correlation = dataset['fear_greed_avg'].corr(dataset['close_change'])
     st.write(f"**Pearson correlation coefficient**: `{correlation:.4f}`")
     st.write(":gray[A coefficient close to 1 or -1 indicates a strong correlation, while values close to 0 indicate a weak correlation.]")
     
-def fear_greed_vs_close_change_scatter(dataset, window):
+def scatter_figure(dataset, window):
     color_scale = ['#FF4136', '#FF851B', '#FFDC00', '#2ECC40', '#0074D9']
-    fig = px.scatter(dataset, x="fear_greed_avg", y="close_change", 
+    # Plot a uniform sample of the points; the axis range below still uses every point
+    fig = px.scatter(dataset.iloc[sample_indices(len(dataset))], x="fear_greed_avg", y="close_change", 
                      color="value_classification", 
                      color_discrete_map={
                          "Extreme Fear": color_scale[0],
@@ -41,38 +46,46 @@ def fear_greed_vs_close_change_scatter(dataset, window):
     fig.add_hline(y=0, line_dash="dash", line_color="gray", annotation_text="No Change")
     fig.update_yaxes(range=[-max(abs(dataset['close_change'])), max(abs(dataset['close_change']))])
     fig.update_layout(legend=dict(orientation="h", yanchor="top", y=-0.2, xanchor="center", x=0.5))
+    return fig
 
+@traced()
+def fear_greed_vs_close_change_scatter(fig, window):
     st.plotly_chart(fig, use_container_width=True)
     st.write(f":gray[This scatter plot compares the {window}-day average Fear & Greed Index with the {window}-day Bitcoin price change. Each dot represents a {window}-day period.]")
 
-def fear_greed_box_plot(dataset, window):
-    color_scale = ['#FF4136', '#FF851B', '#FFDC00', '#2ECC40', '#0074D9']
-    fig = px.box(dataset, x="value_classification", y="close_change",
-                 color="value_classification",
-                 color_discrete_map={
-                     "Extreme Fear": color_scale[0],
-                     "Fear": color_scale[1],
-                     "Neutral": color_scale[2],
-                     "Greed": color_scale[3],
-                     "Extreme Greed": color_scale[4]
-                 },
-                 labels={"value_classification": "Fear & Greed Classification", 
-                         "close_change": f"{window}-day Close Price Change (%)"},
-                 title=f"{window}-day Close Price Change Distribution by Fear & Greed Classification")
-    fig.update_xaxes(categoryorder="array", 
-                     categoryarray=["Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed"])
-    
-    fig.update_layout(showlegend=False)  # Add this line to remove the legend
+def summary_box(table, colors=None):
+    # One box per group from a summary table's quartiles and fences (libraries/events.py), so
+    # the browser gets five numbers per box instead of every point
+    fig = go.Figure()
+    for row in table[table['count'] > 0].itertuples():
+        fig.add_trace(go.Box(x=[row.group], q1=[row.p25], median=[row.median], q3=[row.p75],
+                             lowerfence=[row.lower_fence], upperfence=[row.upper_fence], mean=[row.mean],
+                             name=row.group, marker_color=(colors or {}).get(row.group)))
+    fig.update_xaxes(categoryorder="array", categoryarray=list(table['group'].unique()))
+    fig.update_layout(showlegend=False)
+    return fig
+
+def box_figure(dataset, window):
+    codes, labels = regime_codes(dataset, 'classification')
+    summary = regime_table(dataset['close_change'].to_numpy(dtype=float), codes, labels, [window])
+    fig = summary_box(summary, CLASSIFICATION_COLORS)
+    fig.update_layout(title=f"{window}-day Close Price Change Distribution by Fear & Greed Classification",
+                      xaxis_title="Fear & Greed Classification", yaxis_title=f"{window}-day Close Price Change (%)")
+    return fig
+
+@traced()
+def fear_greed_box_plot(fig, window):
     st.plotly_chart(fig, use_container_width=True)
     st.write(f":gray[This box plot shows how Bitcoin's {window}-day price changes are distributed for different Fear & Greed Index categories. The boxes represent the middle 50% of price changes, with the line inside each box showing the median.]")
 
-def rolling_correlation_plot(dataset, window):
-    st.subheader(f"Rolling Correlation")
-    rolling_window = st.slider("Select rolling correlation window (periods)", 3, 365, 30)
-    
-    dataset['rolling_corr'] = dataset['fear_greed_avg'].rolling(window=rolling_window).corr(dataset['close_change'])
-    
-    fig = px.line(dataset, x='timestamp', y='rolling_corr',
+def rolling_correlation_line(dataset, rolling_window):
+    values = rolling_corr(dataset['fear_greed_avg'], dataset['close_change'], [rolling_window])[0, 0]
+    rows = lttb_indices(dataset['timestamp'], values)
+    return pd.DataFrame({'timestamp': dataset['timestamp'].to_numpy()[rows], 'rolling_corr': values[rows]})
+
+@traced()
+def rolling_correlation_plot(line, window, rolling_window):
+    fig = px.line(line, x='timestamp', y='rolling_corr',
                   labels={'timestamp': 'Date', 'rolling_corr': 'Rolling Correlation'},
                   title=f'{rolling_window}-Period Rolling Correlation between Average Fear & Greed Index and {window}-day Close Price Change')
     
@@ -85,9 +98,74 @@ def rolling_correlation_plot(dataset, window):
     st.plotly_chart(fig, use_container_width=True)
     st.write(f":gray[This line graph shows how the relationship between the {window}-day average Fear & Greed Index and {window}-day price change varies over time. The line represents the strength of the relationship, calculated over {rolling_window}-period windows.]")
 
+@traced()
+def forward_returns_summary(table, by, horizon):
+    st.subheader(f"{horizon}-day Forward Returns by {GROUPINGS[by]}")
+    selected = table[table['horizon'] == horizon]
+    fig = summary_box(selected, CLASSIFICATION_COLORS if by == 'classification' else None)
+    fig.update_layout(xaxis_title=GROUPINGS[by], yaxis_title=f"{horizon}-day Forward Close Price Change (%)")
+    st.plotly_chart(fig, use_container_width=True)
+
+    summary = selected[['group', 'count', 'mean', 'median', 'hit_rate', 'p5', 'p95']].rename(columns={
+        'group': GROUPINGS[by], 'count': 'Days', 'mean': 'Mean (%)', 'median': 'Median (%)',
+        'hit_rate': 'Hit rate', 'p5': '5th pct (%)', 'p95': '95th pct (%)'})
+    summary['Hit rate'] = summary['Hit rate'] * 100
+    st.dataframe(summary, hide_index=True, use_container_width=True, column_config={
+        col: st.column_config.NumberColumn(format='%.1f%%' if col == 'Hit rate' else '%.2f')
+        for col in ['Mean (%)', 'Median (%)', 'Hit rate', '5th pct (%)', '95th pct (%)']})
+    st.write(f":gray[The close price change from each day in the selected range to {horizon} days later, grouped by that day's Fear & Greed {GROUPINGS[by].lower()}. The hit rate is the share of days followed by a rise; whiskers reach the furthest changes within 1.5 times the box height.]")
+
+@traced()
+def correlation_heatmap(matrix):
+    st.subheader("Correlation by Time Window and Rolling Window")
+
+    fig = px.imshow(matrix, aspect='auto', origin='lower', zmin=-1, zmax=1,
+                    color_continuous_scale='RdBu',
+                    labels={'x': 'Rolling Correlation Window (periods)', 'y': 'Time Window (days)', 'color': 'Mean Correlation'},
+                    title='Mean Rolling Correlation between Average Fear & Greed Index and Forward Close Price Change')
+    fig.update_yaxes(type='category')
+
+    st.plotly_chart(fig, use_container_width=True)
+    st.write(":gray[Each cell averages the rolling correlation between the Fear & Greed Index averaged over the time window and the close price change over the following time window, for one rolling correlation window.]")
+
+# Pipeline stages, each cached on the inputs it depends on, so changing one control only
+# recomputes the stages downstream of it (see cache_stage)
+@traced()
+@cache_stage(max_entries=2)
+def feature_stage(_dataset, version):
+    return compactData(addFeatures(_dataset))
+
+@traced()
+@cache_stage()
+def window_stage(_filtered, version, start_date, end_date, window):
+    return process_data(_filtered, window)
+
+@traced()
+@cache_stage()
+def heatmap_stage(_filtered, version, start_date, end_date):
+    return correlation_matrix(_filtered)
+
+@traced()
+@cache_stage()
+def figure_stage(_processed, version, start_date, end_date, window):
+    return scatter_figure(_processed, window), box_figure(_processed, window)
+
+@traced()
+@cache_stage()
+def event_stage(_dataset, version, start_date, end_date, by):
+    return study_table(_dataset, by, start_date, end_date)
+
+@traced()
+@cache_stage(max_entries=64)
+def rolling_stage(_processed, version, start_date, end_date, window, rolling_window):
+    return rolling_correlation_line(_processed, rolling_window)
+
 # Main code
-dataset = getData()
-addFeatures(dataset)
+run = page_run('Fear & Greed Index')
+dataset = getData(compact=True)
+version = dataVersion(dataset)
+dataset = feature_stage(dataset, version)
+history = dataset
 
 st.title("Fear & Greed Index vs. Bitcoin Price Change Analysis")
 st.write("This dashboard explores the relationship between the Fear & Greed Index and Bitcoin's price changes over different time windows.")
@@ -104,15 +182,28 @@ date_range = st.date_input("Select Date Range",
 
 if len(date_range) == 2:
     start_date, end_date = pd.to_datetime(date_range)
-    dataset = dataset[(dataset['timestamp'] >= start_date) & (dataset['timestamp'] <= end_date)]
+else:
+    start_date, end_date = dataset['timestamp'].iloc[0], dataset['timestamp'].iloc[-1]
+filtered_dataset = sliceDates(dataset, start_date, end_date)
 
 # Process data based on selected window
-dataset = process_data(dataset, window)
+dataset = window_stage(filtered_dataset, version, start_date, end_date, window)
 
 st.header("Correlation Analysis")
 display_correlation(dataset)
 
 # Display the plots
-rolling_correlation_plot(dataset, window)
-fear_greed_vs_close_change_scatter(dataset, window)
-fear_greed_box_plot(dataset, window)
\ No newline at end of file
+st.subheader(f"Rolling Correlation")
+rolling_window = st.slider("Select rolling correlation window (periods)", 3, 365, 30)
+rolling_correlation_plot(rolling_stage(dataset, version, start_date, end_date, window, rolling_window), window, rolling_window)
+correlation_heatmap(heatmap_stage(filtered_dataset, version, start_date, end_date))
+scatter, box = figure_stage(dataset, version, start_date, end_date, window)
+fear_greed_vs_close_change_scatter(scatter, window)
+fear_greed_box_plot(box, window)
+
+st.header("Forward Returns by Regime")
+by = st.radio("Group days by", list(GROUPINGS), format_func=GROUPINGS.get, horizontal=True)
+horizon = st.select_slider("Forward horizon (days)", HORIZONS, value=30)
+forward_returns_summary(event_stage(history, version, start_date, end_date, by), by, horizon)
+
+performance_panel(run)
@@ -3,12 +3,19 @@ from libraries.plots import *
 import pandas as pd
 import plotly.graph_objects as go
 from libraries.data import *
+from libraries.backtest import DEFAULT_CONFIG
+from libraries.metrics import backtest_metrics, bars_per_year
+from libraries.simulation import monte_carlo, distribution_summary
+from libraries.baselines import baseline_curves
+from libraries.rules import RuleError, check_rule
+from libraries.profiling import page_run, performance_panel
 import json
 
 st.set_page_config(
     initial_sidebar_state= "expanded"
 )
 
+run = page_run('Strategy Creator')
 dataset = getData()
 
 st.title("Strategy Creator (Work in Progress)")
@@ -23,7 +30,10 @@ date_range = st.date_input("Select Date Range",
 
 if len(date_range) == 2:
     start_date, end_date = pd.to_datetime(date_range)
-    dataset = dataset[(dataset['timestamp'] >= start_date) & (dataset['timestamp'] <= end_date)]
+    dataset = sliceDates(dataset, start_date, end_date)
+    if dataset.empty:
+        st.warning("No data in the selected date range.")
+        st.stop()
 
 # Features selection
 st.sidebar.header("Strategy Configuration")
@@ -36,32 +46,7 @@ uploaded_file = st.sidebar.file_uploader(
 )
 
 # Define default configuration
-default_config = {
-    'moving_avg_enabled': False,
-    'short_term_ma_period': 10,
-    'long_term_ma_period': 50,
-    'fear_greed_enabled': False,
-    'fear_greed_buy_threshold': 25,
-    'fear_greed_sell_threshold': 76,
-    'rsi_enabled': False,
-    'rsi_period': 14,
-    'rsi_buy_threshold': 30,
-    'rsi_sell_threshold': 70,
-    'bollinger_enabled': False,
-    'bollinger_std_dev_multiplier': 2.0,
-    'momentum_enabled': False,
-    'momentum_period': 14,
-    'buy_threshold': 1,
-    'sell_threshold': 1,
-    'stop_loss_enabled': False,
-    'stop_loss_percentage': 5.0,
-    'take_profit_enabled': False,
-    'take_profit_percentage': 10.0,
-    'dollar_cost_avg_enabled': False,
-    'dollar_cost_avg_period': 'Daily',
-    'initial_balance': 1000,
-    'trade_amount': 50
-}
+default_config = dict(DEFAULT_CONFIG)
 
 # Load configuration from file if uploaded
 if uploaded_file is not None:
@@ -106,13 +91,33 @@ st.sidebar.markdown("**Simple Momentum**", help="Measures how much the price has
 momentum_enabled = st.sidebar.checkbox('Enable Simple Momentum Strategy', value=config['momentum_enabled'])
 momentum_period = st.sidebar.number_input('Momentum Period (days)', min_value=1, max_value=None, value=config['momentum_period'], disabled=not momentum_enabled)
 
+# Custom Rules
+rule_help = """Combine conditions with AND, OR, NOT and parentheses, e.g. `rsi < 30 AND (fear_greed < 25 OR close < bollinger_lower)`.
+Use the columns `close` and `fear_greed` and the indicators `sma`, `std`, `rsi`, `momentum`, `bollinger_mid`, `bollinger_upper` and `bollinger_lower`,
+with optional parameters such as `rsi(7)` or `bollinger_lower(20, 2.5)`. A rule that holds counts as one signal."""
+st.sidebar.markdown("**Custom Rules**", help=rule_help)
+
+def rule_input(label, value):
+    rule = st.sidebar.text_input(label, value=value, placeholder="e.g. rsi < 30 AND fear_greed < 25")
+    try:
+        if rule.strip():
+            check_rule(rule, dataset.columns)
+        return rule.strip()
+    except RuleError as e:
+        st.sidebar.error(str(e))
+        return ''
+
+buy_rule = rule_input('Buy Rule', config.get('buy_rule', ''))
+sell_rule = rule_input('Sell Rule', config.get('sell_rule', ''))
+
 # Buy and Sell Thresholds
 enabled_indicators = sum([ # count enabled indicators
     fear_greed_enabled,
     moving_avg_enabled,
     rsi_enabled,
     bollinger_enabled,
-    momentum_enabled
+    momentum_enabled,
+    bool(buy_rule or sell_rule)
 ])
 
 # Buy and Sell Thresholds
@@ -132,11 +137,13 @@ st.sidebar.markdown("**Take-Profit**", help="Automatically sell if the price ris
 take_profit_enabled = st.sidebar.checkbox('Enable Take-Profit', value=config['take_profit_enabled'])
 take_profit_percentage = st.sidebar.number_input('Take-Profit Percentage', min_value=0.0, max_value=100.0, value=config['take_profit_percentage'], step=1.0, disabled=not take_profit_enabled)
 
-# Time-Based Rules
-st.sidebar.header("Time-Based Rules (not implemented yet)")
+# Dollar-Cost Averaging
+st.sidebar.header("Dollar-Cost Averaging")
 st.sidebar.markdown("**Dollar-Cost Averaging**", help="Invest a fixed amount at regular intervals, regardless of price.")
-dollar_cost_avg_enabled = st.sidebar.checkbox('Enable Dollar-Cost Averaging', value=config['dollar_cost_avg_enabled'])
-dollar_cost_avg_period = st.sidebar.selectbox('Select Period', ['Daily', 'Weekly', 'Monthly'], index=['Daily', 'Weekly', 'Monthly'].index(config['dollar_cost_avg_period']), disabled=not dollar_cost_avg_enabled)
+dollar_cost_avg_enabled = st.sidebar.checkbox('Enable Dollar-Cost Averaging', value=config['dollar_cost_avg_enabled'], help="Not implemented in the strategy yet.")
+dollar_cost_avg_period = st.sidebar.selectbox('Select Period', ['Daily', 'Weekly', 'Monthly'], index=['Daily', 'Weekly', 'Monthly'].index(config['dollar_cost_avg_period']), help="How often the DCA comparison baselines buy; the strategy itself does not use it yet.")
+dca_amount = st.sidebar.number_input('DCA Amount (USD)', min_value=0, value=config.get('dca_amount', config['trade_amount']), step=50,
+                                     help="What the DCA comparison baselines buy each period (Fear & Greed DCA scales it by the index); 0 spreads the start balance over the date range. Only drives the baselines.")
 
 initial_balance = st.sidebar.number_input('Start Balance (USD)', min_value=0, value=config['initial_balance'], step=1000)
 trade_amount = st.sidebar.number_input('Trade Amount (USD)', min_value=0, value=config['trade_amount'], step=50)
@@ -166,7 +173,10 @@ config = {
     'dollar_cost_avg_enabled': dollar_cost_avg_enabled,
     'dollar_cost_avg_period': dollar_cost_avg_period,
     'initial_balance': initial_balance,
-    'trade_amount': trade_amount
+    'trade_amount': trade_amount,
+    'dca_amount': dca_amount,
+    'buy_rule': buy_rule,
+    'sell_rule': sell_rule
 }
 
 config_json = json.dumps(config)
@@ -180,10 +190,11 @@ st.sidebar.download_button(
     help="Save your settings as a file for easy reuse later.",
 )
 
-addFeatures(dataset)
-addSignals(dataset, config)
+dataset = addFeatures(dataset)
+dataset = addSignals(dataset, config)
 
-balances, btc_values, total_values, buy_signals, sell_signals = implement_strategy(dataset, config)
+signals = strategy_signals(dataset)
+balances, btc_values, total_values, buy_signals, sell_signals = implement_strategy(dataset, config, signals)
     
 # Create a DataFrame with the portfolio composition
 portfolio_df = pd.DataFrame({
@@ -193,7 +204,29 @@ portfolio_df = pd.DataFrame({
     'Total Value': total_values
 })
 
+metrics = backtest_metrics(dataset['close'].to_numpy(), btc_values, total_values,
+                           dataset.index.get_indexer(buy_signals), dataset.index.get_indexer(sell_signals),
+                           bars_per_year(dataset['timestamp']))
+
+baselines = baseline_curves(dataset, config)
+
 # Plot portfolio balance
-plot_portfolio(portfolio_df)
-plot_signals(dataset, buy_signals, sell_signals)
-plot_strategy_signals(dataset)
\ No newline at end of file
+plot_portfolio(portfolio_df, metrics, baselines)
+plot_signals(dataset, buy_signals, sell_signals, signals)
+plot_strategy_signals(dataset, signals)
+# Monte Carlo robustness check
+st.header("Monte Carlo Simulation")
+st.write("Runs the strategy over price and Fear & Greed histories rebuilt from randomly drawn blocks of real days, "
+         "to show how much of the result above depends on the one path Bitcoin actually took.")
+mc_col1, mc_col2, mc_col3 = st.columns(3)
+n_paths = mc_col1.number_input('Simulated Paths', min_value=100, max_value=10000, value=1000, step=100)
+block_size = mc_col2.number_input('Block Length (days)', min_value=1, max_value=365, value=30,
+                                  help="Longer blocks keep more of the real trends and streaks.")
+seed = mc_col3.number_input('Random Seed', min_value=0, value=0, help="The same seed always gives the same paths.")
+
+if st.button('Run Simulation'):
+    with st.spinner('Simulating...'):
+        paths = monte_carlo(dataset, config, n_paths, block_size, seed, periods_per_year=bars_per_year(dataset['timestamp']))
+    plot_monte_carlo(paths, config['initial_balance'], distribution_summary(paths))
+
+performance_panel(run)
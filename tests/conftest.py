@@ -0,0 +1,13 @@
+import pytest
+
+from benchmarks.synthetic import make_dataset
+
+# Small deterministic datasets shared by the tests; the generators are the benchmarks' own
+
+@pytest.fixture(scope='session')
+def daily():
+    return make_dataset(400)
+
+@pytest.fixture(scope='session')
+def hourly():
+    return make_dataset(2000, seed=1, freq='h')
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_backtest import implement_strategy_loop
+from benchmarks.bench_multi_asset import per_asset
+from benchmarks.synthetic import BENCH_CONFIG, make_multi_dataset
+from libraries.backtest import batch_signal_counts, implement_strategy, run_backtest_batch
+from libraries.features import addSignals
+
+CONFIGS = {
+    'bench': BENCH_CONFIG,
+    'no exits': {**BENCH_CONFIG, 'stop_loss_enabled': False, 'take_profit_enabled': False},
+    'all in': {**BENCH_CONFIG, 'trade_amount': 10_000, 'buy_threshold': 1, 'sell_threshold': 1},
+    'rules': {**BENCH_CONFIG, 'buy_rule': 'rsi(14) < 35 AND fear_greed < 40',
+              'sell_rule': 'close > bollinger_upper(20, 1.5) OR momentum(7) < -0.05'},
+}
+
+@pytest.mark.parametrize('name', CONFIGS)
+def test_vectorized_backtest_matches_row_loop(daily, name):
+    data = addSignals(daily.copy(), CONFIGS[name])
+    assert implement_strategy(data, CONFIGS[name]) == implement_strategy_loop(data, CONFIGS[name])
+
+@pytest.mark.parametrize('name', CONFIGS)
+def test_batched_assets_match_one_at_a_time(name):
+    fear_greed, closes = make_multi_dataset(6, 400)
+    data = pd.concat([fear_greed, closes], axis=1)
+    tickers = list(closes.columns)
+    buy_counts, sell_counts = batch_signal_counts(data[tickers], data['fear_greed'], CONFIGS[name])
+    balances, _, total_values, buys, sells = run_backtest_batch(data[tickers], buy_counts, sell_counts, CONFIGS[name])
+
+    # Each column must match a single-asset run over that asset's listed rows
+    for j, (ref_balances, _, ref_totals, ref_buys, ref_sells) in enumerate(per_asset(data, tickers, CONFIGS[name])):
+        listed = data[tickers[j]].notna().to_numpy()
+        assert np.array_equal(balances[listed, j], ref_balances)
+        assert np.array_equal(total_values[listed, j], ref_totals)
+        assert np.flatnonzero(buys[listed, j]).tolist() == ref_buys
+        assert np.flatnonzero(sells[listed, j]).tolist() == ref_sells
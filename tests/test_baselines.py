@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from libraries.backtest import DEFAULT_CONFIG, place_buy_order
+from libraries.baselines import baseline_curves, buy_and_hold, dca, fear_greed_dca, cadence_rows
+
+INITIAL_BALANCE = 1000
+
+def loop_reference(close, amounts, initial_balance=INITIAL_BALANCE):
+    # Row-by-row version: buy each row's planned amount while cash lasts
+    balance, btc_held = initial_balance, 0
+    balances, btc_values, total_values = [], [], []
+    for price, amount in zip(close.tolist(), amounts.tolist()):
+        if amount:
+            balance, btc_held = place_buy_order(balance, btc_held, price, amount)
+        balances.append(balance)
+        btc_values.append(btc_held * price)
+        total_values.append(balance + btc_held * price)
+    return balances, btc_values, total_values
+
+def planned_amounts(data, name, cadence, amount, initial_balance=INITIAL_BALANCE):
+    amounts = np.zeros(len(data))
+    if name == 'buy_and_hold':
+        amounts[0] = initial_balance
+        return amounts
+    rows = cadence_rows(data['timestamp'], cadence)
+    if name == 'dca':
+        amounts[rows] = initial_balance / len(rows) if amount is None else amount
+    else:
+        weights = (100 - data['fear_greed'].to_numpy(dtype=float)[rows]) / 50
+        amounts[rows] = (initial_balance / weights.sum() if amount is None else amount) * weights
+    return amounts
+
+def run_baseline(data, name, cadence, amount):
+    close = data['close'].to_numpy(dtype=float)
+    if name == 'buy_and_hold':
+        return buy_and_hold(close, INITIAL_BALANCE)
+    if name == 'dca':
+        return dca(close, data['timestamp'], INITIAL_BALANCE, cadence, amount)
+    return fear_greed_dca(close, data['fear_greed'], data['timestamp'], INITIAL_BALANCE, cadence, amount)
+
+@pytest.mark.parametrize('dataset', ['daily', 'hourly'])
+@pytest.mark.parametrize('name', ['buy_and_hold', 'dca', 'fear_greed_dca'])
+@pytest.mark.parametrize('cadence', ['Daily', 'Weekly', 'Monthly'])
+@pytest.mark.parametrize('amount', [None, 50])  # 50 a period runs out of cash on the daily cadence
+def test_matches_loop_exactly(request, dataset, name, cadence, amount):
+    data = request.getfixturevalue(dataset)
+    result = run_baseline(data, name, cadence, amount)
+    reference = loop_reference(data['close'].to_numpy(dtype=float), planned_amounts(data, name, cadence, amount))
+    for got, expected in zip(result, reference):
+        assert np.array_equal(got, expected)
+
+def test_cadence_rows_are_first_bar_of_each_period(hourly):
+    rows = cadence_rows(hourly['timestamp'], 'Daily')
+    days = hourly['timestamp'].dt.normalize()
+    assert rows.tolist() == np.flatnonzero(~days.duplicated()).tolist()
+
+def test_spends_whole_balance_without_amount(daily):
+    balances, _, _ = dca(daily['close'].to_numpy(dtype=float), daily['timestamp'], INITIAL_BALANCE, 'Weekly')
+    assert balances[-1] == pytest.approx(0, abs=1e-9)
+
+def test_curves_buy_the_configured_dca_amount(daily):
+    config = {**DEFAULT_CONFIG, 'dollar_cost_avg_period': 'Weekly', 'dca_amount': 20}
+    curves = baseline_curves(daily, config)
+    np.testing.assert_array_equal(curves['dca'][2], dca(daily['close'], daily['timestamp'], 1000, 'Weekly', 20)[2])
+    # 0 spreads the start balance; configs without the key buy the trade amount
+    spread = baseline_curves(daily, {**config, 'dca_amount': 0})['dca']
+    assert spread[0][-1] == pytest.approx(0, abs=1e-9)
+    legacy = {key: value for key, value in config.items() if key != 'dca_amount'}
+    np.testing.assert_array_equal(baseline_curves(daily, legacy)['dca'][2],
+                                  dca(daily['close'], daily['timestamp'], 1000, 'Weekly', config['trade_amount'])[2])
@@ -0,0 +1,24 @@
+import plotly.graph_objects as go
+
+from libraries.cache import cache_stage
+from libraries.features import dataVersion
+
+def test_version_changes_with_any_value(daily):
+    changed = daily.copy()
+    changed.loc[len(daily) // 2, 'close'] += 1
+    assert dataVersion(changed) != dataVersion(daily)
+    changed = daily.copy()
+    changed.loc[len(daily) // 2, 'fear_greed'] += 1
+    assert dataVersion(changed) != dataVersion(daily)
+    assert dataVersion(daily.copy()) == dataVersion(daily)
+
+def test_every_caller_gets_its_own_figure():
+    @cache_stage()
+    def figure_stage(title):
+        return go.Figure(layout={'title': title}), go.Figure()
+
+    first, _ = figure_stage('cached')
+    first.update_layout(title='changed by one session')
+    second, _ = figure_stage('cached')
+    assert second is not first
+    assert second.layout.title.text == 'cached'
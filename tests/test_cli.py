@@ -0,0 +1,28 @@
+import pytest
+
+from benchmarks.synthetic import make_dataset
+from libraries.cli import load_dataset
+from libraries.store import DataStore, price_source
+
+@pytest.fixture(scope='module')
+def store_path(tmp_path_factory):
+    # Daily Fear & Greed and hourly closes over the same 20 days
+    path = str(tmp_path_factory.mktemp('store') / 'store.sqlite')
+    daily = make_dataset(20).set_index('timestamp')
+    hourly = make_dataset(20 * 24, freq='h').set_index('timestamp')
+    store = DataStore(path)
+    store.save_fear_greed(daily)
+    store.save_prices(price_source('BTC-USD'), daily)
+    store.save_prices(price_source('BTC-USD', '1h'), hourly)
+    store.close()
+    return path
+
+def test_end_date_includes_the_whole_day(store_path):
+    data = load_dataset(store_path, interval='1h', start='2018-02-03', end='2018-02-04')
+    assert len(data) == 48
+    assert str(data['timestamp'].iloc[-1]) == '2018-02-04 23:00:00'
+    assert len(load_dataset(store_path, start='2018-02-03', end='2018-02-04')) == 2
+
+def test_empty_range_exits_with_a_message(store_path):
+    with pytest.raises(SystemExit, match='No stored BTC-USD rows'):
+        load_dataset(store_path, start='2030-01-01')
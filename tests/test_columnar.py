@@ -0,0 +1,25 @@
+import numpy as np
+
+from benchmarks.bench_intraday import write_minute_bars
+from benchmarks.synthetic import BENCH_CONFIG, make_dataset
+from libraries.backtest import signal_counts
+from libraries.columnar import asof_join_in_chunks, signals_in_chunks
+from libraries.features import addSignals, asofFearGreed
+from libraries.trading import indicator_cache
+
+N_ROWS = 20_000
+CHUNK_ROWS = 3_000
+
+def test_chunked_signals_match_the_whole_frame(tmp_path):
+    fear_greed = make_dataset(N_ROWS // 1440 + 2).set_index('timestamp')
+    bars = write_minute_bars(str(tmp_path / 'bars'), N_ROWS, CHUNK_ROWS)
+    asof_join_in_chunks(bars, fear_greed, CHUNK_ROWS)
+    signals_in_chunks(bars, BENCH_CONFIG, CHUNK_ROWS)
+
+    frame = bars.read(0, len(bars), ['timestamp', 'close'])
+    frame = asofFearGreed(frame.set_index('timestamp'), fear_greed[['fear_greed']]).reset_index()
+    with indicator_cache.bypass():
+        frame = addSignals(frame, BENCH_CONFIG)
+    # Warmup rows make the chunk edges exact
+    np.testing.assert_array_equal(np.asarray(bars.column('buy_count')), signal_counts(frame, 'buy'))
+    np.testing.assert_array_equal(np.asarray(bars.column('sell_count')), signal_counts(frame, 'sell'))
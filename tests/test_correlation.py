@@ -0,0 +1,14 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_correlation import pandas_matrix
+from libraries.correlation import DEFAULT_LAGS, DEFAULT_WINDOWS, correlation_matrix, lagged_series, rolling_corr
+
+def test_rolling_corr_matches_pandas(daily):
+    x, y = lagged_series(daily, [7])
+    expected = pd.Series(x[0]).rolling(window=30).corr(pd.Series(y[0])).to_numpy()
+    np.testing.assert_allclose(rolling_corr(x, y, [30])[0, 0], expected, rtol=1e-7, atol=1e-9, equal_nan=True)
+
+def test_matrix_matches_pandas_per_combination(daily):
+    np.testing.assert_allclose(correlation_matrix(daily).to_numpy(), pandas_matrix(daily, DEFAULT_LAGS, DEFAULT_WINDOWS),
+                               rtol=1e-6, atol=1e-9, equal_nan=True)
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from libraries.data import fetch_prices, intraday_start, load_prices_batch, parse_prices
+from libraries.store import DataStore
+
+NOW = pd.Timestamp('2026-10-18 15:30')
+
+def test_daily_start_is_left_alone():
+    assert intraday_start(None, '1d', NOW) is None
+    assert intraday_start('2018-02-01', '1d', NOW) == '2018-02-01'
+
+def test_intraday_start_is_clamped_to_the_lookback():
+    assert intraday_start(None, '1h', NOW) == '2024-10-19'
+    assert intraday_start('2018-02-01', '5m', NOW) == '2026-08-20'
+    assert intraday_start('2018-02-01', '1m', NOW) == '2026-10-12'
+
+def test_recent_intraday_start_is_kept():
+    assert intraday_start('2026-10-17', '1m', NOW) == '2026-10-17'
+
+@pytest.fixture
+def download():
+    # yfinance 1.x shape: (Price, Ticker) column levels and a tz-aware index, with BTC listed
+    # from the start and ETH only from the third day
+    index = pd.date_range('2024-01-01', periods=5, freq='D', tz='UTC', name='Date')
+    columns = pd.MultiIndex.from_product([['Close', 'High', 'Low', 'Open', 'Volume'], ['BTC-USD', 'ETH-USD']],
+                                         names=['Price', 'Ticker'])
+    values = np.arange(50, dtype=float).reshape(5, 10) + 100
+    values[:2, 1::2] = np.nan
+    return pd.DataFrame(values, index=index, columns=columns)
+
+def test_parse_prices_takes_one_ticker_from_multiindex_columns(download):
+    prices = parse_prices(download, 'ETH-USD')
+    assert list(prices.columns) == ['close'] and prices.index.name == 'timestamp'
+    assert prices.index.tz is None
+    assert prices['close'].tolist() == [121.0, 131.0, 141.0]
+    assert parse_prices(download[['Close']].iloc[:, :1])['close'].tolist() == [100.0, 110.0, 120.0, 130.0, 140.0]
+
+def test_every_stored_price_frame_is_normalised(download, monkeypatch):
+    # Both fetch paths, single and batched, against the same download
+    monkeypatch.setattr('yfinance.download', lambda tickers, **kwargs: download if isinstance(tickers, list)
+                        else download.loc[:, (slice(None), [tickers])])
+    store = DataStore(':memory:')
+    store.save_prices('BTC-USD@1h', fetch_prices('BTC-USD', interval='1h'))
+    assert store.load_prices('BTC-USD@1h')['close'].tolist() == [100.0, 110.0, 120.0, 130.0, 140.0]
+    closes = load_prices_batch(store, ['BTC-USD', 'ETH-USD'])
+    assert closes['ETH-USD'].isna().sum() == 2
+    assert closes['BTC-USD'].tolist() == [100.0, 110.0, 120.0, 130.0, 140.0]
+    with pytest.raises(ValueError, match='parse_prices'):
+        store.save_prices('BTC-USD', download)
+
+def test_fetch_clamps_the_requested_start(download, monkeypatch):
+    requested = []
+    monkeypatch.setattr('yfinance.download', lambda ticker, start=None, **kwargs: requested.append(start) or download)
+    fetch_prices('BTC-USD', interval='1h', now=NOW)
+    fetch_prices('BTC-USD', start='2018-02-01', now=NOW)
+    assert requested == ['2024-10-19', '2018-02-01']
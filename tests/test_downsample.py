@@ -0,0 +1,27 @@
+import numpy as np
+
+from libraries.downsample import lttb_indices, aggregate_bars
+
+def line_with_gaps(n):
+    y = np.sin(np.arange(n) / 50)
+    y[:10] = np.nan
+    y[n // 2:n // 2 + 40] = np.nan
+    return np.arange(n), y
+
+def test_under_budget_keeps_every_row_including_nans():
+    x, y = line_with_gaps(1000)
+    assert np.array_equal(lttb_indices(x, y, budget=4000), np.arange(1000))
+
+def test_over_budget_keeps_a_nan_per_gap_and_the_kept_rows():
+    x, y = line_with_gaps(20_000)
+    rows = lttb_indices(x, y, budget=500, keep=[123, 4567])
+    assert np.all(np.diff(rows) > 0)
+    assert rows[np.isnan(y[rows])].tolist() == [0, 10_000]
+    assert {123, 4567, 10, 19_999} <= set(rows.tolist())
+    assert len(rows) <= 500 + 4
+
+def test_aggregate_bars_takes_bucket_maxima():
+    x = np.arange(10)
+    _, values, starts = aggregate_bars(x, np.array([1, 5, 2, 0, 3, 3, 9, 1, 0, 4]), budget=5)
+    assert starts.tolist() == [0, 2, 4, 6, 8]
+    assert values.tolist() == [5, 2, 3, 9, 4]
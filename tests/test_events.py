@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_events import reference_table
+from libraries.events import HORIZONS, EventStudy
+
+@pytest.mark.filterwarnings('ignore:invalid value:RuntimeWarning')  # the reference's empty groups
+def test_table_matches_pandas_groupby(daily):
+    table = EventStudy().refresh(daily).table()
+    reference = reference_table(daily, HORIZONS)
+    merged = table.merge(reference, on=['group', 'horizon'], suffixes=('', '_reference'))
+    assert len(merged) == len(reference)
+    for col in ['count', 'mean', 'hit_rate', 'median', 'p25', 'p75']:
+        np.testing.assert_allclose(merged[col], merged[f'{col}_reference'], rtol=1e-9)
+
+def test_refresh_matches_a_fresh_build(daily):
+    expected = EventStudy().refresh(daily)
+    study = EventStudy().refresh(daily.iloc[:-30])
+    for step in [daily.iloc[:-1], daily.drop(index=[100, 101]).reset_index(drop=True), daily]:
+        study.refresh(step)
+        fresh = EventStudy().refresh(step)
+        np.testing.assert_array_equal(study.returns, fresh.returns)
+        for by in ['classification', 'bucket']:
+            pd.testing.assert_frame_equal(study.table(by), fresh.table(by))
+    np.testing.assert_array_equal(study.returns, expected.returns)
+    assert study.refresh(daily).recomputed == 0
+
+def test_date_range_keeps_events_inside(daily):
+    study = EventStudy().refresh(daily)
+    start, end = daily['timestamp'].iloc[50], daily['timestamp'].iloc[149]
+    table = study.table('classification', start, end)
+    assert table.groupby('horizon')['count'].sum().max() <= 100
+    assert table.loc[table['horizon'] == 1, 'count'].sum() == 100
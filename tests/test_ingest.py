@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_ingest import make_payload, reference_merge, reference_parse, reference_prices
+from benchmarks.synthetic import DAILY_LIMIT, fake_yf_download, make_market
+from libraries.data import parse_fear_greed, parse_prices
+from libraries.features import compactData, mergeSources
+
+def test_payload_parse_matches_dataframe_parse():
+    records = make_payload(500)
+    expected = reference_parse(records)
+    expected = expected.assign(fear_greed=expected['fear_greed'].astype(np.int8))
+    pd.testing.assert_frame_equal(parse_fear_greed(records), expected, check_dtype=False,
+                                  check_categorical=False, check_index_type=False)
+
+# One daily and one minute-bar market, the two join paths of mergeSources
+@pytest.fixture(scope='module', params=[500, DAILY_LIMIT + 500], ids=['daily', 'minute'])
+def market(request):
+    fear_greed, bars, interval = make_market(request.param)
+    fear_greed = fear_greed.set_index('timestamp').set_axis(fear_greed['timestamp'].to_numpy().astype('M8[s]'))
+    fear_greed.index.name = 'timestamp'
+    download = fake_yf_download(bars)('BTC-USD')
+    prices = parse_prices(download)
+    pd.testing.assert_frame_equal(prices, reference_prices(download), check_index_type=False)
+    return fear_greed, prices.set_axis(prices.index.as_unit('s')), interval
+
+def test_merge_matches_pandas_merge(market):
+    fear_greed, prices, interval = market
+    # Labels come back categorical rather than as strings
+    pd.testing.assert_frame_equal(mergeSources(fear_greed, prices, interval).astype({'value_classification': str}),
+                                  reference_merge(fear_greed, prices, interval), check_dtype=False)
+
+def test_compact_merge_matches_merge_then_compact(market):
+    fear_greed, prices, interval = market
+    pd.testing.assert_frame_equal(mergeSources(fear_greed, prices, interval, True),
+                                  compactData(reference_merge(fear_greed, prices, interval)))
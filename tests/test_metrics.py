@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from benchmarks.bench_metrics import pandas_metrics
+from benchmarks.synthetic import BENCH_CONFIG, make_multi_dataset
+from libraries.backtest import batch_signal_counts, run_backtest_batch
+from libraries.metrics import compute_metrics
+
+@pytest.mark.filterwarnings('ignore::RuntimeWarning')
+def test_batched_metrics_match_pandas_per_curve():
+    fear_greed, closes = make_multi_dataset(30, 300)
+    closes = closes.bfill()
+    buy_counts, sell_counts = batch_signal_counts(closes, fear_greed['fear_greed'], BENCH_CONFIG)
+    _, btc_values, total_values, buys, sells = run_backtest_batch(closes, buy_counts, sell_counts, BENCH_CONFIG)
+    close, total_values, btc_values, buys, sells = (np.ascontiguousarray(a.T) for a in
+                                                    (closes.to_numpy(), total_values, btc_values, buys, sells))
+    metrics = compute_metrics(total_values, btc_values, close, buys, sells, chunk=7)
+    for i in range(len(close)):
+        for name, value in pandas_metrics(close[i], total_values[i], btc_values[i], buys[i], sells[i]).items():
+            assert np.isclose(metrics[name][i], value, rtol=1e-9, equal_nan=True), (name, i)
+
+def test_metrics_of_no_rows_raise_a_clear_error():
+    with pytest.raises(ValueError, match='No rows'):
+        compute_metrics(np.empty(0), np.empty(0), np.empty(0), np.empty(0, dtype=bool), np.empty(0, dtype=bool))
@@ -0,0 +1,25 @@
+import numpy as np
+
+from benchmarks.bench_walkforward import per_window
+from benchmarks.synthetic import BENCH_CONFIG
+from libraries.optimizer import evaluate_config, grid_configs, optimize, walk_forward, walk_forward_windows
+
+PARAM_SPACE = {
+    'short_term_ma_period': [5, 20],
+    'rsi_period': [7, 14],
+    'buy_threshold': [1, 2],
+}
+
+def test_grid_matches_each_config_run_alone(daily):
+    table = optimize(daily, BENCH_CONFIG, PARAM_SPACE, mode='grid', workers=2)
+    assert len(table) == len(list(grid_configs(BENCH_CONFIG, PARAM_SPACE)))
+    for row in table.to_dict('records'):
+        expected = evaluate_config(daily, {**BENCH_CONFIG, **{name: row[name] for name in PARAM_SPACE}})
+        assert np.isclose(row['total_return'], expected['total_return'], rtol=0, atol=1e-9)
+
+def test_walk_forward_picks_what_recomputing_per_window_picks(daily):
+    table, equity = walk_forward(daily, BENCH_CONFIG, PARAM_SPACE, 150, 50, workers=2)
+    configs = list(grid_configs(BENCH_CONFIG, PARAM_SPACE))
+    chosen = per_window(daily, configs, walk_forward_windows(len(daily), 150, 50))
+    assert [{name: configs[i][name] for name in PARAM_SPACE} for i in chosen] == table[list(PARAM_SPACE)].to_dict('records')
+    assert len(equity) == 50 * len(table)
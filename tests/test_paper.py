@@ -0,0 +1,5 @@
+from benchmarks.bench_paper_trading import check_against_backtest, make_configs
+
+def test_replayed_trades_match_the_backtest(daily):
+    # Fills, final balance and holdings of every strategy, against run_backtest
+    assert check_against_backtest(daily, make_configs(8)) > 0
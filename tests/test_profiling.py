@@ -0,0 +1,51 @@
+import contextvars
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from libraries import profiling
+
+@profiling.traced()
+def step(x):
+    return x
+
+def session(name, memory, barrier, results):
+    # One script run: spans from this thread and from a pool thread given its context
+    run = profiling.start_run(name, memory=memory)
+    barrier.wait()
+    step(1)
+    with ThreadPoolExecutor(1) as pool:
+        pool.submit(contextvars.copy_context().run, step, 2).result()
+    barrier.wait()
+    profiling.finish_run(run)
+    results[name] = run
+
+def test_runs_are_per_session():
+    results, barrier = {}, threading.Barrier(2)
+    threads = [threading.Thread(target=session, args=(name, False, barrier, results)) for name in ['a', 'b']]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for name in ['a', 'b']:
+        assert [span['name'] for span in results[name]['spans']] == ['step', 'step']
+    assert not profiling.is_enabled()
+
+def test_no_run_records_nothing():
+    run = profiling.start_run('finished')
+    profiling.finish_run(run)
+    step(1)
+    assert run['spans'] == []
+
+def test_memory_tracking_only_while_a_run_needs_it():
+    assert not tracemalloc.is_tracing()
+    results, barrier = {}, threading.Barrier(2)
+    threads = [threading.Thread(target=session, args=(name, name == 'memory', barrier, results))
+               for name in ['memory', 'timing']]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not tracemalloc.is_tracing()
+    assert all(span['peak_bytes'] is not None for span in results['memory']['spans'])
+    assert all(span['peak_bytes'] is None for span in results['timing']['spans'])
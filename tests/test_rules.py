@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import BENCH_CONFIG
+from libraries.backtest import batch_signal_counts
+from libraries.optimizer import optimize
+from libraries.features import addSignals
+from libraries.rules import RuleError, check_rule, evaluate_rules, evaluate_rules_batch
+from libraries.simulation import monte_carlo
+from libraries.trading import indicator_cache
+
+RULES = ["rsi(14) < 35 AND (fear_greed < 25 OR close < bollinger_lower(20, 2))",
+         "sma(10) > sma(50) AND momentum(7) > 0 AND NOT fear_greed > 75",
+         "close / sma(20) - 1 > std(20) / close"]
+
+@pytest.fixture(scope='module')
+def closes(daily):
+    # Three assets made from the daily closes, so they differ but share the index
+    close = daily['close'].to_numpy()
+    return pd.DataFrame({'a': close, 'b': close[::-1].copy(), 'c': close * np.linspace(0.5, 2, len(close))})
+
+def test_batch_matches_each_asset(daily, closes):
+    fear_greed = daily['fear_greed'].to_numpy(dtype=float)
+    batch = evaluate_rules_batch({'close': closes, 'fear_greed': fear_greed}, RULES)
+    for j, name in enumerate(closes):
+        asset = pd.DataFrame({'close': closes[name], 'fear_greed': fear_greed})
+        np.testing.assert_array_equal(batch[:, :, j], evaluate_rules(asset, RULES))
+
+def test_batch_leaves_the_indicator_cache_alone(daily, closes):
+    before = (indicator_cache.hits, indicator_cache.misses, indicator_cache.nbytes)
+    config = {**BENCH_CONFIG, 'buy_rule': RULES[0], 'sell_rule': RULES[1]}
+    batch_signal_counts(closes, daily['fear_greed'], config)
+    assert (indicator_cache.hits, indicator_cache.misses, indicator_cache.nbytes) == before
+
+def test_rules_on_other_columns_fail_before_any_worker(daily, monkeypatch):
+    # Starting a pool at all would be a TypeError
+    monkeypatch.setattr('libraries.optimizer.ProcessPoolExecutor', None)
+    monkeypatch.setattr('libraries.simulation.ProcessPoolExecutor', None)
+    config = {**BENCH_CONFIG, 'buy_rule': 'volume > 0'}
+    with pytest.raises(RuleError):
+        optimize(daily, config, {'short_term_ma_period': [5, 10]}, workers=2)
+    with pytest.raises(RuleError):
+        monte_carlo(daily, config, n_paths=10, workers=2)
+
+@pytest.mark.parametrize('rule', ['value_classification == 1', 'timestamp > 5', 'rsi < 30 AND volume > 0'])
+def test_only_numeric_columns_can_be_named(daily, rule):
+    with pytest.raises(RuleError, match='Unknown column or indicator'):
+        check_rule(rule, daily.columns)
+    with pytest.raises(RuleError):
+        addSignals(daily.copy(), {**BENCH_CONFIG, 'buy_rule': rule})
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import BENCH_CONFIG
+from libraries.backtest import run_backtest, signal_counts
+from libraries.features import addSignals
+from libraries.metrics import backtest_metrics
+from libraries.simulation import PATHS_PER_TASK, block_bootstrap, monte_carlo
+
+def test_threads_by_default_with_the_same_paths(daily, monkeypatch):
+    n_paths = PATHS_PER_TASK * 2
+    in_process = monte_carlo(daily, BENCH_CONFIG, n_paths, seed=3, workers=1)
+    # Starting a process pool at all would be a TypeError
+    monkeypatch.setattr('libraries.simulation.ProcessPoolExecutor', None)
+    assert monte_carlo(daily, BENCH_CONFIG, n_paths, seed=3, workers=2).equals(in_process)
+
+def test_batched_paths_match_one_at_a_time(daily):
+    # The first paths of the first task, replayed one at a time through addSignals + run_backtest
+    paths = monte_carlo(daily, BENCH_CONFIG, PATHS_PER_TASK, seed=42, workers=1)
+    seed = np.random.SeedSequence(42).spawn(1)[0]
+    closes, fear_greeds = block_bootstrap(daily['close'], daily['fear_greed'], PATHS_PER_TASK,
+                                          rng=np.random.default_rng(seed))
+    for j in range(10):
+        frame = addSignals(pd.DataFrame({'close': closes[:, j], 'fear_greed': fear_greeds[:, j]}), BENCH_CONFIG)
+        _, btc_values, total_values, buys, sells = run_backtest(
+            closes[:, j], signal_counts(frame, 'buy'), signal_counts(frame, 'sell'), BENCH_CONFIG)
+        expected = backtest_metrics(closes[:, j], btc_values, total_values, buys, sells)
+        for name in ['final_value', 'max_drawdown', 'trades']:
+            assert np.isclose(paths[name].iloc[j], expected[name], rtol=1e-9), (name, j)
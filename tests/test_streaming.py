@@ -0,0 +1,11 @@
+import numpy as np
+import pytest
+
+from benchmarks.bench_streaming import check_against_batch
+from benchmarks.synthetic import make_dataset
+
+@pytest.mark.filterwarnings('ignore::RuntimeWarning')
+def test_streamed_indicators_match_batch_after_a_restore():
+    data = make_dataset(600)
+    data['volume'] = np.random.default_rng(1).uniform(1e3, 1e5, len(data))
+    check_against_batch(data)
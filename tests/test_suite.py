@@ -0,0 +1,15 @@
+import pytest
+
+from benchmarks.suite import STAGES, run_pipeline
+from benchmarks.synthetic import DAILY_LIMIT, make_market
+from libraries import data as data_module
+
+# The suite's own pipeline, offline, at a daily and a minute-bar size
+@pytest.mark.parametrize('n_rows', [1_000, DAILY_LIMIT + 1_000], ids=['daily', 'minute'])
+def test_pipeline_runs_offline(n_rows, tmp_path):
+    data_module.getData.clear()
+    try:
+        times = run_pipeline(*make_market(n_rows), str(tmp_path))
+    finally:
+        data_module.getData.clear()
+    assert set(times) == set(STAGES)